@@ -0,0 +1,89 @@
+"""Time DataQualityProfiler.profile_dataframe on a wide synthetic frame with 1..N column threads
+
+No database is needed: the frame is generated in memory with a fixed seed. Every threaded run is
+checked against the serial profile before its timing is reported.
+
+    python benchmarks/column_parallel_benchmark.py --rows 200000 --columns 400 --workers 1 2 4 8
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+
+def wide_frame(rows: int, columns: int, seed: int = 42) -> pd.DataFrame:
+    """Deterministic mix of float, integer, nullable and low-cardinality text columns"""
+    rng = np.random.default_rng(seed)
+    statuses = np.array(['active', 'Active', 'inactive ', 'pending', ' PENDING', 'closed'], dtype=object)
+    data = {}
+    for index in range(columns):
+        kind = index % 4
+        if kind == 0:
+            values = rng.normal(100, 15, rows)
+        elif kind == 1:
+            values = rng.integers(0, 1_000_000, rows)
+        elif kind == 2:
+            values = rng.exponential(50, rows)
+            values[rng.random(rows) < 0.05] = np.nan
+        else:
+            values = statuses[rng.integers(0, len(statuses), rows)]
+        data[f'col_{index}'] = values
+    return pd.DataFrame(data)
+
+
+def strip_timestamp(profile):
+    profile = dict(profile)
+    profile.pop('timestamp', None)
+    return json.dumps(profile, default=repr, sort_keys=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--columns', type=int, default=400)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--repeat', type=int, default=3, help="Best-of repetitions per worker count")
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    from dq_monitor import DataQualityProfiler
+    df = wide_frame(args.rows, args.columns)
+    with tempfile.TemporaryDirectory() as state_dir:
+        profiler = DataQualityProfiler(None, state_dir=state_dir)
+        baseline = None
+        results = []
+        for workers in args.workers:
+            profiler.column_workers = workers
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                profile = profiler.profile_dataframe(df, 'benchmark')
+                timings.append(time.perf_counter() - start)
+            if baseline is None:
+                baseline = (min(timings), strip_timestamp(profile))
+            elif strip_timestamp(profile) != baseline[1]:
+                raise SystemExit(f"Profile with {workers} column threads differs from the first run")
+            result = {
+                'workers': workers,
+                'seconds': round(min(timings), 4),
+                'speedup': round(baseline[0] / min(timings), 2),
+            }
+            results.append(result)
+            print(json.dumps(result))
+
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump({'rows': args.rows, 'columns': args.columns, 'cpu_count': os.cpu_count(),
+                       'runs': results}, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Compare execute_query + DataFrame with execute_query_columnar on a live MySQL table
+
+Each fetch path runs in its own child process so the peak RSS of one cannot hide the other's.
+
+    python benchmarks/fetch_benchmark.py --host localhost --user root --password secret \\
+        --database data_quality_db --table customers --repeat 3 --output fetch.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from profiler_benchmark import peak_rss_mb  # noqa: E402  (VmHWM, not the ru_maxrss spawn children inherit)
+
+
+def run_fetch(args, mode, queue):
+    import pandas as pd
+    from dq_monitor import DatabaseConnection
+    db = DatabaseConnection(args.host, args.database, args.user, args.password, args.port)
+    if not db.connect():
+        queue.put({'mode': mode, 'error': 'connection failed'})
+        return
+    query = f"SELECT * FROM {args.table}"
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == 'rows':
+        data, columns = db.execute_query(query)
+        frame = pd.DataFrame(data, columns=columns)
+        del data
+    else:
+        frame = db.execute_query_columnar(query, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+    rows = len(frame)
+    queue.put({
+        'mode': mode,
+        'rows': rows,
+        'seconds': round(elapsed, 4),
+        'rows_per_sec': round(rows / elapsed, 1) if elapsed else None,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'baseline_rss_mb': round(baseline, 1),
+        'frame_mb': round(frame.memory_usage(deep=True).sum() / (1024 * 1024), 1),
+    })
+    db.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=3306)
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--database', default='data_quality_db')
+    parser.add_argument('--table', required=True)
+    parser.add_argument('--batch-size', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    args = parser.parse_args()
+    
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for _ in range(args.repeat):
+        for mode in ('rows', 'columnar'):
+            queue = context.Queue()
+            process = context.Process(target=run_fetch, args=(args, mode, queue))
+            process.start()
+            result = queue.get()
+            process.join()
+            results.append(result)
+            print(json.dumps(result))
+    
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump({'table': args.table, 'batch_size': args.batch_size, 'runs': results}, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
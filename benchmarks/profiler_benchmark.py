@@ -0,0 +1,450 @@
+"""Benchmark DataQualityProfiler strategies on deterministic synthetic tables of several sizes and widths
+
+The tables follow setup_sample_data: an id key, names with case and whitespace inconsistencies, emails
+and ages with missing values, salaries with outliers and rows whose payload duplicates the previous
+row, widened with extra metric, count, status (re-cased and padded values) and amount columns. Every
+issue occurs at a fixed rate and the data depends only on --seed, so two commits profile exactly the
+same rows.
+
+Backends:
+    frame   profile_dataframe on an in-memory frame (no database)
+    sqlite  the memory, streaming and sampled strategies against a local SQLite file standing in for
+            MySQL (the file is generated once per size, width and seed and reused from --data-dir)
+    mysql   every strategy against a real server (--host/--user/--password/--database); the tables
+            are created as dq_bench_<rows>_<width> and reused while their row count matches
+
+Each case runs in its own child process, which reports its throughput, latency percentiles over
+--repeat runs and peak RSS. --output writes everything as JSON; --compare prints the speed of each case
+relative to an earlier --output file and --max-regression turns a slowdown into a non-zero exit.
+
+    python benchmarks/profiler_benchmark.py --rows 1000000 10000000 --widths 8 32 --output bench.json
+    python benchmarks/profiler_benchmark.py --suite full --backends sqlite --compare bench.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+SUITES = {
+    'quick': [100000],
+    'standard': [1000000, 10000000],
+    'full': [1000000, 10000000, 100000000],
+}
+
+BACKEND_STRATEGIES = {
+    'frame': ['dataframe'],
+    'sqlite': ['memory', 'streaming', 'sampled'],
+    'mysql': ['memory', 'streaming', 'pushdown', 'parallel', 'sampled', 'auto'],
+}
+
+# Issue rates of the synthetic tables
+NULL_RATE = 0.05
+DUPLICATE_RATE = 0.02
+INCONSISTENT_RATE = 0.03
+OUTLIER_RATE = 0.01
+
+# Rows are generated in chunks of this size, each from its own seed, so the data does not depend on
+# how much of it is held at once
+GENERATION_CHUNK = 1000000
+
+BASE_COLUMNS = [('id', 'bigint'), ('name', 'varchar(64)'), ('email', 'varchar(128)'), ('age', 'int'),
+                ('salary', 'double')]
+EXTRA_KINDS = [('metric', 'double'), ('count', 'int'), ('status', 'varchar(32)'), ('amount', 'decimal(12,2)')]
+
+FIRST_NAMES = np.array(['John', 'Jane', 'Bob', 'Alice', 'Charlie', 'Diana', 'Eve', 'Frank', 'Grace', 'Henry'])
+LAST_NAMES = np.array(['Doe', 'Smith', 'Johnson', 'Brown', 'Wilson', 'Prince', 'Adams', 'Miller', 'Moore', 'Clark'])
+STATUSES = np.array(['active', 'inactive', 'pending', 'closed'])
+
+
+def table_columns(width: int):
+    """(name, MySQL type) of the synthetic table with `width` columns (at least the five base ones)"""
+    columns = list(BASE_COLUMNS)
+    for index in range(max(width, len(BASE_COLUMNS)) - len(BASE_COLUMNS)):
+        kind, column_type = EXTRA_KINDS[index % len(EXTRA_KINDS)]
+        columns.append((f'{kind}_{index}', column_type))
+    return columns
+
+
+def _with_issues(values: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Re-case or pad INCONSISTENT_RATE of the strings each ('active' -> 'Active', 'Jane Doe' -> 'Jane doe')"""
+    values = values.astype(object)
+    recased = rng.random(len(values)) < INCONSISTENT_RATE
+    values[recased] = np.char.capitalize(values[recased].astype(str)).astype(object)
+    padded = rng.random(len(values)) < INCONSISTENT_RATE
+    values[padded] = np.char.add(values[padded].astype(str), ' ').astype(object)
+    return values
+
+
+def _with_nulls(values: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    missing = rng.random(len(values)) < NULL_RATE
+    if values.dtype.kind == 'f':
+        values[missing] = np.nan
+    else:
+        values = values.astype(object)
+        values[missing] = None
+    return values
+
+
+def synthetic_chunk(start: int, rows: int, width: int, seed: int) -> pd.DataFrame:
+    """Rows start..start+rows-1 of the synthetic table, as pandas would infer them from fetched rows"""
+    rng = np.random.default_rng([seed, start])
+    ids = np.arange(start + 1, start + rows + 1, dtype=np.int64)
+    data = {
+        'id': ids,
+        'name': _with_nulls(_with_issues(np.char.add(np.char.add(FIRST_NAMES[rng.integers(0, 10, rows)], ' '),
+                                                     LAST_NAMES[rng.integers(0, 10, rows)]), rng), rng),
+        'email': _with_nulls(np.char.add(np.char.add('user', ids.astype(str)), '@example.com').astype(object), rng),
+        'age': _with_nulls(rng.integers(18, 80, rows).astype(np.float64), rng),
+        'salary': np.round(rng.normal(60000, 15000, rows), 2),
+    }
+    data['salary'][rng.random(rows) < OUTLIER_RATE] *= 20
+    for name, column_type in table_columns(width)[len(BASE_COLUMNS):]:
+        if column_type == 'double':
+            values = rng.normal(100, 15, rows)
+            values[rng.random(rows) < OUTLIER_RATE] *= 10
+            data[name] = _with_nulls(values, rng)
+        elif column_type == 'int':
+            data[name] = rng.integers(0, 1000000, rows)
+        elif column_type.startswith('varchar'):
+            # No NULLs here: pandas only treats object columns without NULLs as strings, and those are
+            # the columns the consistency checks run on
+            data[name] = _with_issues(STATUSES[rng.integers(0, len(STATUSES), rows)], rng)
+        else:
+            data[name] = _with_nulls(np.round(rng.exponential(250, rows), 2), rng)
+    # Duplicate the payload (everything but the key) of the previous row; only odd offsets are copied
+    # into, so a copied-from row is never itself overwritten
+    targets = np.arange(1, rows, 2)
+    targets = targets[rng.random(len(targets)) < DUPLICATE_RATE * 2]
+    for name, values in data.items():
+        if name != 'id':
+            values[targets] = values[targets - 1]
+    return pd.DataFrame(data)
+
+
+def synthetic_chunks(rows: int, width: int, seed: int):
+    for start in range(0, rows, GENERATION_CHUNK):
+        yield synthetic_chunk(start, min(GENERATION_CHUNK, rows - start), width, seed)
+
+
+def payload_columns(width: int):
+    """Duplicate key: every column but id, so the copied payloads are found as duplicates"""
+    return [name for name, _ in table_columns(width) if name != 'id']
+
+
+def _records(frame: pd.DataFrame):
+    """Rows of a chunk as tuples of Python values with NULL for missing values"""
+    return list(frame.astype(object).where(frame.notna(), None).itertuples(index=False, name=None))
+
+
+class SQLiteStandIn:
+    """The part of DatabaseConnection the memory, streaming and sampled strategies use, over SQLite
+
+    MySQL-isms in the profiler's SQL are rewritten: %s placeholders become ? and RAND() becomes a
+    uniform expression over SQLite's random(). Column types are declared with their MySQL names, so
+    the schema (and the dtypes the profiler derives from it) matches the MySQL table.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.host, self.port, self.database = 'sqlite', 0, os.path.basename(path)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.catalog = self
+
+    @staticmethod
+    def _translate(query: str) -> str:
+        return query.replace('%s', '?').replace('RAND()', '(random() / 18446744073709551616.0 + 0.5)')
+
+    def get_table_schema(self, table_name: str):
+        info = self.connection.execute(f"PRAGMA table_info(`{table_name}`)").fetchall()
+        return [(name, column_type, 'NO' if notnull or pk else 'YES', 'PRI' if pk else '', default, '')
+                for _, name, column_type, notnull, default, pk in info]
+
+    def estimated_rows(self, table_name: str) -> int:
+        return self.connection.execute(f"SELECT MAX(rowid) FROM `{table_name}`").fetchone()[0] or 0
+
+    def execute_query(self, query: str, params: tuple = None):
+        cursor = self.connection.execute(self._translate(query), params or ())
+        return cursor.fetchall(), tuple(column[0] for column in cursor.description)
+
+    def iter_query(self, query: str, params: tuple = None, chunk_size: int = 50000):
+        cursor = self.connection.execute(self._translate(query), params or ())
+
+        def chunks():
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        return chunks(), tuple(column[0] for column in cursor.description)
+
+    def disconnect(self):
+        self.connection.close()
+
+
+def sqlite_table(data_dir: str, rows: int, width: int, seed: int) -> str:
+    """Path of the SQLite file holding the synthetic table, generating it on first use"""
+    path = os.path.join(data_dir, f'synthetic_{rows}_{width}_{seed}.sqlite3')
+    if os.path.exists(path):
+        return path
+    os.makedirs(data_dir, exist_ok=True)
+    columns = table_columns(width)
+    partial = path + '.partial'
+    if os.path.exists(partial):
+        os.remove(partial)
+    connection = sqlite3.connect(partial)
+    connection.execute("PRAGMA journal_mode=OFF")
+    connection.execute("PRAGMA synchronous=OFF")
+    definitions = ', '.join(f"{name} {column_type}{' PRIMARY KEY' if name == 'id' else ''}"
+                            for name, column_type in columns)
+    connection.execute(f"CREATE TABLE synthetic ({definitions})")
+    placeholders = ', '.join('?' * len(columns))
+    for chunk in synthetic_chunks(rows, width, seed):
+        connection.executemany(f"INSERT INTO synthetic VALUES ({placeholders})", _records(chunk))
+        connection.commit()
+    connection.close()
+    os.replace(partial, path)
+    return path
+
+
+def mysql_table(args, rows: int, width: int) -> str:
+    """Name of the synthetic table on the MySQL server, (re)creating it unless its row count matches"""
+    from dq_monitor import DatabaseConnection
+    table_name = f'dq_bench_{rows}_{width}'
+    db = DatabaseConnection(args.host, args.database, args.user, args.password, args.port)
+    if not db.connect():
+        raise SystemExit("Could not connect to MySQL")
+    try:
+        data, _ = db.execute_query(f"SELECT COUNT(*) FROM {table_name}")
+        if data and data[0][0] == rows:
+            return table_name
+        columns = table_columns(width)
+        definitions = ', '.join(f"`{name}` {column_type}{' PRIMARY KEY' if name == 'id' else ''}"
+                                for name, column_type in columns)
+        db.execute(f"DROP TABLE IF EXISTS {table_name}")
+        db.execute(f"CREATE TABLE {table_name} ({definitions})")
+        placeholders = ', '.join(['%s'] * len(columns))
+        with db.session() as connection:
+            cursor = connection.cursor()
+            for chunk in synthetic_chunks(rows, width, args.seed):
+                records = _records(chunk)
+                for start in range(0, len(records), 10000):
+                    cursor.executemany(f"INSERT INTO {table_name} VALUES ({placeholders})",
+                                       records[start:start + 10000])
+                connection.commit()
+            cursor.close()
+        return table_name
+    finally:
+        db.disconnect()
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB"""
+    # On Linux ru_maxrss survives exec, so a spawned child would report the parent's peak at fork time;
+    # VmHWM belongs to the child's own address space
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def profile_checks(profile_results) -> dict:
+    """Result counts recorded with each case, so a behaviour change shows up next to the timings"""
+    issues = profile_results['data_quality_issues']
+    return {
+        'total_rows': profile_results['total_rows'],
+        'duplicates': issues['duplicates'],
+        'columns_with_missing_values': len(issues['missing_values']),
+        'inconsistencies': len(issues['inconsistencies']),
+    }
+
+
+def run_case(case: dict, args, results_queue):
+    """Child process: profile one (backend, strategy, rows, width) case --repeat times"""
+    from dq_monitor import DatabaseConnection, DataQualityProfiler
+    rows, width = case['rows'], case['width']
+    key_columns = payload_columns(width)
+    state_dir = tempfile.mkdtemp(prefix='dq_bench_state_')
+    if case['backend'] == 'frame':
+        frame = pd.concat(list(synthetic_chunks(rows, width, args.seed)), ignore_index=True)
+        profiler = DataQualityProfiler(None, state_dir=state_dir, column_workers=args.column_workers)
+        run = lambda: profiler.profile_dataframe(frame, 'synthetic', key_columns)
+    else:
+        if case['backend'] == 'sqlite':
+            db = SQLiteStandIn(case['path'])
+        else:
+            db = DatabaseConnection(args.host, args.database, args.user, args.password, args.port)
+            db.connect()
+        profiler = DataQualityProfiler(db, state_dir=state_dir, chunk_size=args.chunk_size,
+                                       column_workers=args.column_workers, sample_rows=args.sample_rows,
+                                       sample_seed=args.seed)
+        run = lambda: profiler.profile_table(case['table'], strategy=case['strategy'], key_columns=key_columns)
+
+    baseline = peak_rss_mb()
+    latencies = []
+    profile_results = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        profile_results = run()
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies)
+    median = float(np.median(latencies))
+    results_queue.put({
+        **{key: case[key] for key in ('backend', 'strategy', 'rows', 'width')},
+        'repeat': args.repeat,
+        'latency_seconds': {
+            'min': round(float(latencies.min()), 4),
+            'p50': round(median, 4),
+            'p90': round(float(np.percentile(latencies, 90)), 4),
+            'p99': round(float(np.percentile(latencies, 99)), 4),
+            'max': round(float(latencies.max()), 4),
+        },
+        'rows_per_sec': round(rows / median, 1) if median else None,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'baseline_rss_mb': round(baseline, 1),
+        'checks': profile_checks(profile_results) if profile_results else None,
+    })
+
+
+def case_key(result: dict) -> tuple:
+    return result['backend'], result['strategy'], result['rows'], result['width']
+
+
+def compare(results, baseline_path: str, max_regression: float) -> bool:
+    """Print each case's speed relative to the baseline file; False if any regressed beyond the limit"""
+    with open(baseline_path) as handle:
+        baseline = {case_key(result): result for result in json.load(handle)['results'] if 'latency_seconds' in result}
+    ok = True
+    for result in results:
+        before = baseline.get(case_key(result))
+        if before is None or 'latency_seconds' not in result:
+            continue
+        ratio = before['latency_seconds']['p50'] / result['latency_seconds']['p50']
+        regressed = max_regression is not None and ratio < 1 - max_regression
+        ok = ok and not regressed
+        print(f"{'/'.join(map(str, case_key(result)))}: {ratio:.2f}x "
+              f"({before['latency_seconds']['p50']}s -> {result['latency_seconds']['p50']}s)"
+              f"{'  REGRESSION' if regressed else ''}")
+    return ok
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--suite', choices=sorted(SUITES), help="Preset list of row counts (overrides --rows)")
+    parser.add_argument('--rows', type=int, nargs='+', default=SUITES['quick'])
+    parser.add_argument('--widths', type=int, nargs='+', default=[8, 32])
+    parser.add_argument('--backends', nargs='+', choices=sorted(BACKEND_STRATEGIES), default=['frame', 'sqlite'])
+    parser.add_argument('--strategies', nargs='+', help="Only run these strategies")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per case the latency percentiles are taken over")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    parser.add_argument('--column-workers', type=int, default=1)
+    parser.add_argument('--sample-rows', type=int, default=100000)
+    parser.add_argument('--frame-memory-limit', type=int, default=None, metavar='MIB',
+                        help="Skip frame cases estimated to need more (default: half the physical memory)")
+    parser.add_argument('--data-dir', default='.dq_bench', help="Where generated SQLite tables are kept")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=3306)
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--database', default='data_quality_db')
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    parser.add_argument('--compare', metavar='BASELINE', help="Compare with the JSON output of an earlier run")
+    parser.add_argument('--max-regression', type=float,
+                        help="With --compare, exit 1 if a case is this fraction slower (e.g. 0.1)")
+    args = parser.parse_args()
+
+    sizes = SUITES[args.suite] if args.suite else args.rows
+    memory_limit = args.frame_memory_limit
+    if memory_limit is None:
+        memory_limit = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // 2 ** 21
+
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for rows in sizes:
+        for width in args.widths:
+            for backend in args.backends:
+                strategies = [strategy for strategy in BACKEND_STRATEGIES[backend]
+                              if not args.strategies or strategy in args.strategies]
+                if not strategies:
+                    continue
+                case = {'backend': backend, 'rows': rows, 'width': width}
+                # The frame and the copies profiling makes of a column: roughly 3x its object-heavy size
+                if backend == 'frame' and rows * len(table_columns(width)) * 24 / 2 ** 20 > memory_limit:
+                    results.append({**case, 'strategy': strategies[0],
+                                    'skipped': f"frame would exceed the {memory_limit} MiB limit"})
+                    print(json.dumps(results[-1]))
+                    continue
+                if backend == 'sqlite':
+                    case['path'] = sqlite_table(args.data_dir, rows, width, args.seed)
+                    case['table'] = 'synthetic'
+                elif backend == 'mysql':
+                    case['table'] = mysql_table(args, rows, width)
+                for strategy in strategies:
+                    results_queue = context.Queue()
+                    process = context.Process(target=run_case, args=({**case, 'strategy': strategy}, args,
+                                                                     results_queue))
+                    process.start()
+                    while True:
+                        try:
+                            result = results_queue.get(timeout=1)
+                            break
+                        except queue.Empty:
+                            if not process.is_alive():
+                                result = {'backend': backend, 'strategy': strategy, 'rows': rows, 'width': width,
+                                          'error': f"benchmark process exited with code {process.exitcode}"}
+                                break
+                    process.join()
+                    results.append(result)
+                    print(json.dumps(result))
+
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump({
+                'commit': git_commit(),
+                'timestamp': datetime.now().isoformat(),
+                'python': platform.python_version(),
+                'pandas': pd.__version__,
+                'numpy': np.__version__,
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'seed': args.seed,
+                'issue_rates': {'nulls': NULL_RATE, 'duplicates': DUPLICATE_RATE,
+                                'inconsistencies': INCONSISTENT_RATE, 'outliers': OUTLIER_RATE},
+                'results': results,
+            }, handle, indent=2)
+
+    if args.compare and not compare(results, args.compare, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,624 +1,673 @@
-import streamlit as st
-import pandas as pd
-import mysql.connector
-from mysql.connector import Error
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-import json
-import numpy as np
-from typing import Dict, List, Tuple, Any
-import warnings
-warnings.filterwarnings('ignore')
-
-class DatabaseConnection:
-    """Handle MySQL database connections and operations"""
-    
-    def __init__(self, host: str, database: str, user: str, password: str, port: int = 3306):
-        self.host = host
-        self.database = database
-        self.user = user
-        self.password = password
-        self.port = port
-        self.connection = None
-    
-    def connect(self):
-        """Establish database connection"""
-        try:
-            self.connection = mysql.connector.connect(
-                host=self.host,
-                database=self.database,
-                user=self.user,
-                password=self.password,
-                port=self.port
-            )
-            return True
-        except Error as e:
-            st.error(f"Database connection error: {e}")
-            return False
-    
-    def disconnect(self):
-        """Close database connection"""
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-    
-    def execute_query(self, query: str, params: tuple = None):
-        """Execute a query and return results"""
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute(query, params)
-            return cursor.fetchall(), cursor.column_names
-        except Error as e:
-            st.error(f"Query execution error: {e}")
-            return None, None
-    
-    def get_table_names(self):
-        """Get all table names in the database"""
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute("SHOW TABLES")
-            tables = [table[0] for table in cursor.fetchall()]
-            return tables
-        except Error as e:
-            st.error(f"Error fetching table names: {e}")
-            return []
-    
-    def get_table_schema(self, table_name: str):
-        """Get schema information for a table"""
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"DESCRIBE {table_name}")
-            schema = cursor.fetchall()
-            return schema
-        except Error as e:
-            st.error(f"Error fetching schema for {table_name}: {e}")
-            return None
-
-class DataQualityProfiler:
-    """Data quality profiling and analysis"""
-    
-    def __init__(self, db_connection: DatabaseConnection):
-        self.db = db_connection
-    
-    def profile_table(self, table_name: str) -> Dict[str, Any]:
-        """Comprehensive data quality profiling for a table"""
-        
-        # Get table data
-        query = f"SELECT * FROM {table_name}"
-        data, columns = self.db.execute_query(query)
-        
-        if data is None:
-            return {}
-        
-        df = pd.DataFrame(data, columns=columns)
-        
-        profile_results = {
-            'table_name': table_name,
-            'timestamp': datetime.now().isoformat(),
-            'total_rows': len(df),
-            'total_columns': len(df.columns),
-            'column_profiles': {},
-            'data_quality_issues': {
-                'missing_values': {},
-                'duplicates': 0,
-                'inconsistencies': {}
-            }
-        }
-        
-        # Profile each column
-        for column in df.columns:
-            column_profile = self._profile_column(df, column)
-            profile_results['column_profiles'][column] = column_profile
-            
-            # Check for missing values
-            missing_count = df[column].isna().sum()
-            if missing_count > 0:
-                profile_results['data_quality_issues']['missing_values'][column] = {
-                    'count': int(missing_count),
-                    'percentage': round((missing_count / len(df)) * 100, 2)
-                }
-        
-        # Check for duplicates
-        duplicate_count = df.duplicated().sum()
-        profile_results['data_quality_issues']['duplicates'] = int(duplicate_count)
-        
-        # Check for inconsistencies
-        inconsistencies = self._detect_inconsistencies(df)
-        profile_results['data_quality_issues']['inconsistencies'] = inconsistencies
-        
-        return profile_results
-    
-    def _profile_column(self, df: pd.DataFrame, column: str) -> Dict[str, Any]:
-        """Profile individual column"""
-        series = df[column]
-        
-        profile = {
-            'data_type': str(series.dtype),
-            'unique_values': int(series.nunique()),
-            'missing_values': int(series.isna().sum()),
-            'missing_percentage': round((series.isna().sum() / len(series)) * 100, 2)
-        }
-        
-        if pd.api.types.is_numeric_dtype(series):
-            profile.update({
-                'min_value': float(series.min()) if not series.isna().all() else None,
-                'max_value': float(series.max()) if not series.isna().all() else None,
-                'mean_value': float(series.mean()) if not series.isna().all() else None,
-                'std_dev': float(series.std()) if not series.isna().all() else None,
-                'outliers': self._detect_outliers(series)
-            })
-        elif pd.api.types.is_string_dtype(series):
-            profile.update({
-                'avg_length': float(series.str.len().mean()) if not series.isna().all() else None,
-                'max_length': int(series.str.len().max()) if not series.isna().all() else None,
-                'min_length': int(series.str.len().min()) if not series.isna().all() else None
-            })
-        
-        return profile
-    
-    def _detect_outliers(self, series: pd.Series) -> Dict[str, Any]:
-        """Detect outliers using IQR method"""
-        if series.isna().all():
-            return {'count': 0, 'values': []}
-        
-        Q1 = series.quantile(0.25)
-        Q3 = series.quantile(0.75)
-        IQR = Q3 - Q1
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
-        
-        outliers = series[(series < lower_bound) | (series > upper_bound)]
-        
-        return {
-            'count': len(outliers),
-            'values': outliers.tolist()[:10]  # Limit to first 10 outliers
-        }
-    
-    def _detect_inconsistencies(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Detect data inconsistencies"""
-        inconsistencies = {}
-        
-        for column in df.columns:
-            if pd.api.types.is_string_dtype(df[column]):
-                # Check for inconsistent formatting
-                non_null_values = df[column].dropna()
-                if len(non_null_values) > 0:
-                    # Case inconsistencies
-                    mixed_case = non_null_values[
-                        (non_null_values.str.lower() != non_null_values) & 
-                        (non_null_values.str.upper() != non_null_values)
-                    ]
-                    
-                    if len(mixed_case) > 0:
-                        inconsistencies[f'{column}_case_inconsistency'] = {
-                            'type': 'mixed_case',
-                            'count': len(mixed_case),
-                            'examples': mixed_case.head(5).tolist()
-                        }
-                    
-                    # Whitespace inconsistencies
-                    whitespace_issues = non_null_values[
-                        non_null_values.str.strip() != non_null_values
-                    ]
-                    
-                    if len(whitespace_issues) > 0:
-                        inconsistencies[f'{column}_whitespace_inconsistency'] = {
-                            'type': 'whitespace',
-                            'count': len(whitespace_issues),
-                            'examples': whitespace_issues.head(5).tolist()
-                        }
-        
-        return inconsistencies
-
-class EmailAlertSystem:
-    """Email alert system for data quality issues"""
-    
-    def __init__(self, smtp_server: str, smtp_port: int, email: str, password: str):
-        self.smtp_server = smtp_server
-        self.smtp_port = smtp_port
-        self.email = email
-        self.password = password
-    
-    def send_alert(self, recipient: str, subject: str, body: str):
-        """Send email alert"""
-        try:
-            msg = MIMEMultipart()
-            msg['From'] = self.email
-            msg['To'] = recipient
-            msg['Subject'] = subject
-            
-            msg.attach(MIMEText(body, 'html'))
-            
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.email, self.password)
-            
-            text = msg.as_string()
-            server.sendmail(self.email, recipient, text)
-            server.quit()
-            
-            return True
-        except Exception as e:
-            st.error(f"Failed to send email: {e}")
-            return False
-    
-    def generate_quality_report_email(self, profile_results: Dict[str, Any]) -> str:
-        """Generate HTML email for data quality report"""
-        
-        table_name = profile_results.get('table_name', 'Unknown')
-        timestamp = profile_results.get('timestamp', datetime.now().isoformat())
-        total_rows = profile_results.get('total_rows', 0)
-        issues = profile_results.get('data_quality_issues', {})
-        
-        missing_values = issues.get('missing_values', {})
-        duplicates = issues.get('duplicates', 0)
-        inconsistencies = issues.get('inconsistencies', {})
-        
-        html_body = f"""
-        <html>
-        <body>
-        <h2>Data Quality Report - {table_name}</h2>
-        <p><strong>Generated:</strong> {timestamp}</p>
-        <p><strong>Total Rows:</strong> {total_rows:,}</p>
-        
-        <h3>Data Quality Issues Summary</h3>
-        <ul>
-            <li><strong>Duplicate Rows:</strong> {duplicates:,}</li>
-            <li><strong>Columns with Missing Values:</strong> {len(missing_values)}</li>
-            <li><strong>Data Inconsistencies:</strong> {len(inconsistencies)}</li>
-        </ul>
-        
-        {'<h3>Missing Values by Column</h3><ul>' + ''.join([f'<li><strong>{col}:</strong> {info["count"]:,} ({info["percentage"]}%)</li>' for col, info in missing_values.items()]) + '</ul>' if missing_values else ''}
-        
-        {'<h3>Data Inconsistencies</h3><ul>' + ''.join([f'<li><strong>{issue}:</strong> {info["type"]} - {info["count"]} cases</li>' for issue, info in inconsistencies.items()]) + '</ul>' if inconsistencies else ''}
-        
-        <p>Please review the data quality dashboard for detailed analysis.</p>
-        </body>
-        </html>
-        """
-        
-        return html_body
-
-class DataQualityDashboard:
-    """Streamlit dashboard for data quality monitoring"""
-    
-    def __init__(self):
-        self.db = None
-        self.profiler = None
-        self.email_system = None
-    
-    def setup_sidebar(self):
-        """Setup sidebar configuration"""
-        st.sidebar.title("🔍 Data Quality Monitor")
-        
-        # Database Configuration
-        st.sidebar.subheader("Database Configuration")
-        db_host = st.sidebar.text_input("Host", value="localhost")
-        db_name = st.sidebar.text_input("Database Name", value="test_db")
-        db_user = st.sidebar.text_input("Username", value="root")
-        db_password = st.sidebar.text_input("Password", type="password")
-        db_port = st.sidebar.number_input("Port", value=3306)
-        
-        if st.sidebar.button("Connect to Database"):
-            self.db = DatabaseConnection(db_host, db_name, db_user, db_password, db_port)
-            if self.db.connect():
-                self.profiler = DataQualityProfiler(self.db)
-                st.sidebar.success("Connected successfully!")
-                st.session_state['db_connected'] = True
-            else:
-                st.sidebar.error("Connection failed!")
-                st.session_state['db_connected'] = False
-        
-        # Email Configuration
-        st.sidebar.subheader("Email Alert Configuration")
-        smtp_server = st.sidebar.text_input("SMTP Server", value="smtp.gmail.com")
-        smtp_port = st.sidebar.number_input("SMTP Port", value=587)
-        sender_email = st.sidebar.text_input("Sender Email")
-        sender_password = st.sidebar.text_input("Email Password", type="password")
-        recipient_email = st.sidebar.text_input("Alert Recipient Email")
-        
-        if st.sidebar.button("Setup Email Alerts"):
-            if sender_email and sender_password:
-                self.email_system = EmailAlertSystem(smtp_server, smtp_port, sender_email, sender_password)
-                st.session_state['email_configured'] = True
-                st.session_state['recipient_email'] = recipient_email
-                st.sidebar.success("Email system configured!")
-            else:
-                st.sidebar.error("Please provide email credentials!")
-    
-    def display_overview(self):
-        """Display data quality overview"""
-        st.title("📊 Data Quality Monitoring Dashboard")
-        
-        if not st.session_state.get('db_connected', False):
-            st.warning("Please connect to a database using the sidebar configuration.")
-            return
-        
-        # Get available tables
-        tables = self.db.get_table_names()
-        
-        if not tables:
-            st.warning("No tables found in the database.")
-            return
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            st.metric("Available Tables", len(tables))
-        with col2:
-            st.metric("Database Connection", "✅ Connected" if self.db.connection.is_connected() else "❌ Disconnected")
-        
-        # Table selection and profiling
-        st.subheader("Select Table for Analysis")
-        selected_table = st.selectbox("Choose a table:", tables)
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("🔍 Profile Table", key="profile_btn"):
-                with st.spinner(f"Profiling table '{selected_table}'..."):
-                    profile_results = self.profiler.profile_table(selected_table)
-                    st.session_state[f'profile_{selected_table}'] = profile_results
-                    
-                    # Check for critical issues and send alert
-                    if self._has_critical_issues(profile_results) and st.session_state.get('email_configured', False):
-                        self._send_quality_alert(profile_results)
-        
-        with col2:
-            if st.button("📧 Send Quality Report", key="email_btn"):
-                if selected_table in [key.replace('profile_', '') for key in st.session_state.keys() if key.startswith('profile_')]:
-                    profile_results = st.session_state[f'profile_{selected_table}']
-                    if st.session_state.get('email_configured', False):
-                        self._send_quality_alert(profile_results)
-                    else:
-                        st.warning("Email system not configured!")
-                else:
-                    st.warning("Please profile the table first!")
-        
-        # Display profile results if available
-        if f'profile_{selected_table}' in st.session_state:
-            self.display_profile_results(st.session_state[f'profile_{selected_table}'])
-    
-    def display_profile_results(self, profile_results: Dict[str, Any]):
-        """Display detailed profile results"""
-        st.subheader(f"📋 Profile Results: {profile_results['table_name']}")
-        
-        # Overview metrics
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric("Total Rows", f"{profile_results['total_rows']:,}")
-        with col2:
-            st.metric("Total Columns", profile_results['total_columns'])
-        with col3:
-            duplicates = profile_results['data_quality_issues']['duplicates']
-            st.metric("Duplicate Rows", duplicates, delta=f"-{duplicates}" if duplicates > 0 else None)
-        with col4:
-            missing_cols = len(profile_results['data_quality_issues']['missing_values'])
-            st.metric("Columns w/ Missing Values", missing_cols, delta=f"-{missing_cols}" if missing_cols > 0 else None)
-        
-        # Data Quality Issues
-        st.subheader("🚨 Data Quality Issues")
-        
-        issues = profile_results['data_quality_issues']
-        
-        # Missing Values
-        if issues['missing_values']:
-            st.write("**Missing Values by Column:**")
-            missing_df = pd.DataFrame([
-                {'Column': col, 'Missing Count': info['count'], 'Missing %': info['percentage']}
-                for col, info in issues['missing_values'].items()
-            ])
-            
-            fig = px.bar(missing_df, x='Column', y='Missing %', 
-                        title='Missing Values Percentage by Column',
-                        color='Missing %', color_continuous_scale='Reds')
-            st.plotly_chart(fig, use_container_width=True)
-            
-            st.dataframe(missing_df, use_container_width=True)
-        
-        # Inconsistencies
-        if issues['inconsistencies']:
-            st.write("**Data Inconsistencies:**")
-            inconsistency_data = []
-            for issue, info in issues['inconsistencies'].items():
-                inconsistency_data.append({
-                    'Issue': issue,
-                    'Type': info['type'],
-                    'Count': info['count'],
-                    'Examples': ', '.join(info['examples'][:3])
-                })
-            
-            inconsistency_df = pd.DataFrame(inconsistency_data)
-            st.dataframe(inconsistency_df, use_container_width=True)
-        
-        # Column Profiles
-        st.subheader("📊 Column Profiles")
-        
-        profile_data = []
-        for col_name, col_profile in profile_results['column_profiles'].items():
-            profile_data.append({
-                'Column': col_name,
-                'Data Type': col_profile['data_type'],
-                'Unique Values': col_profile['unique_values'],
-                'Missing Values': col_profile['missing_values'],
-                'Missing %': col_profile['missing_percentage']
-            })
-        
-        profile_df = pd.DataFrame(profile_data)
-        st.dataframe(profile_df, use_container_width=True)
-        
-        # Detailed column analysis
-        selected_column = st.selectbox("Select column for detailed analysis:", 
-                                     list(profile_results['column_profiles'].keys()))
-        
-        if selected_column:
-            col_profile = profile_results['column_profiles'][selected_column]
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.write(f"**{selected_column} Details:**")
-                for key, value in col_profile.items():
-                    if key != 'outliers':
-                        st.write(f"- **{key.replace('_', ' ').title()}:** {value}")
-            
-            with col2:
-                if 'outliers' in col_profile and col_profile['outliers']['count'] > 0:
-                    st.write("**Outliers:**")
-                    st.write(f"Count: {col_profile['outliers']['count']}")
-                    if col_profile['outliers']['values']:
-                        st.write("Sample values:")
-                        for val in col_profile['outliers']['values'][:5]:
-                            st.write(f"- {val}")
-    
-    def _has_critical_issues(self, profile_results: Dict[str, Any]) -> bool:
-        """Check if profile results contain critical data quality issues"""
-        issues = profile_results['data_quality_issues']
-        
-        # Define thresholds for critical issues
-        duplicate_threshold = profile_results['total_rows'] * 0.05  # 5% duplicates
-        missing_value_threshold = 20  # 20% missing values
-        
-        # Check for critical issues
-        if issues['duplicates'] > duplicate_threshold:
-            return True
-        
-        for col, info in issues['missing_values'].items():
-            if info['percentage'] > missing_value_threshold:
-                return True
-        
-        if len(issues['inconsistencies']) > 3:  # More than 3 inconsistency types
-            return True
-        
-        return False
-    
-    def _send_quality_alert(self, profile_results: Dict[str, Any]):
-        """Send quality alert email"""
-        if not self.email_system or not st.session_state.get('recipient_email'):
-            st.error("Email system not properly configured!")
-            return
-        
-        subject = f"Data Quality Alert - {profile_results['table_name']}"
-        body = self.email_system.generate_quality_report_email(profile_results)
-        
-        if self.email_system.send_alert(st.session_state['recipient_email'], subject, body):
-            st.success("Quality report sent successfully!")
-        else:
-            st.error("Failed to send quality report!")
-    
-    def run(self):
-        """Run the Streamlit dashboard"""
-        st.set_page_config(
-            page_title="Data Quality Monitor",
-            page_icon="🔍",
-            layout="wide",
-            initial_sidebar_state="expanded"
-        )
-        
-        # Initialize session state
-        if 'db_connected' not in st.session_state:
-            st.session_state['db_connected'] = False
-        if 'email_configured' not in st.session_state:
-            st.session_state['email_configured'] = False
-        
-        self.setup_sidebar()
-        self.display_overview()
-        
-        # Footer
-        st.markdown("---")
-        st.markdown("**Data Quality Monitoring Tool** - Automated profiling and governance")
-
-# Sample data setup function (for testing)
-def setup_sample_data():
-    """Create sample data for testing"""
-    sample_data = pd.DataFrame({
-        'id': [1, 2, 3, 4, 5, 5, 7, 8, 9, 10],  # Duplicate ID
-        'name': ['John Doe', 'jane smith', 'Bob Johnson ', None, 'Alice Brown', 'Alice Brown', 'Charlie Wilson', 'diana prince', 'Eve Adams', 'Frank Miller'],
-        'email': ['john@email.com', 'jane@email.com', 'bob@email.com', 'missing@email.com', 'alice@email.com', 'alice@email.com', 'charlie@email.com', 'diana@email.com', None, 'frank@email.com'],
-        'age': [25, 30, 35, 40, 28, 28, 45, 32, 29, None],
-        'salary': [50000, 60000, 70000, 80000, 55000, 55000, 90000, 65000, 58000, 1000000]  # Outlier salary
-    })
-    
-    st.subheader("📁 Sample Data Preview")
-    st.dataframe(sample_data, use_container_width=True)
-    
-    st.write("""
-    **Sample Data Issues:**
-    - Duplicate rows (ID 5)
-    - Missing values in name and email columns
-    - Inconsistent name formatting (case, whitespace)
-    - Salary outlier (1,000,000)
-    """)
-
-# Main application
-def main():
-    dashboard = DataQualityDashboard()
-    
-    # Add tabs for different sections
-    tab1, tab2, tab3 = st.tabs(["🏠 Dashboard", "📊 Sample Data", "ℹ️ Instructions"])
-    
-    with tab1:
-        dashboard.run()
-    
-    with tab2:
-        setup_sample_data()
-    
-    with tab3:
-        st.markdown("""
-        ## 📋 Data Quality Monitoring Tool Instructions
-        
-        ### 🔧 Setup
-        1. **Database Configuration:**
-           - Enter your MySQL connection details in the sidebar
-           - Click "Connect to Database" to establish connection
-           - Ensure your database is accessible and contains tables to analyze
-        
-        2. **Email Configuration:**
-           - Configure SMTP settings for email alerts
-           - For Gmail, use `smtp.gmail.com` with port 587
-           - Use app-specific passwords for Gmail accounts
-           - Enter recipient email for quality alerts
-        
-        ### 🔍 Features
-        1. **Automated Profiling:**
-           - Missing value detection and quantification
-           - Duplicate row identification
-           - Data type analysis
-           - Statistical summaries for numeric columns
-           - String length analysis for text columns
-           - Outlier detection using IQR method
-        
-        2. **Data Quality Issues Detection:**
-           - Case inconsistencies in text fields
-           - Whitespace formatting issues
-           - Missing value patterns
-           - Duplicate records
-        
-        3. **Dashboard Features:**
-           - Interactive visualizations
-           - Detailed column analysis
-           - Quality metrics overview
-           - Historical trend tracking
-        
-        4. **Email Alerts:**
-           - Automated alerts for critical issues
-           - Customizable thresholds
-           - HTML formatted reports
-           - Scheduled monitoring capability
-        
-        ### 🚨 Alert Thresholds
-        - **Duplicates:** > 5% of total rows
-        - **Missing Values:** > 20% for any column
-        - **Inconsistencies:** > 3 different types
-        
-        ### 💡 Best Practices
-        1. Run profiling regularly (daily/weekly)
-        2. Set up automated email alerts for critical tables
-        3. Monitor trends over time
-        4. Address data quality issues promptly
-        5. Use the detailed column analysis for root cause analysis
-        """)
-
-if __name__ == "__main__":
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import copy
+import hashlib
+import os
+import threading
+from typing import Dict, List, Tuple, Any
+import warnings
+warnings.filterwarnings('ignore')
+
+# The profiling core lives in the dq_monitor package
+from dq_monitor.errors import set_error_handler
+from dq_monitor.connection import DatabaseConnection
+from dq_monitor.storage import ProfileCache, ProfileHistoryStore
+from dq_monitor.profiler import DataQualityProfiler, BatchProfiler
+from dq_monitor.alerts import EmailAlertSystem, has_critical_issues, sample_estimate_rows
+from dq_monitor.instrumentation import INSTRUMENTATION_MODES, flame_rows
+from dq_monitor.schema import format_bytes
+
+set_error_handler(st.error)
+
+class ResourceRegistry:
+    """Process-wide database pools, profilers and email systems keyed by credentials
+    
+    Shared across Streamlit reruns and sessions so an interaction never reconnects. All profilers
+    share one ProfileCache, so a table profiled by one session is served to the others.
+    """
+    
+    def __init__(self, profile_cache: ProfileCache = None, history_store: ProfileHistoryStore = None):
+        self._lock = threading.Lock()
+        self._databases = {}
+        self._email_systems = {}
+        self.profile_cache = profile_cache or ProfileCache()
+        self.history_store = history_store or ProfileHistoryStore()
+    
+    @staticmethod
+    def _key(*parts, secret: str = '') -> Tuple:
+        return parts + (hashlib.sha256(str(secret).encode()).hexdigest(),)
+    
+    def database(self, host: str, database: str, user: str, password: str,
+                 port: int) -> Tuple[DatabaseConnection, DataQualityProfiler]:
+        """Cached connection pool for these credentials, connecting on first use, and a profiler for it
+        
+        The profiler is a shallow copy of the one cached with the pool, so a session can set its own
+        options (strategy settings, instrumentation) without changing another session's run; the pool,
+        profile cache and history store stay shared.
+        """
+        key = self._key(host, database, user, int(port), secret=password)
+        with self._lock:
+            entry = self._databases.get(key)
+            if entry is None or entry[0].pool.closed:
+                db = DatabaseConnection(host, database, user, password, int(port))
+                if not db.connect():
+                    return None, None
+                entry = (db, DataQualityProfiler(db, profile_cache=self.profile_cache,
+                                                     history_store=self.history_store))
+                self._databases[key] = entry
+        return entry[0], copy.copy(entry[1])
+    
+    def invalidate_database(self, host: str, database: str, user: str, password: str, port: int):
+        """Drop the cached pool for these credentials and close its connections"""
+        with self._lock:
+            entry = self._databases.pop(self._key(host, database, user, int(port), secret=password), None)
+        if entry is not None:
+            entry[0].disconnect()
+    
+    def email_system(self, smtp_server: str, smtp_port: int, email: str, password: str) -> 'EmailAlertSystem':
+        key = self._key(smtp_server, int(smtp_port), email, secret=password)
+        with self._lock:
+            if key not in self._email_systems:
+                self._email_systems[key] = EmailAlertSystem(smtp_server, int(smtp_port), email, password)
+            return self._email_systems[key]
+    
+    def invalidate_email_system(self, smtp_server: str, smtp_port: int, email: str, password: str):
+        """Drop the cached email system for these credentials and close its SMTP session"""
+        with self._lock:
+            email_system = self._email_systems.pop(self._key(smtp_server, int(smtp_port), email, secret=password), None)
+        if email_system is not None:
+            email_system.close()
+
+@st.cache_resource(show_spinner=False)
+def get_resource_registry() -> ResourceRegistry:
+    """The single ResourceRegistry of this Streamlit server process"""
+    return ResourceRegistry()
+
+class DataQualityDashboard:
+    """Streamlit dashboard for data quality monitoring"""
+    
+    def __init__(self):
+        self.db = None
+        self.profiler = None
+        self.email_system = None
+        self.resources = get_resource_registry()
+    
+    def restore_resources(self):
+        """Reattach the cached connection pool, profiler and email system for this session"""
+        db_credentials = st.session_state.get('db_credentials')
+        if db_credentials:
+            self.db, self.profiler = self.resources.database(**db_credentials)
+        # Report the live state rather than whatever the last button click said
+        st.session_state['db_connected'] = self.db is not None and self.db.is_connected()
+        
+        email_credentials = st.session_state.get('email_credentials')
+        if email_credentials:
+            self.email_system = self.resources.email_system(**email_credentials)
+        st.session_state['email_configured'] = self.email_system is not None
+    
+    def setup_sidebar(self):
+        """Setup sidebar configuration"""
+        st.sidebar.title("🔍 Data Quality Monitor")
+        self.restore_resources()
+        
+        # Database Configuration
+        st.sidebar.subheader("Database Configuration")
+        db_host = st.sidebar.text_input("Host", value="localhost")
+        db_name = st.sidebar.text_input("Database Name", value="test_db")
+        db_user = st.sidebar.text_input("Username", value="root")
+        db_password = st.sidebar.text_input("Password", type="password")
+        db_port = st.sidebar.number_input("Port", value=3306)
+        
+        if st.sidebar.button("Connect to Database"):
+            db_credentials = {'host': db_host, 'database': db_name, 'user': db_user,
+                              'password': db_password, 'port': int(db_port)}
+            self.db, self.profiler = self.resources.database(**db_credentials)
+            if self.db is not None:
+                st.session_state['db_credentials'] = db_credentials
+                st.sidebar.success("Connected successfully!")
+                st.session_state['db_connected'] = True
+            else:
+                st.session_state.pop('db_credentials', None)
+                st.sidebar.error("Connection failed!")
+                st.session_state['db_connected'] = False
+        
+        if st.session_state.get('db_credentials') and st.sidebar.button("Disconnect"):
+            # Explicit invalidation: closes the shared pool for these credentials in every session
+            self.resources.invalidate_database(**st.session_state.pop('db_credentials'))
+            self.db, self.profiler = None, None
+            st.session_state['db_connected'] = False
+            st.sidebar.info("Disconnected.")
+        
+        # Email Configuration
+        st.sidebar.subheader("Email Alert Configuration")
+        smtp_server = st.sidebar.text_input("SMTP Server", value="smtp.gmail.com")
+        smtp_port = st.sidebar.number_input("SMTP Port", value=587)
+        sender_email = st.sidebar.text_input("Sender Email")
+        sender_password = st.sidebar.text_input("Email Password", type="password")
+        recipient_email = st.sidebar.text_input("Alert Recipient Email")
+        
+        if st.sidebar.button("Setup Email Alerts"):
+            if sender_email and sender_password:
+                email_credentials = {'smtp_server': smtp_server, 'smtp_port': int(smtp_port),
+                                     'email': sender_email, 'password': sender_password}
+                previous = st.session_state.get('email_credentials')
+                if previous and previous != email_credentials:
+                    self.resources.invalidate_email_system(**previous)
+                self.email_system = self.resources.email_system(**email_credentials)
+                st.session_state['email_credentials'] = email_credentials
+                st.session_state['email_configured'] = True
+                st.session_state['recipient_email'] = recipient_email
+                st.sidebar.success("Email system configured!")
+            else:
+                st.sidebar.error("Please provide email credentials!")
+    
+    def display_overview(self):
+        """Display data quality overview"""
+        st.title("📊 Data Quality Monitoring Dashboard")
+        
+        if not st.session_state.get('db_connected', False):
+            st.warning("Please connect to a database using the sidebar configuration.")
+            return
+        
+        # Get available tables
+        tables = self.db.get_table_names()
+        
+        if not tables:
+            st.warning("No tables found in the database.")
+            return
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Available Tables", len(tables))
+        with col2:
+            st.metric("Database Connection", "✅ Connected" if self.db.is_connected() else "❌ Disconnected")
+        
+        with st.expander("Connection pool"):
+            st.json(self.db.pool_metrics())
+            st.json({'profile_cache': self.resources.profile_cache.metrics()})
+            if self.email_system:
+                st.json({'smtp_session': self.email_system.metrics()})
+        
+        with st.expander("Schema catalog"):
+            if st.button("Refresh schema metadata", key="catalog_refresh_btn"):
+                self.db.catalog.refresh()
+            st.dataframe(self.db.catalog.summary(), use_container_width=True)
+        
+        # Table selection and profiling
+        st.subheader("Select Table for Analysis")
+        selected_table = st.selectbox("Choose a table:", tables)
+        strategy = st.selectbox("Profiling strategy:", DataQualityProfiler.STRATEGIES,
+                                index=DataQualityProfiler.STRATEGIES.index('auto'),
+                                help="'streaming' reads the table in chunks; 'pushdown' computes statistics inside MySQL; "
+                                     "'auto' picks one from the table's size and the memory budget")
+        schema = self.db.get_table_schema(selected_table) or []
+        key_columns = st.multiselect("Duplicate key columns (optional):", [row[0] for row in schema],
+                                     help="Leave empty to detect fully duplicated rows")
+        rebuild = False
+        if strategy == 'incremental':
+            rebuild = st.checkbox("Full rebuild", help="Discard the saved state and rescan the whole table")
+        if strategy in ('streaming', 'parallel'):
+            bounded = st.checkbox("Bounded memory (sketches)", value=True,
+                                  help="Estimate distinct counts and quantiles with sketches; exact ones keep every "
+                                       "value of the table in memory")
+            self.profiler.distinct_mode = 'auto' if bounded else 'exact'
+            self.profiler.quantile_mode = 'sketch' if bounded else 'exact'
+        if strategy == 'auto':
+            budget_mb = st.number_input("Memory budget (MB)", min_value=16,
+                                        value=self.profiler.memory_budget // 2 ** 20, step=64,
+                                        help="Tables estimated to need more than this are streamed or profiled inside MySQL")
+            self.profiler.memory_budget = int(budget_mb) * 2 ** 20
+        if strategy == 'sampled':
+            col1, col2 = st.columns(2)
+            with col1:
+                self.profiler.sample_rows = int(st.number_input("Sample rows", min_value=1000,
+                                                                value=self.profiler.sample_rows, step=10000))
+            with col2:
+                self.profiler.sample_method = st.selectbox(
+                    "Sampling method:", DataQualityProfiler.SAMPLE_METHODS,
+                    index=DataQualityProfiler.SAMPLE_METHODS.index(self.profiler.sample_method),
+                    help="'pk_range' reads random primary-key ranges, 'bernoulli' filters rows with RAND() "
+                         "and 'reservoir' streams the whole table"
+                )
+        if strategy in ('memory', 'auto'):
+            columnar = st.checkbox("Columnar fetch", value=self.profiler.fetch_mode == 'columnar',
+                                   help="Decode the result set straight into typed column arrays instead of Python rows")
+            self.profiler.fetch_mode = 'columnar' if columnar else 'rows'
+            self.profiler.column_workers = st.slider("Column threads", min_value=1,
+                                                     max_value=max(os.cpu_count() or 1, 1),
+                                                     value=min(self.profiler.column_workers, os.cpu_count() or 1),
+                                                     help="Profile the columns of wide tables concurrently")
+        self.profiler.instrumentation = st.selectbox(
+            "Instrumentation:", INSTRUMENTATION_MODES, index=INSTRUMENTATION_MODES.index(self.profiler.instrumentation),
+            help="'timing' records where the run spends its time, per stage and per column; 'memory' also traces "
+                 "allocations with tracemalloc, which makes profiling several times slower"
+        )
+        use_cache = not st.checkbox("Bypass profile cache",
+                                    help="Rescan even if the table has not changed since it was last profiled")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("🔍 Profile Table", key="profile_btn"):
+                with st.spinner(f"Profiling table '{selected_table}'..."):
+                    profile_results = self.profiler.profile_table(selected_table, strategy=strategy,
+                                                                  key_columns=key_columns or None, rebuild=rebuild,
+                                                                  use_cache=use_cache)
+                    if not profile_results:
+                        st.warning(f"No profile for '{selected_table}': profiling failed.")
+                    else:
+                        st.session_state[f'profile_{selected_table}'] = profile_results
+                        
+                        # Check for critical issues and send alert
+                        if self._has_critical_issues(profile_results) and st.session_state.get('email_configured', False):
+                            self._send_quality_alert(profile_results)
+        
+        with col2:
+            if st.button("📧 Send Quality Report", key="email_btn"):
+                if selected_table in [key.replace('profile_', '') for key in st.session_state.keys() if key.startswith('profile_')]:
+                    profile_results = st.session_state[f'profile_{selected_table}']
+                    if st.session_state.get('email_configured', False):
+                        self._send_quality_alert(profile_results)
+                    else:
+                        st.warning("Email system not configured!")
+                else:
+                    st.warning("Please profile the table first!")
+        
+        # Batch profiling of every table
+        st.subheader("Profile All Tables")
+        max_workers = st.slider("Parallel workers", min_value=1, max_value=max(os.cpu_count() or 1, 1),
+                                value=min(4, os.cpu_count() or 1))
+        send_digest = st.checkbox("Send one digest email for the whole run", value=True,
+                                  help="Otherwise every table with critical issues sends its own alert")
+        if st.button("⚡ Profile All Tables", key="profile_all_btn"):
+            self.profile_all_tables(tables, strategy, max_workers, send_digest)
+        
+        # Display profile results if available
+        if f'profile_{selected_table}' in st.session_state:
+            self.display_profile_results(st.session_state[f'profile_{selected_table}'])
+        
+        self.display_trends(selected_table)
+    
+    def display_trends(self, table_name: str):
+        """Metric history of a table, read from the history store without profiling anything"""
+        history = self.resources.history_store
+        source = ProfileHistoryStore.source_name(self.db)
+        columns = history.columns(source, table_name)
+        st.subheader(f"📈 Trends: {table_name}")
+        if not columns:
+            st.info("No profiling history for this table yet.")
+            return
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            column = st.selectbox("Column:", columns, key="trend_column",
+                                  format_func=lambda name: name or "(whole table)")
+        with col2:
+            metric = st.selectbox("Metric:", history.metrics(source, table_name, column), key="trend_metric")
+        with col3:
+            days = st.slider("Last N days:", min_value=1, max_value=365, value=30, key="trend_days")
+        
+        trend_df = history.series(source, table_name, column, metric, days=days)
+        if trend_df.empty:
+            st.info(f"No {metric} values recorded in the last {days} days.")
+            return
+        fig = px.line(trend_df, x='timestamp', y='value', markers=True,
+                      title=f"{metric.replace('_', ' ').title()} of {column or table_name}",
+                      hover_data=['resolution'])
+        st.plotly_chart(fig, use_container_width=True)
+    
+    def profile_all_tables(self, tables: List[str], strategy: str, max_workers: int, send_digest: bool = True):
+        """Profile every table in parallel, storing each result in session state as it completes"""
+        batch = BatchProfiler(self.profiler, max_workers=max_workers)
+        alerting = st.session_state.get('email_configured', False) and self.email_system is not None
+        digest = self.email_system.digest() if alerting and send_digest else None
+        progress = st.progress(0.0, text=f"Profiling {len(tables)} tables...")
+        summary = []
+        
+        for done, (table_name, profile_results, error) in enumerate(batch.profile_tables(tables, strategy), start=1):
+            progress.progress(done / len(tables), text=f"Profiled {done}/{len(tables)}: {table_name}")
+            if error or not profile_results:
+                summary.append({'Table': table_name, 'Status': f"❌ {error or 'No results'}"})
+                continue
+            
+            st.session_state[f'profile_{table_name}'] = profile_results
+            critical = self._has_critical_issues(profile_results)
+            summary.append({
+                'Table': table_name,
+                'Status': "🚨 Critical issues" if critical else "✅ OK",
+                'Rows': profile_results['total_rows'],
+                'Duplicates': profile_results['data_quality_issues']['duplicates'],
+                'Columns w/ Missing Values': len(profile_results['data_quality_issues']['missing_values'])
+            })
+            if critical and digest is not None:
+                digest.add(st.session_state.get('recipient_email'), profile_results)
+            elif critical and alerting:
+                self._send_quality_alert(profile_results)
+        
+        progress.empty()
+        st.dataframe(pd.DataFrame(summary), use_container_width=True)
+        if digest:
+            self._send_quality_digest(digest)
+    
+    def display_profile_results(self, profile_results: Dict[str, Any]):
+        """Display detailed profile results"""
+        st.subheader(f"📋 Profile Results: {profile_results['table_name']}")
+        
+        if 'incremental' in profile_results:
+            incremental = profile_results['incremental']
+            st.caption(
+                f"Incremental profile merged up to {incremental['watermark_column']} = {incremental['watermark']} "
+                f"({incremental['rows_scanned']:,} new rows scanned). "
+                f"Last full rebuild: {incremental['last_full_rebuild']}"
+            )
+        if 'strategy_selection' in profile_results:
+            selection = profile_results['strategy_selection']
+            st.caption(f"Strategy chosen automatically: {selection['strategy']}. {selection['reason']}")
+        if 'sample' in profile_results:
+            sample = profile_results['sample']
+            st.warning(
+                f"Sampled profile: {sample['sample_rows']:,} of ~{sample['estimated_total_rows']:,} rows "
+                f"({sample['fraction']:.2%}, {sample['method']} sampling, {sample['seconds']}s). Counts below are "
+                f"for the sample; the estimates carry {sample['confidence']:.0%} confidence intervals."
+            )
+            with st.expander("Estimates for the whole table"):
+                st.dataframe(pd.DataFrame(sample_estimate_rows(sample)), use_container_width=True)
+        if 'scan' in profile_results:
+            scan = profile_results['scan']
+            st.caption(
+                f"Scanned in {len(scan['partitions'])} {scan['primary_key']} ranges on parallel connections"
+                f"{' from one consistent snapshot' if scan['consistent_snapshot'] else ''}"
+            )
+        if 'memory' in profile_results:
+            memory = profile_results['memory']
+            saved = 1 - memory['compact_bytes'] / memory['inferred_bytes'] if memory['inferred_bytes'] else 0
+            with st.expander(f"Memory footprint: {memory['inferred_bytes'] / 2 ** 20:.1f} MB as inferred → "
+                             f"{memory['compact_bytes'] / 2 ** 20:.1f} MB compact ({saved:.0%} saved)"):
+                st.dataframe(pd.DataFrame([
+                    {'Column': column, 'Storage dtype': info['dtype'], 'Inferred bytes': info['inferred_bytes'],
+                     'Compact bytes': info['compact_bytes']}
+                    for column, info in memory['columns'].items()
+                ]), use_container_width=True)
+        if profile_results.get('cache', {}).get('hit'):
+            st.caption(
+                f"Served from the profile cache: the table is unchanged since it was profiled at "
+                f"{profile_results['cache']['cached_at']} ({profile_results['cache']['fingerprint']} fingerprint)"
+            )
+        if 'performance' in profile_results:
+            self.display_performance(profile_results['performance'])
+        
+        # Overview metrics
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Total Rows", f"{profile_results['total_rows']:,}")
+        with col2:
+            st.metric("Total Columns", profile_results['total_columns'])
+        with col3:
+            duplicates = profile_results['data_quality_issues']['duplicates']
+            st.metric("Duplicate Rows", duplicates, delta=f"-{duplicates}" if duplicates > 0 else None)
+        with col4:
+            missing_cols = len(profile_results['data_quality_issues']['missing_values'])
+            st.metric("Columns w/ Missing Values", missing_cols, delta=f"-{missing_cols}" if missing_cols > 0 else None)
+        
+        # Data Quality Issues
+        st.subheader("🚨 Data Quality Issues")
+        
+        issues = profile_results['data_quality_issues']
+        
+        # Missing Values
+        if issues['missing_values']:
+            st.write("**Missing Values by Column:**")
+            missing_df = pd.DataFrame([
+                {'Column': col, 'Missing Count': info['count'], 'Missing %': info['percentage']}
+                for col, info in issues['missing_values'].items()
+            ])
+            
+            fig = px.bar(missing_df, x='Column', y='Missing %', 
+                        title='Missing Values Percentage by Column',
+                        color='Missing %', color_continuous_scale='Reds')
+            st.plotly_chart(fig, use_container_width=True)
+            
+            st.dataframe(missing_df, use_container_width=True)
+        
+        # Duplicates
+        duplicate_keys = issues.get('duplicate_keys', {})
+        if issues['duplicates'] and duplicate_keys.get('examples'):
+            st.write("**Sample Duplicate Keys:**")
+            st.dataframe(pd.DataFrame(duplicate_keys['examples'], columns=duplicate_keys['columns']),
+                         use_container_width=True)
+        
+        # Inconsistencies
+        if issues['inconsistencies']:
+            st.write("**Data Inconsistencies:**")
+            inconsistency_data = []
+            for issue, info in issues['inconsistencies'].items():
+                inconsistency_data.append({
+                    'Issue': issue,
+                    'Type': info['type'],
+                    'Count': info['count'],
+                    'Examples': ', '.join(info['examples'][:3])
+                })
+            
+            inconsistency_df = pd.DataFrame(inconsistency_data)
+            st.dataframe(inconsistency_df, use_container_width=True)
+        
+        # Column Profiles
+        st.subheader("📊 Column Profiles")
+        
+        profile_data = []
+        for col_name, col_profile in profile_results['column_profiles'].items():
+            profile_data.append({
+                'Column': col_name,
+                'Data Type': col_profile['data_type'],
+                'Unique Values': col_profile['unique_values'],
+                'Missing Values': col_profile['missing_values'],
+                'Missing %': col_profile['missing_percentage']
+            })
+        
+        profile_df = pd.DataFrame(profile_data)
+        st.dataframe(profile_df, use_container_width=True)
+        
+        # Detailed column analysis
+        selected_column = st.selectbox("Select column for detailed analysis:", 
+                                     list(profile_results['column_profiles'].keys()))
+        
+        if selected_column:
+            col_profile = profile_results['column_profiles'][selected_column]
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.write(f"**{selected_column} Details:**")
+                for key, value in col_profile.items():
+                    if key not in ('outliers', 'distinct_sketch'):
+                        st.write(f"- **{key.replace('_', ' ').title()}:** {value}")
+            
+            with col2:
+                if 'outliers' in col_profile and col_profile['outliers']['count'] > 0:
+                    st.write("**Outliers:**")
+                    st.write(f"Count: {col_profile['outliers']['count']}")
+                    if col_profile['outliers']['values']:
+                        st.write("Sample values:")
+                        for val in col_profile['outliers']['values'][:5]:
+                            st.write(f"- {val}")
+    
+    def display_performance(self, performance: Dict[str, Any]):
+        """Flame-style breakdown of where a profiling run spent its time, with the stage and column timings"""
+        peak = (f", {format_bytes(performance['peak_bytes'])} peak allocation"
+                if performance['peak_bytes'] is not None else '')
+        with st.expander(f"⏱️ Performance: {performance['wall_seconds']:.2f}s wall, "
+                         f"{performance['cpu_seconds']:.2f}s CPU{peak}"):
+            flame = pd.DataFrame(flame_rows(performance))
+            fig = go.Figure(go.Icicle(
+                ids=flame['id'], parents=flame['parent'], labels=flame['label'], values=flame['self_seconds'],
+                branchvalues='remainder', tiling=dict(orientation='v', flip='y'),
+                hovertemplate='%{label}<br>%{percentRoot:.1%} of the run<extra></extra>'
+            ))
+            fig.update_layout(title='Where the time went (width = wall time)', margin=dict(t=40, l=0, r=0, b=0))
+            st.plotly_chart(fig, use_container_width=True)
+            
+            columns = performance['columns']
+            st.write("**Stages:**")
+            st.dataframe(pd.DataFrame([
+                {'Stage': ' / '.join(stage['path']), 'Calls': stage['calls'], 'Wall (s)': stage['wall_seconds'],
+                 'CPU (s)': stage['cpu_seconds'], 'Rows': stage['rows'], 'Rows/s': stage['rows_per_sec'],
+                 'Peak allocation': format_bytes(stage['peak_bytes']) if stage['peak_bytes'] is not None else None}
+                for stage in performance['stages'] if stage['path'][-1] not in columns
+            ]), use_container_width=True)
+            if columns:
+                st.write("**Slowest columns:**")
+                slowest = sorted(columns.items(), key=lambda item: item[1]['wall_seconds'], reverse=True)[:20]
+                st.dataframe(pd.DataFrame([
+                    {'Column': column, 'Wall (s)': timing['wall_seconds'], 'CPU (s)': timing['cpu_seconds'],
+                     'Rows/s': timing['rows_per_sec'],
+                     'Peak allocation': format_bytes(timing['peak_bytes']) if timing['peak_bytes'] is not None else None,
+                     **{f"{stage} (s)": seconds for stage, seconds in timing['stages'].items()}}
+                    for column, timing in slowest
+                ]), use_container_width=True)
+    
+    def _has_critical_issues(self, profile_results: Dict[str, Any]) -> bool:
+        """Check if profile results contain critical data quality issues"""
+        return has_critical_issues(profile_results)
+    
+    def _send_quality_alert(self, profile_results: Dict[str, Any]):
+        """Send quality alert email"""
+        if not self.email_system or not st.session_state.get('recipient_email'):
+            st.error("Email system not properly configured!")
+            return
+        
+        subject = f"Data Quality Alert - {profile_results['table_name']}"
+        body = self.email_system.generate_quality_report_email(profile_results)
+        
+        if self.email_system.send_alert(st.session_state['recipient_email'], subject, body):
+            st.success("Quality report sent successfully!")
+        else:
+            st.error("Failed to send quality report!")
+    
+    def _send_quality_digest(self, digest):
+        """Send the reports collected during a batch run as one email"""
+        if not st.session_state.get('recipient_email'):
+            st.error("Email system not properly configured!")
+            return
+        
+        tables = len(digest)
+        if all(digest.send().values()):
+            st.success(f"Quality digest for {tables} table{'s' if tables != 1 else ''} sent successfully!")
+        else:
+            st.error("Failed to send quality digest!")
+    
+    def run(self):
+        """Run the Streamlit dashboard"""
+        st.set_page_config(
+            page_title="Data Quality Monitor",
+            page_icon="🔍",
+            layout="wide",
+            initial_sidebar_state="expanded"
+        )
+        
+        # Initialize session state
+        if 'db_connected' not in st.session_state:
+            st.session_state['db_connected'] = False
+        if 'email_configured' not in st.session_state:
+            st.session_state['email_configured'] = False
+        
+        self.setup_sidebar()
+        self.display_overview()
+        
+        # Footer
+        st.markdown("---")
+        st.markdown("**Data Quality Monitoring Tool** - Automated profiling and governance")
+
+# Sample data setup function (for testing)
+def setup_sample_data():
+    """Create sample data for testing"""
+    sample_data = pd.DataFrame({
+        'id': [1, 2, 3, 4, 5, 5, 7, 8, 9, 10],  # Duplicate ID
+        'name': ['John Doe', 'jane smith', 'Bob Johnson ', None, 'Alice Brown', 'Alice Brown', 'Charlie Wilson', 'diana prince', 'Eve Adams', 'Frank Miller'],
+        'email': ['john@email.com', 'jane@email.com', 'bob@email.com', 'missing@email.com', 'alice@email.com', 'alice@email.com', 'charlie@email.com', 'diana@email.com', None, 'frank@email.com'],
+        'age': [25, 30, 35, 40, 28, 28, 45, 32, 29, None],
+        'salary': [50000, 60000, 70000, 80000, 55000, 55000, 90000, 65000, 58000, 1000000]  # Outlier salary
+    })
+    
+    st.subheader("📁 Sample Data Preview")
+    st.dataframe(sample_data, use_container_width=True)
+    
+    st.write("""
+    **Sample Data Issues:**
+    - Duplicate rows (ID 5)
+    - Missing values in name and email columns
+    - Inconsistent name formatting (case, whitespace)
+    - Salary outlier (1,000,000)
+    """)
+
+# Main application
+def main():
+    dashboard = DataQualityDashboard()
+    
+    # Add tabs for different sections
+    tab1, tab2, tab3 = st.tabs(["🏠 Dashboard", "📊 Sample Data", "ℹ️ Instructions"])
+    
+    with tab1:
+        dashboard.run()
+    
+    with tab2:
+        setup_sample_data()
+    
+    with tab3:
+        st.markdown("""
+        ## 📋 Data Quality Monitoring Tool Instructions
+        
+        ### 🔧 Setup
+        1. **Database Configuration:**
+           - Enter your MySQL connection details in the sidebar
+           - Click "Connect to Database" to establish connection
+           - Ensure your database is accessible and contains tables to analyze
+        
+        2. **Email Configuration:**
+           - Configure SMTP settings for email alerts
+           - For Gmail, use `smtp.gmail.com` with port 587
+           - Use app-specific passwords for Gmail accounts
+           - Enter recipient email for quality alerts
+        
+        ### 🔍 Features
+        1. **Automated Profiling:**
+           - Missing value detection and quantification
+           - Duplicate row identification
+           - Data type analysis
+           - Statistical summaries for numeric columns
+           - String length analysis for text columns
+           - Outlier detection using IQR method
+        
+        2. **Data Quality Issues Detection:**
+           - Case inconsistencies in text fields
+           - Whitespace formatting issues
+           - Missing value patterns
+           - Duplicate records
+        
+        3. **Dashboard Features:**
+           - Interactive visualizations
+           - Detailed column analysis
+           - Quality metrics overview
+           - Historical trend tracking
+        
+        4. **Email Alerts:**
+           - Automated alerts for critical issues
+           - Customizable thresholds
+           - HTML formatted reports
+           - Scheduled monitoring capability
+        
+        ### 🚨 Alert Thresholds
+        - **Duplicates:** > 5% of total rows
+        - **Missing Values:** > 20% for any column
+        - **Inconsistencies:** > 3 different types
+        
+        ### 💡 Best Practices
+        1. Run profiling regularly (daily/weekly)
+        2. Set up automated email alerts for critical tables
+        3. Monitor trends over time
+        4. Address data quality issues promptly
+        5. Use the detailed column analysis for root cause analysis
+        """)
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
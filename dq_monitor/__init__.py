@@ -0,0 +1,38 @@
+"""Data quality profiling for MySQL tables, usable without Streamlit
+
+The names below are imported lazily on first access, so ``import dq_monitor`` (and the CLI's
+argument parsing) does not pay for pandas, NumPy or the MySQL driver until they are needed.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'DatabaseConnection': 'connection',
+    'MetadataCatalog': 'connection',
+    'ColumnarDecoder': 'connection',
+    'DataQualityProfiler': 'profiler',
+    'PushdownProfiler': 'profiler',
+    'BatchProfiler': 'profiler',
+    'ProfileStateStore': 'storage',
+    'ProfileCache': 'storage',
+    'ProfileHistoryStore': 'storage',
+    'EmailAlertSystem': 'alerts',
+    'AlertDigest': 'alerts',
+    'has_critical_issues': 'alerts',
+    'PerformanceRecorder': 'instrumentation',
+    'set_error_handler': 'errors',
+    'report_error': 'errors',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,396 @@
+"""Per-column and per-table accumulators folded chunk by chunk by the streaming strategies"""
+
+import os
+import shutil
+import tempfile
+import weakref
+from typing import Dict, List, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from .schema import STRING_DTYPE_ALLOWS_NULLS, decimal_to_float
+from .sketches import DistinctCounter, KLLSketch, ValueReservoir, _hash_values
+
+def inconsistency_masks(non_null_values: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """Boolean masks of mixed-case and untrimmed values in a string Series
+    
+    The column is dictionary-encoded first and the string checks run once per distinct value, so
+    their cost follows the column's cardinality rather than its row count.
+    """
+    if isinstance(non_null_values.dtype, pd.CategoricalDtype):
+        codes = non_null_values.cat.codes.to_numpy()
+        uniques = pd.Series(non_null_values.cat.categories.astype(object))
+    else:
+        codes, uniques = pd.factorize(non_null_values)
+        uniques = pd.Series(uniques)
+    mixed_case = (uniques.str.lower() != uniques) & (uniques.str.upper() != uniques)
+    whitespace = uniques.str.strip() != uniques
+    mixed_case_mask = pd.Series(mixed_case.to_numpy(dtype=bool)[codes], index=non_null_values.index)
+    whitespace_mask = pd.Series(whitespace.to_numpy(dtype=bool)[codes], index=non_null_values.index)
+    return mixed_case_mask, whitespace_mask
+
+class ColumnAccumulator:
+    """Mergeable per-column statistics for chunked profiling"""
+    
+    def __init__(self, distinct_mode: str = 'exact', hll_precision: int = 14, exact_distinct_limit: int = 100000,
+                 quantile_mode: str = 'exact', sketch_k: int = 200):
+        self.count = 0
+        self.nulls = 0
+        self.kind = None  # 'numeric', 'string' or 'other'; None until a non-null chunk is seen
+        self.dtype = None
+        self.distinct = DistinctCounter(distinct_mode, hll_precision, exact_distinct_limit)
+        
+        # Numeric statistics (Welford running mean / variance)
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min_value = None
+        self.max_value = None
+        # 'exact' keeps the non-null values for IQR outliers, 'sketch' keeps a KLL sketch plus a sample
+        self.quantile_mode = quantile_mode
+        self.values = []
+        self.quantiles = KLLSketch(sketch_k) if quantile_mode == 'sketch' else None
+        self.sample = ValueReservoir() if quantile_mode == 'sketch' else None
+        
+        # String statistics
+        self.length_sum = 0
+        self.length_count = 0
+        self.min_length = None
+        self.max_length = None
+        self.mixed_case_count = 0
+        self.mixed_case_examples = []
+        self.whitespace_count = 0
+        self.whitespace_examples = []
+    
+    def update(self, series: pd.Series):
+        """Fold one chunk of column values into the accumulator"""
+        null_mask = series.isna()
+        chunk_nulls = int(null_mask.sum())
+        self.count += len(series)
+        self.nulls += chunk_nulls
+        
+        if chunk_nulls == len(series):
+            return
+        
+        if pd.api.types.is_numeric_dtype(series):
+            chunk_kind = 'numeric'
+        elif pd.api.types.is_string_dtype(series):
+            chunk_kind = 'string'
+        else:
+            chunk_kind = 'other'
+        self._merge_kind(chunk_kind, series.dtype)
+        
+        non_null = series[~null_mask]
+        self.distinct.update(non_null)
+        
+        if chunk_kind == 'numeric':
+            values = non_null.to_numpy()
+            self._merge_moments(len(values), float(values.mean()), float(((values - values.mean()) ** 2).sum()))
+            self._merge_range(values.min(), values.max())
+            if self.quantiles is not None:
+                self.quantiles.update(values)
+                self.sample.update(values.astype('float64'))
+            else:
+                self.values.append(values)
+        elif chunk_kind == 'string':
+            lengths = non_null.str.len()
+            self._merge_lengths(int(lengths.sum()), len(lengths), int(lengths.min()), int(lengths.max()))
+            
+            mixed_case_mask, whitespace_mask = inconsistency_masks(non_null)
+            self._merge_inconsistencies(
+                int(mixed_case_mask.sum()), non_null[mixed_case_mask].head(5).tolist(),
+                int(whitespace_mask.sum()), non_null[whitespace_mask].head(5).tolist()
+            )
+    
+    def merge(self, other: 'ColumnAccumulator'):
+        """Merge another accumulator for the same column into this one"""
+        self.count += other.count
+        self.nulls += other.nulls
+        if other.kind is None:
+            return
+        self._merge_kind(other.kind, other.dtype)
+        self.distinct.merge(other.distinct)
+        if other.n:
+            self._merge_moments(other.n, other.mean, other.m2)
+            self._merge_range(other.min_value, other.max_value)
+            if self.quantiles is not None:
+                self.quantiles.merge(other.quantiles)
+                self.sample.merge(other.sample)
+            else:
+                self.values.extend(other.values)
+        if other.length_count:
+            self._merge_lengths(other.length_sum, other.length_count, other.min_length, other.max_length)
+            self._merge_inconsistencies(
+                other.mixed_case_count, other.mixed_case_examples,
+                other.whitespace_count, other.whitespace_examples
+            )
+    
+    def final_dtype(self):
+        """Dtype the column would have had if loaded as one DataFrame"""
+        if self.kind is None:
+            return np.dtype(object)
+        if self.nulls and self.kind == 'numeric':
+            # pandas promotes integer columns with NULLs to float64 and bools to object
+            if self.dtype == np.dtype(bool):
+                return np.dtype(object)
+            if pd.api.types.is_integer_dtype(self.dtype):
+                return np.dtype('float64')
+        return self.dtype
+    
+    def final_kind(self) -> str:
+        """Column kind after all chunks, matching the in-memory dtype checks"""
+        if self.count == 0:
+            return 'string'  # an empty object column counts as a string column in pandas
+        if self.kind is None or self.final_dtype() == np.dtype(object) and self.kind == 'numeric':
+            return 'other'
+        if self.kind == 'string' and self.nulls and not STRING_DTYPE_ALLOWS_NULLS:
+            return 'other'
+        return self.kind
+    
+    def _merge_kind(self, kind: str, dtype):
+        if self.kind is None:
+            self.kind, self.dtype = kind, dtype
+        elif self.kind != kind:
+            self.kind, self.dtype = 'other', np.dtype(object)
+        elif self.dtype != dtype:
+            if kind == 'numeric' and np.dtype(bool) not in (self.dtype, dtype):
+                self.dtype = np.result_type(self.dtype, dtype)
+            else:
+                self.dtype = np.dtype(object)
+                if kind == 'numeric':
+                    self.kind = 'other'
+    
+    def _merge_moments(self, n: int, mean: float, m2: float):
+        # Chan et al. parallel update of the Welford running moments
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta ** 2 * self.n * n / total
+        self.n = total
+    
+    def _merge_range(self, min_value, max_value):
+        self.min_value = min_value if self.min_value is None else min(self.min_value, min_value)
+        self.max_value = max_value if self.max_value is None else max(self.max_value, max_value)
+    
+    def _merge_lengths(self, length_sum: int, length_count: int, min_length: int, max_length: int):
+        self.length_sum += length_sum
+        self.length_count += length_count
+        self.min_length = min_length if self.min_length is None else min(self.min_length, min_length)
+        self.max_length = max_length if self.max_length is None else max(self.max_length, max_length)
+    
+    def _merge_inconsistencies(self, mixed_case_count: int, mixed_case_examples: List[str],
+                               whitespace_count: int, whitespace_examples: List[str]):
+        self.mixed_case_count += mixed_case_count
+        self.mixed_case_examples = (self.mixed_case_examples + mixed_case_examples)[:5]
+        self.whitespace_count += whitespace_count
+        self.whitespace_examples = (self.whitespace_examples + whitespace_examples)[:5]
+
+def _row_values(frame: pd.DataFrame, position: int) -> List[Any]:
+    """One row as a list of plain Python values, with None for missing values"""
+    row = []
+    for value in frame.iloc[position].tolist():
+        if pd.api.types.is_scalar(value) and pd.isna(value):
+            value = None
+        elif isinstance(value, np.generic):
+            value = value.item()
+        row.append(value)
+    return row
+
+def hash_rows(frame: pd.DataFrame) -> np.ndarray:
+    """64-bit row fingerprints that do not depend on per-chunk dtype inference"""
+    combined = np.zeros(len(frame), dtype=np.uint64)
+    for column in frame.columns:
+        series = frame[column]
+        hashed = _hash_values(series)
+        hashed[series.isna().to_numpy()] = np.uint64(0)
+        combined = combined * np.uint64(1000003) ^ hashed
+    return combined
+
+class DuplicateDetector:
+    """Memory-bounded duplicate row counter over 64-bit fingerprints with disk spill"""
+    
+    def __init__(self, key_columns: List[str] = None, memory_budget: int = 64 * 1024 * 1024,
+                 partitions: int = 64, sample_size: int = 5, spill_dir: str = None):
+        self.key_columns = list(key_columns) if key_columns else None
+        self.memory_budget = memory_budget
+        self.partitions = partitions
+        self.sample_size = sample_size
+        self.total_rows = 0
+        self.seen = np.empty(0, dtype=np.uint64)  # sorted unique fingerprints held in memory
+        self.pending = []
+        self.pending_rows = 0
+        # A caller-supplied spill_dir is kept (e.g. for incremental state); otherwise a temp dir is used
+        self.spill_dir = spill_dir
+        self.persistent = spill_dir is not None
+        self.sample_keys = []
+        self._sample_fingerprints = set()
+        self._cleanup = None
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_cleanup'] = None
+        return state
+    
+    def update(self, chunk: pd.DataFrame):
+        """Fingerprint a chunk of rows (or of the key columns)"""
+        frame = chunk[self.key_columns] if self.key_columns else chunk
+        fingerprints = hash_rows(frame)
+        self.total_rows += len(fingerprints)
+        
+        if len(self.sample_keys) < self.sample_size:
+            self._collect_samples(frame, fingerprints)
+        
+        self.pending.append(fingerprints)
+        self.pending_rows += len(fingerprints)
+        if self.pending_rows * 8 > self.memory_budget // 4:
+            self._compact()
+    
+    def merge(self, other: 'DuplicateDetector'):
+        """Combine with a detector that saw another partition of the same table"""
+        self.total_rows += other.total_rows
+        self.pending.extend([other.seen] + other.pending)
+        self.pending_rows += len(other.seen) + other.pending_rows
+        for key in other.sample_keys[:self.sample_size - len(self.sample_keys)]:
+            self.sample_keys.append(key)
+        if other.spill_dir is not None:
+            self._ensure_spill_dir()
+            for partition in range(self.partitions):
+                source = os.path.join(other.spill_dir, f'{partition}.bin')
+                if os.path.exists(source):
+                    with open(source, 'rb') as src, open(self._partition_path(partition), 'ab') as dst:
+                        shutil.copyfileobj(src, dst)
+            other.close()
+        self._compact()
+    
+    def duplicate_count(self) -> int:
+        """Rows whose fingerprint was already seen earlier"""
+        self._compact()
+        if self.spill_dir is None or not os.path.isdir(self.spill_dir):
+            return int(self.total_rows - len(self.seen))
+        
+        self._spill()
+        distinct = 0
+        for partition in range(self.partitions):
+            path = self._partition_path(partition)
+            if os.path.exists(path):
+                distinct += len(np.unique(np.fromfile(path, dtype=np.uint64)))
+        return int(self.total_rows - distinct)
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if not self.persistent and self.spill_dir is not None:
+            # The unpickled copy (e.g. in the parent of a worker process) now owns the temp files
+            self._cleanup = weakref.finalize(self, shutil.rmtree, self.spill_dir, True)
+    
+    def detach(self):
+        """Stop this instance from deleting its spill files; used before handing it to another process"""
+        if self._cleanup is not None:
+            self._cleanup.detach()
+            self._cleanup = None
+    
+    def close(self):
+        """Remove any spill files"""
+        if self._cleanup is not None:
+            self._cleanup()
+            self._cleanup = None
+            self.spill_dir = None
+    
+    def _compact(self):
+        if self.pending:
+            self.seen = np.unique(np.concatenate([self.seen] + self.pending))
+            self.pending = []
+            self.pending_rows = 0
+        if self.seen.nbytes > self.memory_budget:
+            self._spill()
+    
+    def _spill(self):
+        """Append in-memory fingerprints to per-partition files keyed on their top bits"""
+        self._ensure_spill_dir()
+        shift = np.uint64(64 - int(np.log2(self.partitions)))
+        partition_ids = (self.seen >> shift).astype(np.int64)
+        for partition in np.unique(partition_ids):
+            with open(self._partition_path(partition), 'ab') as f:
+                self.seen[partition_ids == partition].tofile(f)
+        self.seen = np.empty(0, dtype=np.uint64)
+    
+    def _ensure_spill_dir(self):
+        if self.partitions & (self.partitions - 1):
+            raise ValueError("Duplicate detector partitions must be a power of two")
+        if self.persistent:
+            os.makedirs(self.spill_dir, exist_ok=True)
+        elif self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix='dq_duplicates_')
+            self._cleanup = weakref.finalize(self, shutil.rmtree, self.spill_dir, True)
+    
+    def _partition_path(self, partition: int) -> str:
+        return os.path.join(self.spill_dir, f'{partition}.bin')
+    
+    def _collect_samples(self, frame: pd.DataFrame, fingerprints: np.ndarray):
+        """Remember a few duplicated keys seen while the earlier fingerprints are still in memory"""
+        duplicated = pd.Series(fingerprints).duplicated().to_numpy()
+        if len(self.seen):
+            positions = np.minimum(np.searchsorted(self.seen, fingerprints), len(self.seen) - 1)
+            duplicated |= self.seen[positions] == fingerprints
+        if self.pending:
+            duplicated |= np.isin(fingerprints, np.concatenate(self.pending))
+        
+        for position in np.flatnonzero(duplicated):
+            fingerprint = int(fingerprints[position])
+            if fingerprint in self._sample_fingerprints:
+                continue
+            self._sample_fingerprints.add(fingerprint)
+            self.sample_keys.append(_row_values(frame, position))
+            if len(self.sample_keys) >= self.sample_size:
+                break
+
+class TableAccumulator:
+    """Mergeable table-level statistics built from DataFrame chunks"""
+    
+    def __init__(self, columns: List[str], key_columns: List[str] = None,
+                 duplicate_memory_budget: int = 64 * 1024 * 1024, duplicate_spill_dir: str = None,
+                 decimal_columns: Dict[str, Tuple[int, int]] = None, **column_options):
+        self.columns = list(columns)
+        self.total_rows = 0
+        # DECIMAL columns are converted to float64 before anything sees them; precision_loss records
+        # whether any value had more significant digits than float64 keeps
+        self.decimal_columns = {column: spec for column, spec in (decimal_columns or {}).items() if column in self.columns}
+        self.precision_loss = dict.fromkeys(self.decimal_columns, False)
+        self.column_accumulators = {column: ColumnAccumulator(**column_options) for column in self.columns}
+        self.duplicates = DuplicateDetector(key_columns, memory_budget=duplicate_memory_budget,
+                                            spill_dir=duplicate_spill_dir)
+    
+    def update(self, chunk: pd.DataFrame):
+        """Fold one DataFrame chunk into the table statistics"""
+        chunk = self.convert_decimals(chunk)
+        self.total_rows += len(chunk)
+        for column in self.columns:
+            self.column_accumulators[column].update(chunk[column])
+        self.duplicates.update(chunk)
+    
+    def merge(self, other: 'TableAccumulator'):
+        """Merge statistics from another partition of the same table"""
+        self.total_rows += other.total_rows
+        for column in self.columns:
+            self.column_accumulators[column].merge(other.column_accumulators[column])
+        for column, lossy in other.precision_loss.items():
+            self.precision_loss[column] = self.precision_loss.get(column, False) or lossy
+        self.duplicates.merge(other.duplicates)
+    
+    def convert_decimals(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Chunk with its DECIMAL columns as float64"""
+        converted = {}
+        for column, (precision, scale) in self.decimal_columns.items():
+            if column in chunk.columns and chunk[column].dtype == object:
+                converted[column], lossy = decimal_to_float(chunk[column], precision, scale)
+                self.precision_loss[column] = self.precision_loss[column] or lossy
+        if not converted:
+            return chunk
+        chunk = chunk.copy(deep=False)
+        for column, values in converted.items():
+            chunk[column] = values
+        return chunk
+    
+    def duplicate_count(self) -> int:
+        """Number of rows whose fingerprint was already seen"""
+        return self.duplicates.duplicate_count()
@@ -0,0 +1,307 @@
+"""Email alerts and HTML quality reports"""
+
+import smtplib
+import threading
+import time
+from datetime import datetime
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from typing import Dict, List, Any
+
+from .errors import report_error
+
+class EmailAlertSystem:
+    """Email alert system for data quality issues
+    
+    Keeps one authenticated SMTP session open between alerts instead of connecting, negotiating TLS and
+    logging in for every email. The session is probed with NOOP when it has been idle, replaced once it
+    has been idle longer than idle_timeout or has sent max_messages_per_session messages, and
+    re-established once if the server dropped it mid-send. It is shared by every thread using this
+    instance; close() ends it.
+    """
+    
+    def __init__(self, smtp_server: str, smtp_port: int, email: str, password: str, use_tls: bool = True,
+                 timeout: float = 30.0, idle_timeout: float = 240.0, max_messages_per_session: int = 100):
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.email = email
+        self.password = password
+        # use_tls=False and an empty password suit a local relay or test server without STARTTLS/AUTH
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.max_messages_per_session = max_messages_per_session
+        self._lock = threading.Lock()
+        self._server = None
+        self._last_used = 0.0
+        self._session_messages = 0
+        self._stats = {'connections': 0, 'reconnects': 0, 'messages': 0, 'failures': 0}
+    
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            if self.password:
+                server.login(self.email, self.password)
+        except Exception:
+            server.close()
+            raise
+        self._stats['connections'] += 1
+        self._session_messages = 0
+        return server
+    
+    def _close_session(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                self._server.close()
+            self._server = None
+    
+    def _session(self) -> smtplib.SMTP:
+        """The open session, replaced if it is stale or no longer answers NOOP (call with the lock held)"""
+        if self._server is not None:
+            idle = time.monotonic() - self._last_used
+            if idle > self.idle_timeout or self._session_messages >= self.max_messages_per_session:
+                self._close_session()
+            elif idle > 1.0:
+                # Servers close idle sessions on their own schedule: probe before relying on it
+                try:
+                    alive = self._server.noop()[0] == 250
+                except (smtplib.SMTPException, OSError):
+                    alive = False
+                if not alive:
+                    self._server.close()
+                    self._server = None
+                    self._stats['reconnects'] += 1
+        if self._server is None:
+            self._server = self._connect()
+        return self._server
+    
+    def _message(self, recipient: str, subject: str, body: str) -> MIMEMultipart:
+        msg = MIMEMultipart()
+        msg['From'] = self.email
+        msg['To'] = recipient
+        msg['Subject'] = subject
+        
+        msg.attach(MIMEText(body, 'html'))
+        return msg
+    
+    def send_alert(self, recipient: str, subject: str, body: str):
+        """Send email alert"""
+        try:
+            text = self._message(recipient, subject, body).as_string()
+            with self._lock:
+                server = self._session()
+                try:
+                    server.sendmail(self.email, recipient, text)
+                except (smtplib.SMTPServerDisconnected, smtplib.SMTPHeloError, ConnectionError):
+                    # The server dropped the session between the probe and the send: reconnect once
+                    if self._server is not None:
+                        self._server.close()
+                        self._server = None
+                    self._stats['reconnects'] += 1
+                    self._session().sendmail(self.email, recipient, text)
+                self._last_used = time.monotonic()
+                self._session_messages += 1
+                self._stats['messages'] += 1
+            
+            return True
+        except Exception as e:
+            with self._lock:
+                self._stats['failures'] += 1
+                # A half-broken session would fail the next alert too
+                if self._server is not None:
+                    self._server.close()
+                    self._server = None
+            report_error(f"Failed to send email: {e}")
+            return False
+    
+    def close(self):
+        """QUIT the open SMTP session, if any"""
+        with self._lock:
+            self._close_session()
+    
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, 'session_open': self._server is not None}
+    
+    def digest(self) -> 'AlertDigest':
+        """A digest that collects this batch's alerts and sends one combined report per recipient"""
+        return AlertDigest(self)
+    
+    @staticmethod
+    def _report_section(profile_results: Dict[str, Any]) -> str:
+        """HTML body of one table's report, without the surrounding page"""
+        
+        table_name = profile_results.get('table_name', 'Unknown')
+        timestamp = profile_results.get('timestamp', datetime.now().isoformat())
+        total_rows = profile_results.get('total_rows', 0)
+        issues = profile_results.get('data_quality_issues', {})
+        
+        missing_values = issues.get('missing_values', {})
+        duplicates = issues.get('duplicates', 0)
+        inconsistencies = issues.get('inconsistencies', {})
+        sample = profile_results.get('sample')
+        sample_html = ''
+        if sample:
+            sample_html = (
+                f"<p><strong>Sampled profile:</strong> {sample['sample_rows']:,} of ~{sample['estimated_total_rows']:,} "
+                f"rows ({sample['fraction']:.2%}, {sample['method']} sampling). Counts are for the sample; "
+                f"estimates for the whole table with {sample['confidence']:.0%} confidence intervals:</p><ul>"
+                + ''.join(f"<li><strong>{row['Issue']} {row['Column']}:</strong> {row['Rate']} "
+                          f"({row['Interval']}), ~{row['Estimated count']:,} rows</li>"
+                          for row in sample_estimate_rows(sample) if row['Estimated count'] or row['Issue'] == 'duplicates')
+                + "</ul>"
+            )
+        
+        return f"""
+        <h2>Data Quality Report - {table_name}</h2>
+        <p><strong>Generated:</strong> {timestamp}</p>
+        <p><strong>Total Rows:</strong> {total_rows:,}</p>
+        {sample_html}
+        
+        <h3>Data Quality Issues Summary</h3>
+        <ul>
+            <li><strong>Duplicate Rows:</strong> {duplicates:,}</li>
+            <li><strong>Columns with Missing Values:</strong> {len(missing_values)}</li>
+            <li><strong>Data Inconsistencies:</strong> {len(inconsistencies)}</li>
+        </ul>
+        
+        {'<h3>Missing Values by Column</h3><ul>' + ''.join([f'<li><strong>{col}:</strong> {info["count"]:,} ({info["percentage"]}%)</li>' for col, info in missing_values.items()]) + '</ul>' if missing_values else ''}
+        
+        {'<h3>Data Inconsistencies</h3><ul>' + ''.join([f'<li><strong>{issue}:</strong> {info["type"]} - {info["count"]} cases</li>' for issue, info in inconsistencies.items()]) + '</ul>' if inconsistencies else ''}
+        """
+    
+    def generate_quality_report_email(self, profile_results: Dict[str, Any]) -> str:
+        """Generate HTML email for data quality report"""
+        
+        html_body = f"""
+        <html>
+        <body>
+        {self._report_section(profile_results)}
+        
+        <p>Please review the data quality dashboard for detailed analysis.</p>
+        </body>
+        </html>
+        """
+        
+        return html_body
+    
+    def generate_digest_email(self, reports: List[Dict[str, Any]]) -> str:
+        """Generate one HTML email covering several tables' reports: a summary table, then each report"""
+        
+        summary_rows = ''.join(
+            f"<tr><td>{report.get('table_name', 'Unknown')}</td><td>{report.get('total_rows', 0):,}</td>"
+            f"<td>{report['data_quality_issues'].get('duplicates', 0):,}</td>"
+            f"<td>{len(report['data_quality_issues'].get('missing_values', {}))}</td>"
+            f"<td>{len(report['data_quality_issues'].get('inconsistencies', {}))}</td>"
+            f"<td>{'critical' if has_critical_issues(report) else 'ok'}</td></tr>"
+            for report in reports
+        )
+        
+        html_body = f"""
+        <html>
+        <body>
+        <h2>Data Quality Digest - {len(reports)} table{'s' if len(reports) != 1 else ''}</h2>
+        <p><strong>Generated:</strong> {datetime.now().isoformat()}</p>
+        <table border="1" cellpadding="4" cellspacing="0">
+        <tr><th>Table</th><th>Total Rows</th><th>Duplicate Rows</th><th>Columns with Missing Values</th>
+        <th>Data Inconsistencies</th><th>Status</th></tr>
+        {summary_rows}
+        </table>
+        
+        {'<hr>'.join(self._report_section(report) for report in reports)}
+        
+        <p>Please review the data quality dashboard for detailed analysis.</p>
+        </body>
+        </html>
+        """
+        
+        return html_body
+
+class AlertDigest:
+    """Alerts collected over a batch run and sent as one combined report per recipient
+    
+    add() only queues; send() then delivers every recipient's digest over the alert system's shared
+    SMTP session. Reports added twice for the same table keep only the latest one.
+    """
+    
+    def __init__(self, alert_system: EmailAlertSystem):
+        self.alert_system = alert_system
+        self._lock = threading.Lock()
+        # recipient -> table name -> profile results, in the order tables were added
+        self._reports = {}
+    
+    def add(self, recipient: str, profile_results: Dict[str, Any]):
+        with self._lock:
+            self._reports.setdefault(recipient, {})[profile_results.get('table_name', 'Unknown')] = profile_results
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(reports) for reports in self._reports.values())
+    
+    def send(self) -> Dict[str, bool]:
+        """Send each recipient's digest; returns whether each was sent. Sent reports are cleared"""
+        with self._lock:
+            pending, self._reports = self._reports, {}
+        
+        sent = {}
+        for recipient, reports in pending.items():
+            reports = list(reports.values())
+            subject = (f"Data Quality Alert - {reports[0].get('table_name', 'Unknown')}" if len(reports) == 1
+                       else f"Data Quality Digest - {len(reports)} tables with critical issues")
+            body = (self.alert_system.generate_quality_report_email(reports[0]) if len(reports) == 1
+                    else self.alert_system.generate_digest_email(reports))
+            sent[recipient] = self.alert_system.send_alert(recipient, subject, body)
+            if not sent[recipient]:
+                # Keep the failed recipient's reports so a later send() can retry them
+                with self._lock:
+                    kept = self._reports.setdefault(recipient, {})
+                    for report in reports:
+                        kept.setdefault(report.get('table_name', 'Unknown'), report)
+        return sent
+
+def sample_estimate_rows(sample: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flat rows (issue, column, rate, interval, estimated count) of a sampled profile's estimates"""
+    estimates = sample['estimates']
+    rows = []
+    for issue, column, estimate in (
+        [('missing values', column, estimate) for column, estimate in estimates['missing_values'].items()]
+        + [('duplicates', '', estimates['duplicates'])]
+        + [('outliers', column, estimate) for column, estimate in estimates['outliers'].items()]
+    ):
+        low, high = estimate['interval']
+        rows.append({
+            'Issue': issue,
+            'Column': column,
+            'Rate': f"{estimate['rate']:.2%}",
+            'Interval': f"{low:.2%} – {high:.2%}",
+            'Estimated count': estimate['estimated_count'],
+            'Count range': f"{estimate['count_interval'][0]:,} – {estimate['count_interval'][1]:,}"
+        })
+    return rows
+
+def has_critical_issues(profile_results: Dict[str, Any]) -> bool:
+    """Check if profile results contain critical data quality issues"""
+    issues = profile_results.get('data_quality_issues')
+    if not issues:
+        return False  # no results (profiling failed) to judge
+    
+    # Define thresholds for critical issues
+    duplicate_threshold = profile_results['total_rows'] * 0.05  # 5% duplicates
+    missing_value_threshold = 20  # 20% missing values
+    
+    # Check for critical issues
+    if issues['duplicates'] > duplicate_threshold:
+        return True
+    
+    for col, info in issues['missing_values'].items():
+        if info['percentage'] > missing_value_threshold:
+            return True
+    
+    if len(issues['inconsistencies']) > 3:  # More than 3 inconsistency types
+        return True
+    
+    return False
@@ -0,0 +1,165 @@
+"""Profile MySQL tables without the dashboard, for cron jobs and CI pipelines
+
+    python -m dq_monitor --host db --user monitor --database shop 'orders*' customers --output-dir reports
+
+Connection options default to the DQ_HOST, DQ_PORT, DQ_USER, DQ_PASSWORD and DQ_DATABASE environment
+variables. One report per table is written to --output-dir together with summary.json. The exit status
+is 0 when every table is clean, 1 when any table has critical issues and 2 when a table could not be
+profiled or no table matched.
+"""
+
+import time
+
+# Everything below is measured from here, so the startup block reports the cost of importing the core
+_STARTED = time.perf_counter()
+
+import argparse
+import fnmatch
+import importlib.util
+import json
+import logging
+import math
+import numbers
+import os
+import sys
+
+EXIT_OK = 0
+EXIT_CRITICAL = 1
+EXIT_ERROR = 2
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m dq_monitor', description=__doc__.splitlines()[0])
+    parser.add_argument('tables', nargs='+', metavar='TABLE',
+                        help="Table names or shell-style globs such as 'orders_*'")
+    parser.add_argument('--host', default=os.environ.get('DQ_HOST', 'localhost'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('DQ_PORT', 3306)))
+    parser.add_argument('--user', default=os.environ.get('DQ_USER', 'root'))
+    parser.add_argument('--password', default=os.environ.get('DQ_PASSWORD', ''),
+                        help="Prefer the DQ_PASSWORD environment variable, which stays out of the process list")
+    parser.add_argument('--database', default=os.environ.get('DQ_DATABASE', 'data_quality_db'))
+    parser.add_argument('--strategy', default='auto', help="Profiling strategy (default: auto)")
+    parser.add_argument('--workers', type=int, default=1, help="Profile this many tables at once in worker processes")
+    parser.add_argument('--memory-budget', type=int, default=512, metavar='MIB',
+                        help="Client memory the auto strategy plans each scan to stay within")
+    parser.add_argument('--distinct-mode', choices=('exact', 'auto', 'approximate'), default='exact',
+                        help="Distinct counts: exact sets, HyperLogLog sketches, or exact until a column grows large")
+    parser.add_argument('--quantile-mode', choices=('exact', 'sketch'), default='exact',
+                        help="IQR quantiles of the streaming and parallel scans; 'sketch' bounds their memory")
+    parser.add_argument('--sample-rows', type=int, default=100000, help="Rows read by the sampled strategy")
+    parser.add_argument('--output-dir', default='dq_reports')
+    parser.add_argument('--format', choices=('json', 'parquet'), default='json',
+                        help="Per-table report format; parquet writes one row per column and needs pyarrow")
+    parser.add_argument('--instrumentation', choices=('off', 'timing', 'memory'), default='off',
+                        help="Add per-stage and per-column timings (and tracemalloc peaks) to each report")
+    parser.add_argument('--history', metavar='PATH', help="Also append every profile to this history database")
+    parser.add_argument('--no-fail-on-critical', action='store_true',
+                        help="Exit with 0 even when a table has critical issues")
+    return parser
+
+def resolve_tables(patterns, available):
+    """Tables matching any pattern, in the order the database lists them"""
+    return [table for table in available if any(fnmatch.fnmatchcase(table, pattern) for pattern in patterns)]
+
+def json_safe(value):
+    """value with NumPy numbers as Python ones and NaN or infinite floats as None, so the JSON stays valid"""
+    if isinstance(value, dict):
+        return {key: json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_safe(item) for item in value]
+    if isinstance(value, numbers.Integral) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, numbers.Real):
+        return float(value) if math.isfinite(value) else None
+    return value
+
+def column_rows(profile_results):
+    """One flat record per column for the Parquet report (nested values are stored as JSON text)"""
+    rows = []
+    for column, profile in profile_results['column_profiles'].items():
+        row = {'table_name': profile_results['table_name'], 'column_name': column,
+               'total_rows': profile_results['total_rows']}
+        for field, value in profile.items():
+            row[field] = json.dumps(json_safe(value), default=str) if isinstance(value, (dict, list)) else value
+        rows.append(row)
+    return rows
+
+def write_report(profile_results, output_dir, report_format) -> str:
+    path = os.path.join(output_dir, f"{profile_results['table_name']}.{report_format}")
+    if report_format == 'json':
+        with open(path, 'w') as f:
+            # Statistics of empty or constant columns can be NaN, which strict JSON parsers reject
+            json.dump(json_safe(profile_results), f, indent=2, default=str, allow_nan=False)
+    else:
+        import pandas as pd
+        pd.DataFrame(column_rows(profile_results)).to_parquet(path, index=False)
+    return path
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(format='dq_monitor: %(message)s', stream=sys.stderr)
+    
+    from .alerts import has_critical_issues
+    from .connection import DatabaseConnection
+    from .profiler import DataQualityProfiler, BatchProfiler
+    from .storage import ProfileHistoryStore
+    startup = {'import_seconds': time.perf_counter() - _STARTED}
+    
+    if args.strategy not in DataQualityProfiler.STRATEGIES:
+        print(f"dq_monitor: unknown strategy {args.strategy!r} "
+              f"(choose from {', '.join(DataQualityProfiler.STRATEGIES)})", file=sys.stderr)
+        return EXIT_ERROR
+    if args.format == 'parquet' and importlib.util.find_spec('pyarrow') is None:
+        print("dq_monitor: --format parquet needs pyarrow", file=sys.stderr)
+        return EXIT_ERROR
+    
+    db = DatabaseConnection(args.host, args.database, args.user, args.password, args.port)
+    if not db.connect():
+        return EXIT_ERROR
+    try:
+        startup['connect_seconds'] = time.perf_counter() - _STARTED
+        available = db.get_table_names()
+        startup['first_query_seconds'] = time.perf_counter() - _STARTED
+        print("dq_monitor: startup " + ", ".join(f"{name} {seconds:.3f}s" for name, seconds in startup.items()),
+              file=sys.stderr)
+        
+        tables = resolve_tables(args.tables, available)
+        if not tables:
+            print(f"dq_monitor: no table in {args.database} matches {' '.join(args.tables)}", file=sys.stderr)
+            return EXIT_ERROR
+        
+        history_store = ProfileHistoryStore(args.history) if args.history else None
+        profiler = DataQualityProfiler(db, history_store=history_store,
+                                       memory_budget=args.memory_budget * 1024 * 1024,
+                                       sample_rows=args.sample_rows, instrumentation=args.instrumentation,
+                                       distinct_mode=args.distinct_mode, quantile_mode=args.quantile_mode)
+        os.makedirs(args.output_dir, exist_ok=True)
+        
+        # With one worker, BatchProfiler profiles the tables in this process
+        results = BatchProfiler(profiler, max_workers=max(args.workers, 1)).profile_tables(tables, args.strategy)
+        
+        summary = []
+        for table_name, profile_results, error in results:
+            entry = {'table_name': table_name}
+            if not profile_results:
+                # A failed query leaves an empty result ({}) rather than None
+                entry['error'] = error or "Profiling returned no results"
+            else:
+                entry['critical'] = has_critical_issues(profile_results)
+                entry['total_rows'] = profile_results['total_rows']
+                entry['strategy'] = profile_results.get('strategy_selection', {}).get('strategy', args.strategy)
+                entry['report'] = write_report(profile_results, args.output_dir, args.format)
+            summary.append(entry)
+            status = entry.get('error') or ("critical issues" if entry['critical'] else "ok")
+            print(f"dq_monitor: {table_name}: {status}", file=sys.stderr)
+    finally:
+        db.disconnect()
+    
+    with open(os.path.join(args.output_dir, 'summary.json'), 'w') as f:
+        json.dump({'database': args.database, 'strategy': args.strategy, 'startup': startup,
+                   'tables': summary}, f, indent=2)
+    
+    if any('error' in entry for entry in summary):
+        return EXIT_ERROR
+    if any(entry['critical'] for entry in summary) and not args.no_fail_on_critical:
+        return EXIT_CRITICAL
+    return EXIT_OK
@@ -0,0 +1,695 @@
+"""Pooled MySQL connections, the information_schema catalog and the columnar result decoder"""
+
+import time
+import threading
+import warnings
+import weakref
+from contextlib import contextmanager
+from typing import Dict, List, Tuple, Any
+
+import mysql.connector
+import numpy as np
+import pandas as pd
+from mysql.connector import Error
+from mysql.connector.constants import FieldType, FieldFlag
+from mysql.connector.conversion import MySQLConverter
+from mysql.connector.errors import PoolError
+
+from .errors import report_error
+from .schema import HAS_PYARROW, quote_identifier
+
+class ConnectionPool:
+    """Bounded pool of MySQL connections with health checks and usage metrics"""
+    
+    def __init__(self, connect_args: Dict[str, Any], size: int = 5, timeout: float = 30.0,
+                 health_check_interval: float = 30.0):
+        self.connect_args = connect_args
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.closed = False
+        self._idle = []  # (connection, last released at), most recently used last
+        self._open = 0
+        self._condition = threading.Condition()
+        
+        # Metrics
+        self.checked_out = 0
+        self.checkouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.timeouts = 0
+        self.reconnects = 0
+    
+    def acquire(self):
+        """Check out a healthy connection, waiting up to `timeout` seconds for one to free up"""
+        started = time.monotonic()
+        with self._condition:
+            while True:
+                if self.closed:
+                    raise PoolError("Connection pool is closed")
+                if self._idle:
+                    connection, released_at = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    connection, released_at = None, None
+                    self._open += 1
+                    break
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolError(f"No pooled connection available after {self.timeout:.0f}s")
+                self._condition.wait(remaining)
+            
+            waited = time.monotonic() - started
+            self.checkouts += 1
+            self.checked_out += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+        
+        try:
+            if connection is None:
+                connection = mysql.connector.connect(**self.connect_args)
+            elif time.monotonic() - released_at > self.health_check_interval:
+                self._ensure_alive(connection)
+        except Error:
+            if connection is not None:
+                # A stale connection whose reconnect failed still holds its socket
+                self._close_quietly(connection)
+            with self._condition:
+                self._open -= 1
+                self.checked_out -= 1
+                self._condition.notify()
+            raise
+        return connection
+    
+    def release(self, connection, discard: bool = False):
+        """Return a connection to the pool (or close it if discarded or the pool is closed)"""
+        with self._condition:
+            self.checked_out -= 1
+            if discard or self.closed:
+                self._open -= 1
+                self._close_quietly(connection)
+            else:
+                self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+    
+    def close(self):
+        """Close idle connections now and checked-out ones as they are released"""
+        with self._condition:
+            self.closed = True
+            for connection, _ in self._idle:
+                self._close_quietly(connection)
+            self._open -= len(self._idle)
+            self._idle = []
+            self._condition.notify_all()
+    
+    def metrics(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                'size': self.size,
+                'open': self._open,
+                'idle': len(self._idle),
+                'checked_out': self.checked_out,
+                'checkouts': self.checkouts,
+                'avg_wait_ms': round(self.wait_time_total / self.checkouts * 1000, 2) if self.checkouts else 0.0,
+                'max_wait_ms': round(self.wait_time_max * 1000, 2),
+                'timeouts': self.timeouts,
+                'reconnects': self.reconnects
+            }
+    
+    def _ensure_alive(self, connection):
+        """Ping a connection that sat idle and reconnect it if the server dropped it"""
+        try:
+            connection.ping(reconnect=False)
+        except Error:
+            connection.reconnect(attempts=2, delay=0.5)
+            with self._condition:
+                self.reconnects += 1
+    
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Error:
+            pass
+
+class DatabaseConnection:
+    """Handle MySQL database connections and operations"""
+    
+    def __init__(self, host: str, database: str, user: str, password: str, port: int = 3306,
+                 pool_size: int = 5, pool_timeout: float = 30.0, catalog_ttl: float = 300.0):
+        self.host = host
+        self.database = database
+        self.user = user
+        self.password = password
+        self.port = port
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        self.pool = None
+        self._local = threading.local()
+        # Table and column metadata loaded from information_schema in bulk and refreshed after catalog_ttl
+        self.catalog = MetadataCatalog(self, ttl=catalog_ttl)
+    
+    def connect(self):
+        """Establish database connection"""
+        try:
+            self.pool = ConnectionPool(self.connection_params(), size=self.pool_size, timeout=self.pool_timeout)
+            # Open the first connection eagerly so bad credentials are reported here
+            self.pool.release(self.pool.acquire())
+            return True
+        except Error as e:
+            report_error(f"Database connection error: {e}")
+            self.pool = None
+            return False
+    
+    def connection_params(self) -> Dict[str, Any]:
+        """Arguments needed to open an equivalent connection elsewhere (e.g. in a worker process)"""
+        return {
+            'host': self.host,
+            'database': self.database,
+            'user': self.user,
+            'password': self.password,
+            'port': self.port
+        }
+    
+    def disconnect(self):
+        """Close database connection"""
+        if self.pool is not None:
+            self.pool.close()
+    
+    def is_connected(self) -> bool:
+        """Whether a pooled connection can be checked out and reaches the server"""
+        if self.pool is None or self.pool.closed:
+            return False
+        try:
+            with self.session() as connection:
+                return connection.is_connected()
+        except Error:
+            return False
+    
+    def pool_metrics(self) -> Dict[str, Any]:
+        return self.pool.metrics() if self.pool is not None else {}
+    
+    @contextmanager
+    def session(self):
+        """Pin one pooled connection to the current thread for the duration of the block
+        
+        Statements that must share a MySQL session (LOCK/UNLOCK TABLES, transactions) run inside it.
+        """
+        pinned = getattr(self._local, 'connection', None)
+        if pinned is not None:
+            yield pinned
+            return
+        
+        connection = self.pool.acquire()
+        self._local.connection = connection
+        broken = False
+        try:
+            yield connection
+        except Error:
+            broken = True
+            raise
+        finally:
+            self._local.connection = None
+            try:
+                if not broken and connection.in_transaction:
+                    connection.rollback()
+            except Error:
+                broken = True
+            self.pool.release(connection, discard=broken)
+    
+    @contextmanager
+    def cursor(self, **kwargs):
+        """Cursor on a pooled connection, closed and returned to the pool afterwards"""
+        with self.session() as connection:
+            cursor = connection.cursor(**kwargs)
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+    
+    def execute_query(self, query: str, params: tuple = None):
+        """Execute a query and return results"""
+        try:
+            with self.cursor() as cursor:
+                cursor.execute(query, params)
+                return cursor.fetchall(), cursor.column_names
+        except Error as e:
+            report_error(f"Query execution error: {e}")
+            return None, None
+    
+    def execute_query_columnar(self, query: str, params: tuple = None, batch_size: int = 50000) -> pd.DataFrame:
+        """Execute a query on a raw cursor and decode each fetched batch straight into typed column arrays
+        
+        The connector still hands over one bytearray per cell, but those are dropped batch by batch instead
+        of becoming int/Decimal/datetime objects held for the whole result. The DataFrame holds the values
+        and dtypes pandas would infer from execute_query's rows, except that DECIMAL columns are already
+        float64 and text columns are Arrow-backed strings when pyarrow is installed.
+        """
+        try:
+            with self.cursor(raw=True, buffered=False) as cursor:
+                cursor.execute(query, params)
+                decoder = ColumnarDecoder(cursor.description)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    decoder.append(rows)
+                    del rows
+            return decoder.frame()
+        except Error as e:
+            report_error(f"Query execution error: {e}")
+            return None
+    
+    def execute(self, statement: str, params: tuple = None) -> bool:
+        """Execute a statement that returns no rows (LOCK TABLES, SET, ...)"""
+        try:
+            with self.cursor() as cursor:
+                cursor.execute(statement, params)
+            return True
+        except Error as e:
+            report_error(f"Statement execution error: {e}")
+            return False
+    
+    def iter_query(self, query: str, params: tuple = None, chunk_size: int = 50000):
+        """Execute a query on an unbuffered cursor and return a chunk iterator
+        
+        The connection stays checked out until the iterator is exhausted or closed.
+        """
+        pinned = getattr(self._local, 'connection', None)
+        try:
+            connection = pinned or self.pool.acquire()
+        except Error as e:
+            report_error(f"Query execution error: {e}")
+            return None, None
+        # One-shot lease so the connection is returned exactly once, even if the iterator is never started
+        lease = [] if pinned is not None else [connection]
+        
+        try:
+            cursor = connection.cursor(buffered=False)
+            cursor.execute(query, params)
+        except Error as e:
+            self._return_lease(lease)
+            report_error(f"Query execution error: {e}")
+            return None, None
+        
+        chunks = self._fetch_chunks(connection, cursor, chunk_size, lease)
+        weakref.finalize(chunks, self._return_lease, lease)
+        return chunks, cursor.column_names
+    
+    def _fetch_chunks(self, connection, cursor, chunk_size: int, lease: List[Any]):
+        """Yield rows from a server-side cursor in fixed-size chunks"""
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            # Drain anything left unread so the connection stays usable
+            try:
+                if connection.unread_result:
+                    connection.consume_results()
+                cursor.close()
+            finally:
+                self._return_lease(lease)
+    
+    def _return_lease(self, lease: List[Any]):
+        if lease:
+            self.pool.release(lease.pop())
+    
+    def get_table_names(self):
+        """Get all table names in the database"""
+        tables = self.catalog.table_names()
+        if tables is not None:
+            return tables
+        try:
+            with self.cursor() as cursor:
+                cursor.execute("SHOW TABLES")
+                tables = [table[0] for table in cursor.fetchall()]
+            return tables
+        except Error as e:
+            report_error(f"Error fetching table names: {e}")
+            return []
+    
+    def get_table_schema(self, table_name: str):
+        """Get schema information for a table
+        
+        Rows have DESCRIBE's shape: (Field, Type, Null, Key, Default, Extra).
+        """
+        schema = self.catalog.schema(table_name)
+        if schema is not None:
+            return schema
+        try:
+            with self.cursor() as cursor:
+                cursor.execute(f"DESCRIBE {quote_identifier(table_name)}")
+                schema = cursor.fetchall()
+            return schema
+        except Error as e:
+            report_error(f"Error fetching schema for {table_name}: {e}")
+            return None
+    
+    def get_table_fingerprint(self, table_name: str, method: str = 'metadata') -> Tuple:
+        """Cheap value that changes whenever the table's contents change, or None if none is reliable
+        
+        'metadata' reads UPDATE_TIME/TABLE_ROWS/DATA_LENGTH from information_schema.TABLES. Without an
+        UPDATE_TIME (engines that do not track it, InnoDB tables not written since a restart) the table
+        is not fingerprinted, since TABLE_ROWS and AUTO_INCREMENT miss updates and deletes. 'checksum'
+        always uses CHECKSUM TABLE, which reads the whole table.
+        """
+        try:
+            with self.cursor() as cursor:
+                if method == 'metadata':
+                    try:
+                        # MySQL 8 caches these statistics for a day by default; read them fresh
+                        cursor.execute("SET SESSION information_schema_stats_expiry = 0")
+                    except Error:
+                        pass
+                    cursor.execute(
+                        "SELECT UPDATE_TIME, TABLE_ROWS, DATA_LENGTH, AUTO_INCREMENT, CREATE_TIME, NOW() "
+                        "FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                        (table_name,)
+                    )
+                    row = cursor.fetchone()
+                    if row is None:
+                        return None
+                    update_time, table_rows, data_length, auto_increment, create_time, now = row
+                    if update_time is None:
+                        return None
+                    # UPDATE_TIME has one-second resolution: a write later in the same second would leave
+                    # it unchanged, so a table modified this very second is not fingerprinted
+                    if (now - update_time).total_seconds() < 1:
+                        return None
+                    return ('metadata', str(create_time), str(update_time), table_rows, data_length, auto_increment)
+                cursor.execute(f"CHECKSUM TABLE {quote_identifier(table_name)}")
+                row = cursor.fetchone()
+                if row is None or row[1] is None:
+                    return None
+                return ('checksum', row[1])
+        except Error as e:
+            report_error(f"Error fingerprinting {table_name}: {e}")
+            return None
+
+class MetadataCatalog:
+    """Tables, columns, keys, indexes and size estimates of one database, loaded from information_schema
+    
+    Three bulk queries replace a SHOW TABLES plus one DESCRIBE per table; the result is kept for `ttl`
+    seconds. A name missing from a fresh catalog is remembered as missing for `ttl` seconds too, so
+    repeated lookups of a dropped or mistyped table do not reload it. Accessors return None when
+    information_schema cannot be read so callers can fall back.
+    """
+    
+    def __init__(self, db_connection: DatabaseConnection, ttl: float = 300.0):
+        self.db = db_connection
+        self.ttl = ttl
+        self.loaded_at = None
+        self.failed_at = None
+        self.tables = {}
+        # table name -> when it was found missing from a freshly loaded catalog
+        self.missing = {}
+        self._lock = threading.Lock()
+    
+    def refresh(self) -> bool:
+        """Reload the whole catalog; returns False (keeping the previous one) if the queries fail"""
+        try:
+            with self.db.cursor() as cursor:
+                cursor.execute(
+                    "SELECT TABLE_NAME, TABLE_TYPE, ENGINE, TABLE_ROWS, AVG_ROW_LENGTH, DATA_LENGTH, INDEX_LENGTH, "
+                    "AUTO_INCREMENT, UPDATE_TIME FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() "
+                    "ORDER BY TABLE_NAME"
+                )
+                table_rows = cursor.fetchall()
+                cursor.execute(
+                    "SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_KEY, COLUMN_DEFAULT, EXTRA, "
+                    "NUMERIC_PRECISION, NUMERIC_SCALE, CHARACTER_MAXIMUM_LENGTH FROM information_schema.COLUMNS "
+                    "WHERE TABLE_SCHEMA = DATABASE() ORDER BY TABLE_NAME, ORDINAL_POSITION"
+                )
+                column_rows = cursor.fetchall()
+                cursor.execute(
+                    "SELECT TABLE_NAME, INDEX_NAME, NON_UNIQUE, COLUMN_NAME, CARDINALITY FROM information_schema.STATISTICS "
+                    "WHERE TABLE_SCHEMA = DATABASE() ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX"
+                )
+                index_rows = cursor.fetchall()
+        except Error:
+            # Callers fall back to SHOW TABLES / DESCRIBE; try information_schema again after ttl
+            self.failed_at = time.time()
+            return False
+        
+        tables = {}
+        for name, table_type, engine, rows, avg_row_length, data_length, index_length, auto_increment, update_time in table_rows:
+            tables[name] = {
+                'type': table_type,
+                'engine': engine,
+                # TABLE_ROWS is an estimate for InnoDB
+                'estimated_rows': int(rows or 0),
+                'avg_row_length': int(avg_row_length or 0),
+                'data_length': int(data_length or 0),
+                'index_length': int(index_length or 0),
+                'auto_increment': auto_increment,
+                'update_time': update_time,
+                'columns': [],
+                'indexes': {}
+            }
+        for name, column, column_type, nullable, key, default, extra, precision, scale, max_length in column_rows:
+            if name in tables:
+                tables[name]['columns'].append({
+                    'name': column,
+                    'type': column_type.decode() if isinstance(column_type, bytes) else column_type,
+                    'nullable': nullable == 'YES',
+                    'key': key,
+                    'default': default,
+                    'extra': extra,
+                    'precision': precision,
+                    'scale': scale,
+                    'max_length': max_length
+                })
+        for name, index, non_unique, column, cardinality in index_rows:
+            if name in tables:
+                entry = tables[name]['indexes'].setdefault(index, {'unique': not int(non_unique), 'columns': [],
+                                                                    'cardinality': cardinality})
+                entry['columns'].append(column)
+        
+        with self._lock:
+            self.tables = tables
+            self.loaded_at = time.time()
+            self.missing = {name: missing_at for name, missing_at in self.missing.items() if name not in tables}
+        return True
+    
+    def invalidate(self):
+        with self._lock:
+            self.loaded_at = None
+            self.failed_at = None
+            self.missing = {}
+    
+    def _fresh(self) -> bool:
+        """Make sure the catalog is loaded and younger than ttl"""
+        loaded_at = self.loaded_at
+        if loaded_at is not None and time.time() - loaded_at < self.ttl:
+            return True
+        if self.failed_at is not None and time.time() - self.failed_at < self.ttl:
+            return loaded_at is not None
+        return self.refresh() or self.loaded_at is not None
+    
+    def table(self, table_name: str) -> Dict[str, Any]:
+        """Metadata of one table, reloading once if it was created after the catalog was loaded"""
+        if not self._fresh():
+            return None
+        if table_name in self.tables:
+            return self.tables[table_name]
+        missing_at = self.missing.get(table_name)
+        if missing_at is not None and time.time() - missing_at < self.ttl:
+            return None
+        if time.time() - self.loaded_at > 1 and not self.refresh():
+            return None
+        table = self.tables.get(table_name)
+        if table is None:
+            with self._lock:
+                self.missing[table_name] = time.time()
+        return table
+    
+    def table_names(self) -> List[str]:
+        if not self._fresh():
+            return None
+        return list(self.tables)
+    
+    def schema(self, table_name: str) -> List[Tuple]:
+        """Columns as DESCRIBE rows: (Field, Type, Null, Key, Default, Extra)"""
+        table = self.table(table_name)
+        if table is None or not table['columns']:
+            return None
+        return [(column['name'], column['type'], 'YES' if column['nullable'] else 'NO', column['key'],
+                 column['default'], column['extra']) for column in table['columns']]
+    
+    def estimated_rows(self, table_name: str) -> int:
+        table = self.table(table_name)
+        return table['estimated_rows'] if table is not None else None
+    
+    def summary(self) -> pd.DataFrame:
+        """One row per table with its size estimates"""
+        if not self._fresh():
+            return pd.DataFrame()
+        return pd.DataFrame([
+            {
+                'Table': name,
+                'Type': table['type'],
+                'Engine': table['engine'],
+                'Columns': len(table['columns']),
+                'Indexes': len(table['indexes']),
+                'Estimated Rows': table['estimated_rows'],
+                'Data MB': round(table['data_length'] / 2 ** 20, 2),
+                'Index MB': round(table['index_length'] / 2 ** 20, 2)
+            }
+            for name, table in self.tables.items()
+        ])
+
+class ColumnarDecoder:
+    """Decode raw (bytearray) result rows batch by batch into one typed array per column
+    
+    This is object-based at the edges: the connector delivers a bytearray per cell, and the row tuples are
+    transposed into object arrays. Integers, floats and DECIMALs are then parsed by NumPy from one joined
+    buffer per column batch, DATEs and DATETIMEs from a NumPy string array and text by pyarrow without a
+    copy per cell. Without pyarrow text becomes one str per cell, DATE columns end up as datetime.date
+    objects (as pandas keeps them in the row path), and any other type, or a batch NumPy cannot parse,
+    goes through the connector's converter.
+    """
+    
+    INTEGER_TYPES = (FieldType.TINY, FieldType.SHORT, FieldType.INT24, FieldType.LONG, FieldType.LONGLONG,
+                     FieldType.YEAR)
+    FLOAT_TYPES = (FieldType.FLOAT, FieldType.DOUBLE, FieldType.DECIMAL, FieldType.NEWDECIMAL)
+    DATETIME_TYPES = (FieldType.DATETIME, FieldType.TIMESTAMP)
+    DATE_TYPES = (FieldType.DATE, FieldType.NEWDATE)
+    TEXT_TYPES = (FieldType.VARCHAR, FieldType.VAR_STRING, FieldType.STRING, FieldType.ENUM, FieldType.SET,
+                  FieldType.TINY_BLOB, FieldType.MEDIUM_BLOB, FieldType.LONG_BLOB, FieldType.BLOB)
+    BINARY_CHARSET = 63
+    # Range of datetime64[ns]; the driver's datetimes outside it make pandas keep an object column
+    DATETIME_BOUNDS = (np.datetime64('1677-09-22'), np.datetime64('2262-04-11'))
+    
+    def __init__(self, description: List[Tuple], charset: str = 'utf8mb4'):
+        self.description = list(description)
+        self.names = [column[0] for column in self.description]
+        self.kinds = [self._kind(column) for column in self.description]
+        # Per column: list of (values, null_mask) batches; null_mask is None for converted object batches
+        self.parts = [[] for _ in self.description]
+        self.converter = MySQLConverter(charset, True)
+        self.encoding = 'utf-8' if charset.startswith('utf8') else charset
+    
+    def _kind(self, column: Tuple) -> str:
+        type_code, flags = column[1], column[7] if len(column) > 7 else 0
+        charset = column[8] if len(column) > 8 else None
+        if type_code in self.INTEGER_TYPES:
+            return 'uint' if type_code == FieldType.LONGLONG and flags & FieldFlag.UNSIGNED else 'int'
+        if type_code in self.FLOAT_TYPES:
+            return 'float'
+        if type_code in self.DATETIME_TYPES:
+            return 'datetime'
+        if type_code in self.DATE_TYPES:
+            return 'date'
+        if type_code in self.TEXT_TYPES and charset != self.BINARY_CHARSET:
+            return 'text'
+        return 'other'
+    
+    def append(self, rows: List[Tuple]):
+        """Decode one fetched batch; the rows can be released afterwards"""
+        for index, column in enumerate(zip(*rows)):
+            # Filled element-wise: np.array() would unpack equal-length bytearrays into a 2-D array
+            values = np.empty(len(column), dtype=object)
+            values[:] = column
+            del column
+            null_mask = values == None  # noqa: E711  (elementwise comparison)
+            self.parts[index].append(self._decode(index, values, null_mask))
+    
+    def _decode(self, index: int, values: np.ndarray, null_mask: np.ndarray) -> Tuple[Any, np.ndarray]:
+        kind = self.kinds[index]
+        try:
+            if kind in ('int', 'uint'):
+                values[null_mask] = b'0'
+                return self._parse_numbers(values, np.uint64 if kind == 'uint' else np.int64), null_mask
+            if kind == 'float':
+                values[null_mask] = b'nan'
+                return self._parse_numbers(values, np.float64), null_mask
+            if kind in ('datetime', 'date'):
+                values[null_mask] = b'NaT'
+                # Parse from str: NumPy 1.26 crashes on some invalid dates given as bytes
+                text = np.array(b','.join(values).decode('ascii').split(','))
+                parsed = text.astype('datetime64[us]' if kind == 'datetime' else 'datetime64[D]')
+                present = parsed[~null_mask]
+                if kind == 'datetime' and present.size and (present.min() < self.DATETIME_BOUNDS[0] or
+                                                            present.max() >= self.DATETIME_BOUNDS[1]):
+                    raise ValueError("datetime outside the datetime64[ns] range")
+                return parsed, null_mask
+            if kind == 'text':
+                if HAS_PYARROW:
+                    import pyarrow
+                    return pyarrow.array(values, type=pyarrow.binary()).cast(pyarrow.string()), null_mask
+                values[~null_mask] = [value.decode(self.encoding) for value in values[~null_mask]]
+                return values, None
+        except (ValueError, TypeError, OverflowError):
+            # Unparseable batch (zero dates, invalid UTF-8, ...): this column falls back to the converter
+            values[null_mask] = None
+            self.kinds[index] = 'other'
+        column = self.description[index]
+        return np.array([self.converter.to_python(column, None if value is None else bytes(value)) for value in values],
+                        dtype=object), None
+    
+    @staticmethod
+    def _parse_numbers(values: np.ndarray, dtype) -> np.ndarray:
+        """Parse a batch of ASCII numbers from one space-joined buffer, or raise ValueError"""
+        with warnings.catch_warnings():
+            # A cell that is not a number stops the parse early (a DeprecationWarning, not an error)
+            warnings.simplefilter('ignore', DeprecationWarning)
+            parsed = np.fromstring(b' '.join(values), dtype=dtype, sep=' ')
+        if len(parsed) != len(values):
+            raise ValueError("batch holds a value that is not a number")
+        return parsed
+    
+    def frame(self) -> pd.DataFrame:
+        """Concatenate the decoded batches into a DataFrame"""
+        return pd.DataFrame({name: self._column(index) for index, name in enumerate(self.names)}, columns=self.names)
+    
+    def _column(self, index: int) -> pd.Series:
+        parts, kind, name = self.parts[index], self.kinds[index], self.names[index]
+        self.parts[index] = []
+        if not parts:
+            return pd.Series([], dtype=object, name=name)
+        if kind == 'other' or any(null_mask is None and kind != 'text' for _, null_mask in parts):
+            # Some batch needed the converter: rebuild Python values and let pandas infer as it would
+            values = []
+            for part, null_mask in parts:
+                values.extend(self._objects(part, null_mask))
+            return pd.Series(values, name=name)
+        
+        if kind == 'text':
+            if HAS_PYARROW:
+                import pyarrow
+                array = pyarrow.chunked_array([part for part, _ in parts], type=pyarrow.string()).combine_chunks()
+                return pd.Series(pd.arrays.ArrowStringArray(array), name=name)
+            return pd.Series(np.concatenate([part for part, _ in parts]), name=name)
+        
+        values = np.concatenate([part for part, _ in parts])
+        null_mask = np.concatenate([null_mask for _, null_mask in parts])
+        if null_mask.all():
+            return pd.Series([None] * len(values), dtype=object, name=name)
+        if kind in ('int', 'uint'):
+            if kind == 'uint' and values.max() <= np.iinfo(np.int64).max:
+                values = values.astype(np.int64)
+            if null_mask.any():
+                values = values.astype(np.float64)
+                values[null_mask] = np.nan
+            return pd.Series(values, name=name)
+        if kind == 'datetime':
+            return pd.Series(values.astype('datetime64[ns]'), name=name)
+        if kind == 'date':
+            # pandas infers no dtype for datetime.date values, so the row path keeps them as objects too
+            return pd.Series(values.astype(object), name=name)
+        return pd.Series(values, name=name)
+    
+    def _objects(self, part, null_mask: np.ndarray) -> List[Any]:
+        """Python values of an already decoded batch, with None for NULLs"""
+        if null_mask is None:
+            return part.tolist()
+        if isinstance(part, np.ndarray):
+            values = part.astype(object)
+        else:
+            values = np.array(part.to_pylist(), dtype=object)
+        values[null_mask] = None
+        return values.tolist()
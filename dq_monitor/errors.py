@@ -0,0 +1,19 @@
+"""Where the core reports recoverable errors: logged by default, shown on the page by the dashboard"""
+
+import logging
+
+logger = logging.getLogger('dq_monitor')
+
+_error_handler = None
+
+def set_error_handler(handler):
+    """Route report_error messages to handler(message) instead of the 'dq_monitor' logger (None restores it)"""
+    global _error_handler
+    _error_handler = handler
+
+def report_error(message: str):
+    """Report an error the caller recovers from (it returns None / [] / {} instead of raising)"""
+    if _error_handler is not None:
+        _error_handler(message)
+    else:
+        logger.error(message)
@@ -0,0 +1,265 @@
+"""Per-stage and per-column timing and memory of a profiling run, reported under the 'performance' key"""
+
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Tuple, Any, Iterable, Iterator
+
+INSTRUMENTATION_MODES = ('off', 'timing', 'memory')
+
+_active = threading.local()
+
+# tracemalloc is process-wide: it runs while at least one recorder in 'memory' mode is open, and is
+# left alone if something else had already started it
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_started = False
+
+class _NullStage:
+    """Shared do-nothing context manager, so a disabled stage costs one call and one `with`"""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+class NullRecorder:
+    """What the profiling code talks to when instrumentation is off: every method is a no-op"""
+    
+    enabled = False
+    
+    def stage(self, name: str, rows: int = None):
+        return _NULL_STAGE
+    
+    def column(self, name: str, rows: int = None):
+        return _NULL_STAGE
+    
+    def count_rows(self, rows: int):
+        pass
+    
+    def iterate(self, name: str, items: Iterable) -> Iterable:
+        return items
+    
+    def bind(self, function):
+        return function
+
+NULL_RECORDER = NullRecorder()
+
+class PerformanceRecorder:
+    """Wall time, CPU time, rows and tracemalloc peak of the stages of one profiling run
+    
+    Stages nest: one opened while another is open on the same thread is recorded under it, and
+    entering a stage again (once per fetched chunk, say) adds to its totals. CPU time is that of the
+    thread doing the work (time.thread_time). Functions handed to worker threads through bind() record
+    under the stage that was open when they were bound; their memory is not measured, because the
+    tracemalloc peak cannot be told apart between threads. Concurrent runs in one process share that
+    peak too, so treat their peak_bytes as upper bounds.
+    """
+    
+    enabled = True
+    
+    def __init__(self, mode: str = 'timing'):
+        if mode not in INSTRUMENTATION_MODES or mode == 'off':
+            raise ValueError(f"Unknown instrumentation mode: {mode}")
+        self.mode = mode
+        self.trace_memory = mode == 'memory'
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._owner = None
+        # path tuple -> totals, in the order the stages were first entered
+        self._stages = {}
+        self._columns = {}
+    
+    def __enter__(self):
+        global _tracing_users, _tracing_started
+        if self.trace_memory:
+            with _tracing_lock:
+                if _tracing_users == 0 and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    _tracing_started = True
+                _tracing_users += 1
+        self._owner = threading.get_ident()
+        self._local.stack = [self._frame(())]
+        self._previous = getattr(_active, 'recorder', None)
+        _active.recorder = self
+        return self
+    
+    def __exit__(self, *exc_info):
+        global _tracing_users, _tracing_started
+        _active.recorder = self._previous
+        root = self._local.stack.pop()
+        self._close(root)
+        if self.trace_memory:
+            with _tracing_lock:
+                _tracing_users -= 1
+                if _tracing_users == 0 and _tracing_started:
+                    tracemalloc.stop()
+                    _tracing_started = False
+        return False
+    
+    def _frame(self, path: Tuple[str, ...], rows: int = None) -> Dict[str, Any]:
+        with self._lock:
+            # Register the stage on entry so parents are listed before their children
+            self._stages.setdefault(path, {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'rows': None, 'peak': None})
+        frame = {'path': path, 'rows': rows, 'wall': time.perf_counter(), 'cpu': time.thread_time(),
+                 'memory': None, 'peak': 0}
+        if self.trace_memory and threading.get_ident() == self._owner:
+            current, peak = tracemalloc.get_traced_memory()
+            stack = getattr(self._local, 'stack', None)
+            if stack:
+                # Fold the peak reached so far into the enclosing stage before resetting it
+                stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            frame['memory'] = current
+            frame['peak'] = current
+        return frame
+    
+    def _close(self, frame: Dict[str, Any]) -> Dict[str, Any]:
+        totals = {
+            'wall': time.perf_counter() - frame['wall'],
+            'cpu': time.thread_time() - frame['cpu'],
+            'rows': frame['rows'],
+            'peak': None
+        }
+        if frame['memory'] is not None:
+            frame['peak'] = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            totals['peak'] = frame['peak'] - frame['memory']
+            stack = self._local.stack
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], frame['peak'])
+        with self._lock:
+            entry = self._stages[frame['path']]
+            entry['calls'] += 1
+            entry['wall'] += totals['wall']
+            entry['cpu'] += totals['cpu']
+            if totals['rows'] is not None:
+                entry['rows'] = (entry['rows'] or 0) + totals['rows']
+            if totals['peak'] is not None:
+                entry['peak'] = max(entry['peak'] or 0, totals['peak'])
+        return totals
+    
+    def _stack(self) -> List[Dict[str, Any]]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+    
+    @contextmanager
+    def stage(self, name: str, rows: int = None) -> Iterator[None]:
+        """Record the enclosed block as `name` under the stage currently open on this thread"""
+        stack = self._stack()
+        frame = self._frame((stack[-1]['path'] if stack else ()) + (name,), rows)
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            self._close(frame)
+    
+    @contextmanager
+    def column(self, name: str, rows: int = None) -> Iterator[None]:
+        """stage() for the work on one column, also totalled per column across stages"""
+        stack = self._stack()
+        parent = stack[-1]['path'] if stack else ()
+        frame = self._frame(parent + (name,), rows)
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            totals = self._close(frame)
+            with self._lock:
+                entry = self._columns.setdefault(name, {'wall': 0.0, 'cpu': 0.0, 'rows': rows,
+                                                        'peak': None, 'stages': {}})
+                entry['wall'] += totals['wall']
+                entry['cpu'] += totals['cpu']
+                if totals['peak'] is not None:
+                    entry['peak'] = max(entry['peak'] or 0, totals['peak'])
+                stage = parent[-1] if parent else ''
+                entry['stages'][stage] = entry['stages'].get(stage, 0.0) + totals['wall']
+    
+    def count_rows(self, rows: int):
+        """Add rows to the stage currently open on this thread (for counts known only at its end)"""
+        stack = self._stack()
+        if stack:
+            stack[-1]['rows'] = (stack[-1]['rows'] or 0) + rows
+    
+    def iterate(self, name: str, items: Iterable) -> Iterator:
+        """Yield from items, recording each step of the iteration (e.g. fetching a chunk) as `name`"""
+        iterator = iter(items)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                self.count_rows(len(item))
+            yield item
+    
+    def bind(self, function):
+        """function, recording under the stage open now even when it runs on another thread"""
+        parent = self._stack()[-1]['path'] if self._stack() else ()
+        
+        def bound(*args, **kwargs):
+            previous = getattr(_active, 'recorder', None)
+            _active.recorder = self
+            stack = self._stack()
+            frame = {'path': parent, 'rows': None, 'wall': 0.0, 'cpu': 0.0, 'memory': None, 'peak': 0}
+            stack.append(frame)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stack.pop()
+                _active.recorder = previous
+        return bound
+    
+    def results(self) -> Dict[str, Any]:
+        """The 'performance' entry of a profile: totals, every stage in entry order and every column"""
+        def record(totals: Dict[str, Any]) -> Dict[str, Any]:
+            rows = totals['rows']
+            return {
+                'wall_seconds': round(totals['wall'], 6),
+                'cpu_seconds': round(totals['cpu'], 6),
+                'rows': rows,
+                'rows_per_sec': round(rows / totals['wall'], 1) if rows is not None and totals['wall'] > 0 else None,
+                'peak_bytes': totals['peak']
+            }
+        
+        with self._lock:
+            root = self._stages.get((), {'wall': 0.0, 'cpu': 0.0, 'rows': None, 'peak': None})
+            stages = [{'path': list(path), 'calls': totals['calls'], **record(totals)}
+                      for path, totals in self._stages.items() if path]
+            columns = {name: {**record(totals), 'stages': {stage: round(seconds, 6)
+                                                            for stage, seconds in totals['stages'].items()}}
+                       for name, totals in self._columns.items()}
+        return {'mode': self.mode, **record(root), 'stages': stages, 'columns': columns}
+
+def current_recorder():
+    """The recorder of the profiling run on this thread, or NULL_RECORDER when none is being recorded"""
+    return getattr(_active, 'recorder', None) or NULL_RECORDER
+
+def flame_rows(performance: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Stages as icicle/flame chart nodes: id, parent, label and self time (wall time minus children)
+    
+    Columns profiled on several threads can add up to more than their stage's wall time, so self time
+    is clipped at zero; plot with branchvalues='remainder' so each node spans self time plus children.
+    """
+    children = {}
+    for stage in performance['stages']:
+        parent = '/'.join(stage['path'][:-1])
+        children[parent] = children.get(parent, 0.0) + stage['wall_seconds']
+    rows = [{'id': 'run', 'parent': '', 'label': f"run ({performance['wall_seconds']:.3f}s)",
+             'self_seconds': max(performance['wall_seconds'] - children.get('', 0.0), 0.0)}]
+    for stage in performance['stages']:
+        path = '/'.join(stage['path'])
+        rows.append({
+            'id': 'run/' + path,
+            'parent': 'run/' + '/'.join(stage['path'][:-1]) if len(stage['path']) > 1 else 'run',
+            'label': f"{stage['path'][-1]} ({stage['wall_seconds']:.3f}s)",
+            'self_seconds': max(stage['wall_seconds'] - children.get(path, 0.0), 0.0)
+        })
+    return rows
@@ -0,0 +1,1768 @@
+"""Table profiling: the in-memory, streaming, pushdown, incremental, parallel, auto and sampled strategies"""
+
+import copy
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Tuple, Any, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .accumulators import ColumnAccumulator, TableAccumulator, _row_values, inconsistency_masks
+from .connection import DatabaseConnection
+from .errors import logger, report_error
+from .instrumentation import INSTRUMENTATION_MODES, PerformanceRecorder, current_recorder
+from .schema import (
+    STRING_DTYPE_ALLOWS_NULLS, FLOAT64_EXACT_DIGITS, quote_identifier, mysql_base_type, mysql_type_kind,
+    mysql_type_to_dtype, mysql_decimal_spec, decimal_columns, decimal_to_float, float_precision_loss,
+    is_decimal_series, compact_column, legacy_column, estimate_row_bytes, format_bytes,
+)
+from .sketches import DistinctCounter, KLLSketch, proportion_interval
+from .storage import ProfileStateStore, ProfileCache, ProfileHistoryStore
+
+def _percentage(count: int, total: int) -> float:
+    """count / total as a percentage rounded like the in-memory path, whose counts are NumPy integers
+    
+    NumPy rounds the scaled value half to even (5.275 -> 5.28) where round() of a Python float
+    rounds its binary value (5.2749... -> 5.27), so both paths go through np.float64.
+    """
+    return float(round(np.float64(count) / total * 100, 2))
+
+class PushdownProfiler:
+    """Compute column statistics inside MySQL with batched aggregate queries
+    
+    IQR outliers cost a fixed number of queries per table, not per numeric column: the quartiles of
+    every numeric column come from one query (exactly, with ROW_NUMBER() on MySQL 8.0+, or from KLL
+    sketches over one random sample with quantile_mode='sketch'), then one scan counts the outliers of
+    every column and one query fetches their examples.
+    """
+    
+    # Rows the 'sketch' quantile mode samples to estimate the quartiles
+    SKETCH_SAMPLE_ROWS = 100000
+    
+    def __init__(self, db_connection: DatabaseConnection, quantile_mode: str = 'exact', sketch_k: int = 200):
+        self.db = db_connection
+        self.quantile_mode = quantile_mode
+        self.sketch_k = sketch_k
+        # Cleared once the server rejects ROW_NUMBER() (MySQL 5.7); quartiles then use ORDER BY ... LIMIT
+        self.window_functions = True
+    
+    def profile_table(self, table_name: str, key_columns: List[str] = None) -> Dict[str, Any]:
+        """Profile a table without transferring its rows to the client"""
+        schema = self.db.get_table_schema(table_name)
+        if not schema:
+            return {}
+        
+        columns = [(row[0], row[1]) for row in schema]
+        key_columns = list(key_columns) if key_columns else [column for column, _ in columns]
+        query = self.build_aggregate_query(table_name, columns, key_columns)
+        data, names = self.db.execute_query(query)
+        if not data:
+            return {}
+        stats = dict(zip(names, data[0]))
+        
+        total_rows = int(stats['total_rows'])
+        duplicates = total_rows - int(stats['distinct_rows'])
+        profile_results = {
+            'table_name': table_name,
+            'timestamp': datetime.now().isoformat(),
+            'total_rows': total_rows,
+            'total_columns': len(columns),
+            'column_profiles': {},
+            'data_quality_issues': {
+                'missing_values': {},
+                'duplicates': duplicates,
+                'duplicate_keys': {
+                    'columns': key_columns,
+                    'examples': self._duplicate_examples(table_name, key_columns, dict(columns)) if duplicates else []
+                },
+                'inconsistencies': {}
+            }
+        }
+        issues = profile_results['data_quality_issues']
+        numeric = []
+        
+        for i, (column, column_type) in enumerate(columns):
+            kind = mysql_type_kind(column_type)
+            non_null = int(stats[f'c{i}_non_null'])
+            missing = total_rows - non_null
+            
+            profile = {
+                'data_type': mysql_type_to_dtype(column_type, missing > 0),
+                'unique_values': int(stats[f'c{i}_distinct']),
+                'missing_values': missing,
+                'missing_percentage': _percentage(missing, total_rows) if total_rows else float('nan')
+            }
+            
+            if kind == 'numeric':
+                has_values = non_null > 0
+                profile.update({
+                    'min_value': float(stats[f'c{i}_min']) if has_values else None,
+                    'max_value': float(stats[f'c{i}_max']) if has_values else None,
+                    'mean_value': float(stats[f'c{i}_avg']) if has_values else None,
+                    'std_dev': float(stats[f'c{i}_std']) if stats[f'c{i}_std'] is not None else (float('nan') if has_values else None),
+                    'outliers': None
+                })
+                numeric.append((column, non_null, profile))
+                spec = mysql_decimal_spec(column_type)
+                if spec is not None:
+                    largest = max(abs(stats[f'c{i}_min']), abs(stats[f'c{i}_max'])) if has_values else 0
+                    profile['precision_loss'] = bool(largest * 10 ** spec[1] >= 10 ** FLOAT64_EXACT_DIGITS)
+            elif kind == 'string':
+                has_values = non_null > 0
+                profile.update({
+                    'avg_length': float(stats[f'c{i}_avg_len']) if has_values else None,
+                    'max_length': int(stats[f'c{i}_max_len']) if has_values else None,
+                    'min_length': int(stats[f'c{i}_min_len']) if has_values else None
+                })
+                
+                if int(stats[f'c{i}_mixed_case'] or 0) > 0:
+                    issues['inconsistencies'][f'{column}_case_inconsistency'] = {
+                        'type': 'mixed_case',
+                        'count': int(stats[f'c{i}_mixed_case']),
+                        'examples': self._examples(table_name, column, self._mixed_case_condition(column))
+                    }
+                if int(stats[f'c{i}_whitespace'] or 0) > 0:
+                    issues['inconsistencies'][f'{column}_whitespace_inconsistency'] = {
+                        'type': 'whitespace',
+                        'count': int(stats[f'c{i}_whitespace']),
+                        'examples': self._examples(table_name, column, self._whitespace_condition(column))
+                    }
+            
+            profile_results['column_profiles'][column] = profile
+            if missing > 0:
+                issues['missing_values'][column] = {
+                    'count': missing,
+                    'percentage': profile['missing_percentage']
+                }
+        
+        outliers = self._detect_outliers(table_name, [(column, non_null, profile['data_type'])
+                                                      for column, non_null, profile in numeric], total_rows)
+        for column, _, profile in numeric:
+            profile['outliers'] = outliers[column]
+        return profile_results
+    
+    def build_aggregate_query(self, table_name: str, columns: List[Tuple[str, Any]], key_columns: List[str]) -> str:
+        """One SELECT computing every column statistic for a table"""
+        table = quote_identifier(table_name)
+        column_types = dict(columns)
+        keys = ', '.join(f"{self._key_expression(column, column_types.get(column, 'unknown'))} AS k{i}"
+                         for i, column in enumerate(key_columns))
+        expressions = [
+            'COUNT(*) AS total_rows',
+            f'(SELECT COUNT(*) FROM (SELECT DISTINCT {keys} FROM {table}) AS distinct_rows) AS distinct_rows'
+        ]
+        
+        for i, (column, column_type) in enumerate(columns):
+            col = quote_identifier(column)
+            kind = mysql_type_kind(column_type)
+            expressions.append(f'COUNT({col}) AS c{i}_non_null')
+            
+            if kind == 'string':
+                # Compare bytes so case-insensitive collations do not merge 'A' and 'a'
+                expressions.append(f'COUNT(DISTINCT CAST({col} AS BINARY)) AS c{i}_distinct')
+                expressions.extend([
+                    f'MIN(CHAR_LENGTH({col})) AS c{i}_min_len',
+                    f'MAX(CHAR_LENGTH({col})) AS c{i}_max_len',
+                    f'AVG(CHAR_LENGTH({col})) AS c{i}_avg_len',
+                    f'SUM({self._mixed_case_condition(column)}) AS c{i}_mixed_case',
+                    f'SUM({self._whitespace_condition(column)}) AS c{i}_whitespace'
+                ])
+            else:
+                expressions.append(f'COUNT(DISTINCT {col}) AS c{i}_distinct')
+            
+            if kind == 'numeric':
+                expressions.extend([
+                    f'MIN({col}) AS c{i}_min',
+                    f'MAX({col}) AS c{i}_max',
+                    f'AVG({col}) AS c{i}_avg',
+                    f'STDDEV_SAMP({col}) AS c{i}_std'
+                ])
+        
+        return f"SELECT {', '.join(expressions)} FROM {table}"
+    
+    @staticmethod
+    def _key_expression(column: str, column_type: Any) -> str:
+        """A duplicate-key column as pandas compares it: string columns by their bytes, so that
+        case-insensitive and PAD SPACE collations do not merge 'Alice', 'alice' and 'Alice '"""
+        col = quote_identifier(column)
+        return f'CAST({col} AS BINARY)' if mysql_type_kind(column_type) == 'string' else col
+    
+    @staticmethod
+    def _mixed_case_condition(column: str) -> str:
+        col = quote_identifier(column)
+        return (f'(CAST(LOWER({col}) AS BINARY) <> CAST({col} AS BINARY) AND '
+                f'CAST(UPPER({col}) AS BINARY) <> CAST({col} AS BINARY))')
+    
+    @staticmethod
+    def _whitespace_condition(column: str) -> str:
+        col = quote_identifier(column)
+        return f"({col} REGEXP '^[[:space:]]|[[:space:]]$')"
+    
+    def _examples(self, table_name: str, column: str, condition: str) -> List[Any]:
+        """First five values matching an inconsistency condition"""
+        data, _ = self.db.execute_query(
+            f"SELECT {quote_identifier(column)} FROM {quote_identifier(table_name)} WHERE {condition} LIMIT 5"
+        )
+        return [row[0] for row in data] if data else []
+    
+    def _duplicate_examples(self, table_name: str, key_columns: List[str],
+                            column_types: Dict[str, Any]) -> List[List[Any]]:
+        """First five key combinations that occur more than once"""
+        selected = []
+        groups = []
+        for column in key_columns:
+            group = self._key_expression(column, column_types.get(column, 'unknown'))
+            # The values of a byte-compared group are identical, and MIN() keeps the SELECT valid
+            # under ONLY_FULL_GROUP_BY
+            selected.append(quote_identifier(column) if group == quote_identifier(column) else f'MIN({quote_identifier(column)})')
+            groups.append(group)
+        data, _ = self.db.execute_query(
+            f"SELECT {', '.join(selected)} FROM {quote_identifier(table_name)} "
+            f"GROUP BY {', '.join(groups)} HAVING COUNT(*) > 1 LIMIT 5"
+        )
+        return [list(row) for row in data] if data else []
+    
+    def _quantile(self, table_name: str, column: str, non_null: int, q: float) -> float:
+        """Linearly interpolated quantile, matching pandas, using ORDER BY ... LIMIT"""
+        col = quote_identifier(column)
+        position = (non_null - 1) * q
+        offset = int(np.floor(position))
+        data, _ = self.db.execute_query(
+            f"SELECT {col} FROM {quote_identifier(table_name)} WHERE {col} IS NOT NULL "
+            f"ORDER BY {col} LIMIT 2 OFFSET {offset}"
+        )
+        lower = float(data[0][0])
+        upper = float(data[1][0]) if len(data) > 1 else lower
+        return lower + (upper - lower) * (position - offset)
+    
+    def _exact_quartiles(self, table_name: str, columns: List[Tuple[str, int]]) -> Dict[str, Tuple[float, float]]:
+        """Q1 and Q3 of each (column, non-null count), interpolated like pandas
+        
+        One query numbers each column's values once with ROW_NUMBER() and returns only the rows around
+        both quartile positions, so a column costs one sort rather than one per quartile.
+        """
+        table = quote_identifier(table_name)
+        positions = {column: [(non_null - 1) * q for q in (0.25, 0.75)] for column, non_null in columns}
+        
+        data = None
+        if self.window_functions:
+            parts = []
+            for i, (column, _) in enumerate(columns):
+                col = quote_identifier(column)
+                ranks = sorted({int(np.floor(position)) + step for position in positions[column] for step in (1, 2)})
+                parts.append(f"SELECT {i} AS c, rn, v FROM (SELECT {col} AS v, ROW_NUMBER() OVER (ORDER BY {col}) AS rn "
+                             f"FROM {table} WHERE {col} IS NOT NULL) AS q{i} WHERE rn IN ({', '.join(map(str, ranks))})")
+            data, _ = self.db.execute_query(' UNION ALL '.join(parts))
+            self.window_functions = data is not None
+        if data is None:
+            return {column: (self._quantile(table_name, column, non_null, 0.25),
+                             self._quantile(table_name, column, non_null, 0.75)) for column, non_null in columns}
+        
+        ranked = {(int(c), int(rn)): float(v) for c, rn, v in data}
+        quartiles = {}
+        for i, (column, _) in enumerate(columns):
+            bounds = []
+            for position in positions[column]:
+                offset = int(np.floor(position))
+                lower = ranked[(i, offset + 1)]
+                upper = ranked.get((i, offset + 2), lower)
+                bounds.append(lower + (upper - lower) * (position - offset))
+            quartiles[column] = tuple(bounds)
+        return quartiles
+    
+    def _sketch_quartiles(self, table_name: str, columns: List[Tuple[str, int]],
+                          total_rows: int) -> Dict[str, Tuple[float, float]]:
+        """Q1 and Q3 of each column from KLL sketches over one random sample of about SKETCH_SAMPLE_ROWS rows"""
+        names = [column for column, _ in columns]
+        query = f"SELECT {', '.join(quote_identifier(column) for column in names)} FROM {quote_identifier(table_name)}"
+        params = None
+        if total_rows > self.SKETCH_SAMPLE_ROWS:
+            query += " WHERE RAND() < %s"
+            params = (self.SKETCH_SAMPLE_ROWS / total_rows,)
+        chunks, _ = self.db.iter_query(query, params)
+        if chunks is None:
+            return {}
+        
+        sketches = {column: KLLSketch(self.sketch_k) for column in names}
+        for rows in chunks:
+            chunk = pd.DataFrame(rows, columns=names)
+            for column in names:
+                values = pd.to_numeric(chunk[column], errors='coerce').dropna().to_numpy(dtype='float64')
+                sketches[column].update(values)
+        return {column: (sketch.quantile(0.25), sketch.quantile(0.75))
+                for column, sketch in sketches.items() if sketch.n}
+    
+    def _detect_outliers(self, table_name: str, columns: List[Tuple[str, int, str]],
+                         total_rows: int) -> Dict[str, Dict[str, Any]]:
+        """IQR outliers of every (column, non-null count, data type), computed server-side"""
+        outliers = {column: {'count': 0, 'values': []} for column, _, _ in columns}
+        with_values = [(column, non_null) for column, non_null, _ in columns if non_null > 0]
+        if not with_values:
+            return outliers
+        
+        if self.quantile_mode == 'sketch':
+            quartiles = self._sketch_quartiles(table_name, with_values, total_rows)
+        else:
+            quartiles = self._exact_quartiles(table_name, with_values)
+        conditions = {}
+        params = {}
+        for column, (Q1, Q3) in quartiles.items():
+            IQR = Q3 - Q1
+            col = quote_identifier(column)
+            conditions[column] = f"({col} < %s OR {col} > %s)"
+            params[column] = (Q1 - 1.5 * IQR, Q3 + 1.5 * IQR)
+        if not conditions:
+            return outliers
+        
+        table = quote_identifier(table_name)
+        counts, _ = self.db.execute_query(
+            f"SELECT {', '.join(f'COUNT(CASE WHEN {condition} THEN 1 END)' for condition in conditions.values())} FROM {table}",
+            tuple(value for column in conditions for value in params[column])
+        )
+        if not counts:
+            return outliers
+        found = [column for column, count in zip(conditions, counts[0]) if count]
+        for column, count in zip(conditions, counts[0]):
+            outliers[column]['count'] = int(count)
+        
+        if found:
+            # A derived table per column keeps each LIMIT local to its branch of the UNION
+            examples, _ = self.db.execute_query(
+                ' UNION ALL '.join(f"SELECT {i} AS c, v FROM (SELECT {quote_identifier(column)} AS v FROM {table} "
+                                   f"WHERE {conditions[column]} LIMIT 10) AS o{i}" for i, column in enumerate(found)),
+                tuple(value for column in found for value in params[column])
+            )
+            data_types = {column: data_type for column, _, data_type in columns}
+            for c, value in examples or []:
+                column = found[int(c)]
+                outliers[column]['values'].append(int(value) if data_types[column] == 'int64' else float(value))
+        return outliers
+
+class DataQualityProfiler:
+    """Data quality profiling and analysis"""
+    
+    # 'memory' loads the whole table into one DataFrame, 'streaming' folds fetchmany chunks into
+    # accumulators, 'pushdown' computes the statistics with aggregate queries inside MySQL and
+    # 'incremental' only scans rows past a stored watermark and merges them into the saved state;
+    # 'parallel' splits the table into primary-key ranges scanned by separate worker connections;
+    # 'auto' picks memory, streaming or pushdown from the table's estimated size and memory_budget;
+    # 'sampled' profiles a random sample and extrapolates the issue rates with confidence intervals
+    STRATEGIES = ('memory', 'streaming', 'pushdown', 'incremental', 'parallel', 'auto', 'sampled')
+    SAMPLE_METHODS = ('auto', 'pk_range', 'bernoulli', 'reservoir')
+    # Number of primary-key ranges a 'pk_range' sample is spread over
+    SAMPLE_RANGES = 64
+    # Largest float64 block the batched in-memory column statistics copy at once
+    STATS_BLOCK_BYTES = 32 * 1024 * 1024
+    
+    def __init__(self, db_connection: DatabaseConnection, chunk_size: int = 50000,
+                 distinct_mode: str = 'exact', hll_precision: int = 14, exact_distinct_limit: int = 100000,
+                 quantile_mode: str = 'exact', sketch_k: int = 200, outlier_pass: bool = False,
+                 duplicate_memory_budget: int = 64 * 1024 * 1024, state_dir: str = '.dq_state',
+                 scan_workers: int = 4, consistent_snapshot: bool = False,
+                 profile_cache: ProfileCache = None, fingerprint_method: str = 'metadata',
+                 history_store: ProfileHistoryStore = None, compact_dtypes: bool = True,
+                 category_ratio: float = 0.5, fetch_mode: str = 'rows', column_workers: int = 1,
+                 memory_budget: int = 512 * 1024 * 1024, sample_rows: int = 100000,
+                 sample_method: str = 'auto', sample_confidence: float = 0.95, sample_seed: int = None,
+                 sample_above_rows: int = None, instrumentation: str = 'off'):
+        self.db = db_connection
+        self.chunk_size = chunk_size
+        # 'exact' counts distinct values with a hash set, 'approximate' always uses a HyperLogLog
+        # sketch and 'auto' stays exact until a column exceeds exact_distinct_limit distinct values
+        self.distinct_mode = distinct_mode
+        self.hll_precision = hll_precision
+        self.exact_distinct_limit = exact_distinct_limit
+        # With quantile_mode='sketch' the streaming path estimates Q1/Q3 with a KLL sketch; outlier_pass
+        # re-reads the numeric columns once to count outliers exactly against those bounds
+        self.quantile_mode = quantile_mode
+        self.sketch_k = sketch_k
+        self.outlier_pass = outlier_pass
+        # Fingerprints beyond this many bytes are partitioned to temporary files by the streaming path
+        self.duplicate_memory_budget = duplicate_memory_budget
+        self.state_store = ProfileStateStore(state_dir)
+        # Partitioned ('parallel') scans: number of primary-key ranges / worker connections, and whether
+        # the workers read from one consistent snapshot (opt-in: it holds a READ lock on the table,
+        # blocking its writers, until every worker has opened its transaction)
+        self.scan_workers = scan_workers
+        self.consistent_snapshot = consistent_snapshot
+        # Results are reused while get_table_fingerprint(table, fingerprint_method) is unchanged
+        self.profile_cache = profile_cache
+        self.fingerprint_method = fingerprint_method
+        # Every freshly computed profile (not cache hits) is appended to the history store
+        self.history_store = history_store
+        # The 'memory' strategy stores fetched columns in schema-driven compact dtypes; text columns with
+        # at most category_ratio distinct values per row become categoricals
+        self.compact_dtypes = compact_dtypes
+        self.category_ratio = category_ratio
+        # 'rows' fetches Python tuples with execute_query; 'columnar' decodes raw batches straight into
+        # typed arrays with execute_query_columnar
+        self.fetch_mode = fetch_mode
+        # In-memory frames are profiled in column groups on this many threads (1 = serially)
+        self.column_workers = column_workers
+        # Client memory the 'auto' strategy plans a scan to stay within
+        self.memory_budget = memory_budget
+        # The 'sampled' strategy reads about sample_rows rows with sample_method (see SAMPLE_METHODS);
+        # 'auto' also samples tables estimated above sample_above_rows rows, when that is set
+        if sample_method not in self.SAMPLE_METHODS:
+            raise ValueError(f"Unknown sampling method: {sample_method}")
+        self.sample_rows = sample_rows
+        self.sample_method = sample_method
+        self.sample_confidence = sample_confidence
+        self.sample_seed = sample_seed
+        self.sample_above_rows = sample_above_rows
+        # 'timing' records wall/CPU time and rows per stage and per column under the 'performance' key;
+        # 'memory' also traces allocations with tracemalloc, which slows profiling down noticeably
+        if instrumentation not in INSTRUMENTATION_MODES:
+            raise ValueError(f"Unknown instrumentation mode: {instrumentation}")
+        self.instrumentation = instrumentation
+    
+    def profile_table(self, table_name: str, strategy: str = 'memory', key_columns: List[str] = None,
+                      watermark_column: str = None, rebuild: bool = False, use_cache: bool = True) -> Dict[str, Any]:
+        """Comprehensive data quality profiling for a table
+        
+        key_columns restricts duplicate detection to a subset of columns (default: whole rows).
+        watermark_column and rebuild only apply to the 'incremental' strategy.
+        With a profile_cache, unchanged tables are answered from the cache unless use_cache is False
+        or rebuild is set; the fresh results then replace the cached ones. Instrumented runs always scan
+        (timings are only meaningful for a run that happened), and timings are never cached.
+        """
+        
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown profiling strategy: {strategy}")
+        
+        def compute():
+            if self.instrumentation == 'off':
+                profile_results = self._profile_table_uncached(table_name, strategy, key_columns, watermark_column,
+                                                               rebuild)
+            else:
+                with PerformanceRecorder(self.instrumentation) as recorder:
+                    profile_results = self._profile_table_uncached(table_name, strategy, key_columns,
+                                                                   watermark_column, rebuild)
+                    if profile_results:
+                        recorder.count_rows(profile_results['total_rows'])
+                if profile_results:
+                    profile_results['performance'] = recorder.results()
+            # Sampled counts would break the trends of full profiles, so only full profiles are recorded
+            if profile_results and 'sample' not in profile_results and self.history_store is not None:
+                self.history_store.record(ProfileHistoryStore.source_name(self.db), profile_results)
+            return profile_results
+        
+        if self.profile_cache is None:
+            return compute()
+        # Fingerprint before scanning so a write during the scan invalidates the stored results
+        fingerprint = self.db.get_table_fingerprint(table_name, self.fingerprint_method)
+        key = self.cache_key(table_name, strategy, key_columns, watermark_column)
+        if use_cache and not rebuild and self.instrumentation == 'off':
+            return self.profile_cache.get_or_compute(key, fingerprint, compute)
+        profile_results = compute()
+        if profile_results and fingerprint is not None:
+            self.profile_cache.put(key, fingerprint, self.cacheable(profile_results))
+        return profile_results
+    
+    def worker_copy(self) -> 'DataQualityProfiler':
+        """Picklable copy of this profiler for a worker process: its settings without the connection
+        (the worker opens its own) or the cache and history store (which the parent fills)"""
+        worker_profiler = copy.copy(self)
+        worker_profiler.db = None
+        worker_profiler.profile_cache = None
+        worker_profiler.history_store = None
+        return worker_profiler
+    
+    @staticmethod
+    def cacheable(profile_results: Dict[str, Any]) -> Dict[str, Any]:
+        """profile_results without the 'performance' timings of the run that produced them"""
+        if 'performance' not in profile_results:
+            return profile_results
+        return {key: value for key, value in profile_results.items() if key != 'performance'}
+    
+    def cache_key(self, table_name: str, strategy: str, key_columns: List[str] = None,
+                  watermark_column: str = None) -> str:
+        """Profile cache key: the table, how it is profiled and every option that changes the results"""
+        return ProfileCache.make_key(
+            self.db.host, int(self.db.port), self.db.database, table_name, strategy,
+            tuple(key_columns or ()), watermark_column, self.distinct_mode, self.hll_precision,
+            self.exact_distinct_limit, self.quantile_mode, self.sketch_k, self.outlier_pass,
+            # 'auto' picks its strategy from the memory budget, chunk size and fetch mode, and the in-memory
+            # report depends on the frame's dtypes
+            (self.memory_budget, self.chunk_size, self.fetch_mode) if strategy == 'auto' else None,
+            (self.compact_dtypes, self.category_ratio, self.fetch_mode) if strategy in ('memory', 'auto', 'sampled') else None,
+            (self.sample_rows, self.sample_method, self.sample_above_rows, self.sample_confidence, self.sample_seed)
+            if strategy in ('auto', 'sampled') else None
+        )
+    
+    def cached_profile(self, table_name: str, strategy: str = 'memory') -> Tuple[Tuple, Dict[str, Any]]:
+        """(fingerprint, cached profile_results or None) without scanning the table"""
+        if self.profile_cache is None:
+            return None, None
+        fingerprint = self.db.get_table_fingerprint(table_name, self.fingerprint_method)
+        if fingerprint is None:
+            return None, None
+        return fingerprint, self.profile_cache.get(self.cache_key(table_name, strategy), fingerprint)
+    
+    def choose_strategy(self, table_name: str) -> Tuple[str, Dict[str, Any]]:
+        """Pick 'memory', 'streaming' or 'pushdown' so profiling the table stays within memory_budget
+        ('sampled' for tables above sample_above_rows)
+        
+        Sizes come from the catalog's information_schema estimates (TABLE_ROWS, DATA_LENGTH,
+        AVG_ROW_LENGTH) and the schema's per-type widths. Returns the strategy and the estimates and
+        reason behind it, which the 'auto' strategy stores in the results as 'strategy_selection'.
+        """
+        budget = self.memory_budget
+        selection = {'requested': 'auto', 'memory_budget_bytes': budget}
+        schema = self.db.get_table_schema(table_name)
+        table = self.db.catalog.table(table_name)
+        if not schema or table is None:
+            selection.update(strategy='streaming',
+                             reason="No size estimate for the table; streaming bounds memory by the chunk size")
+            return 'streaming', selection
+        
+        widths = estimate_row_bytes(schema, table['avg_row_length'])
+        rows = table['estimated_rows']
+        if not table['avg_row_length'] and table['data_length']:
+            # Statistics not collected yet: TABLE_ROWS is 0, but DATA_LENGTH still shows the table's size
+            rows = max(rows, int(table['data_length'] // max(widths['stored'], 1)))
+        
+        # The memory path holds every fetched row (one batch with the columnar fetch) plus the frame
+        fetched_rows = min(rows, self.chunk_size) if self.fetch_mode == 'columnar' else rows
+        memory_peak = fetched_rows * widths['row'] + rows * widths['frame']
+        # Streaming holds one chunk plus state that grows with the table: exact quantiles keep every
+        # numeric value, exact distinct counts keep a set of values per column and duplicate
+        # fingerprints stay in memory up to duplicate_memory_budget
+        streaming_peak = self.chunk_size * (widths['row'] + widths['frame'])
+        if self.quantile_mode == 'exact':
+            numeric_columns = sum(1 for row in schema if mysql_type_kind(row[1]) == 'numeric')
+            streaming_peak += rows * numeric_columns * 8
+        if self.distinct_mode != 'approximate':
+            distinct_rows = rows if self.distinct_mode == 'exact' else min(rows, self.exact_distinct_limit)
+            streaming_peak += distinct_rows * (widths['row'] + 40 * len(schema))
+        streaming_peak += min(self.duplicate_memory_budget, rows * 64)
+        
+        selection.update({
+            'estimated_rows': rows,
+            'row_bytes': round(widths['row']),
+            'frame_row_bytes': round(widths['frame']),
+            'memory_peak_bytes': int(memory_peak),
+            'streaming_peak_bytes': int(streaming_peak)
+        })
+        if self.sample_above_rows is not None and rows > self.sample_above_rows:
+            strategy = 'sampled'
+            reason = (f"~{rows:,} rows is above the {self.sample_above_rows:,}-row sampling threshold; "
+                      f"profiling a random sample of about {self.sample_rows:,} rows")
+        elif memory_peak <= budget:
+            strategy = 'memory'
+            reason = (f"Loading ~{rows:,} rows needs about {format_bytes(memory_peak)}, "
+                      f"within the {format_bytes(budget)} budget")
+        elif streaming_peak <= budget:
+            strategy = 'streaming'
+            reason = (f"Loading ~{rows:,} rows would need about {format_bytes(memory_peak)}; streaming "
+                      f"{self.chunk_size:,}-row chunks needs about {format_bytes(streaming_peak)}, "
+                      f"within the {format_bytes(budget)} budget")
+        else:
+            strategy = 'pushdown'
+            reason = (f"Neither loading ({format_bytes(memory_peak)}) nor streaming "
+                      f"({format_bytes(streaming_peak)}) ~{rows:,} rows fits the {format_bytes(budget)} "
+                      f"budget; statistics are computed inside MySQL")
+        selection.update(strategy=strategy, reason=reason)
+        return strategy, selection
+    
+    def _profile_table_uncached(self, table_name: str, strategy: str, key_columns: List[str],
+                                watermark_column: str, rebuild: bool) -> Dict[str, Any]:
+        perf = current_recorder()
+        if strategy == 'auto':
+            with perf.stage('choose strategy'):
+                strategy, selection = self.choose_strategy(table_name)
+            profile_results = self._profile_table_uncached(table_name, strategy, key_columns, watermark_column, rebuild)
+            if profile_results:
+                profile_results['strategy_selection'] = selection
+            return profile_results
+        if strategy == 'streaming':
+            return self._profile_table_streaming(table_name, key_columns)
+        if strategy == 'pushdown':
+            with perf.stage('pushdown queries'):
+                return PushdownProfiler(self.db, self.quantile_mode, self.sketch_k).profile_table(table_name, key_columns)
+        if strategy == 'incremental':
+            return self._profile_table_incremental(table_name, key_columns, watermark_column, rebuild)
+        if strategy == 'parallel':
+            return self._profile_table_parallel(table_name, key_columns)
+        if strategy == 'sampled':
+            return self._profile_table_sampled(table_name, key_columns)
+        
+        # Get table data
+        query = f"SELECT * FROM {quote_identifier(table_name)}"
+        with perf.stage('schema'):
+            schema = self.db.get_table_schema(table_name)
+        loaded = self._load_frame(query, schema)
+        if loaded is None:
+            return {}
+        return self._profile_loaded_frame(*loaded, table_name, key_columns)
+    
+    def _load_frame(self, query: str, schema: List[Tuple], params: tuple = None) -> Tuple[pd.DataFrame, Dict[str, Any], Dict[str, bool]]:
+        """build_dataframe of a query's result set with the configured fetch_mode, or None on error"""
+        perf = current_recorder()
+        if self.fetch_mode == 'columnar':
+            with perf.stage('fetch'):
+                frame = self.db.execute_query_columnar(query, params, batch_size=self.chunk_size)
+                if frame is None:
+                    return None
+                perf.count_rows(len(frame))
+            with perf.stage('build frame', len(frame)):
+                return self.compact_frame(frame, schema)
+        with perf.stage('fetch'):
+            data, columns = self.db.execute_query(query, params)
+            
+            if data is None:
+                return None
+            perf.count_rows(len(data))
+        
+        with perf.stage('build frame', len(data)):
+            return self.build_dataframe(data, columns, schema)
+    
+    def _profile_loaded_frame(self, df: pd.DataFrame, memory: Dict[str, Any], precision_loss: Dict[str, bool],
+                              table_name: str, key_columns: List[str]) -> Dict[str, Any]:
+        profile_results = self.profile_dataframe(df, table_name, key_columns)
+        for column, lossy in precision_loss.items():
+            profile_results['column_profiles'][column]['precision_loss'] = lossy
+        if memory:
+            profile_results['memory'] = memory
+        return profile_results
+    
+    def _profile_table_sampled(self, table_name: str, key_columns: List[str] = None) -> Dict[str, Any]:
+        """Profile a random sample of about sample_rows rows and extrapolate its issue rates to the table
+        
+        'pk_range' reads random ranges of an integer primary key (index range scans, so the cost follows
+        the sample size rather than the table size), 'bernoulli' keeps each row with probability p via
+        RAND() < p on the server and 'reservoir' streams the whole table keeping a uniform fixed-size
+        sample. 'auto' uses pk_range when the table has an integer primary key and bernoulli otherwise.
+        """
+        started = time.perf_counter()
+        perf = current_recorder()
+        with perf.stage('schema'):
+            schema = self.db.get_table_schema(table_name)
+        if not schema:
+            return {}
+        primary_key = self._integer_primary_key(schema)
+        method = self.sample_method
+        if method == 'auto' or (method == 'pk_range' and primary_key is None):
+            method = 'pk_range' if primary_key is not None else 'bernoulli'
+        rng = np.random.default_rng(self.sample_seed)
+        
+        clusters = None
+        if method == 'reservoir':
+            with perf.stage('reservoir sample'):
+                loaded, population = self._reservoir_sample(table_name, schema, rng)
+            if loaded is None:
+                return {}
+            fraction = len(loaded[0]) / population if population else 1.0
+        else:
+            population = self.db.catalog.estimated_rows(table_name)
+            if not population:
+                data, _ = self.db.execute_query(f"SELECT COUNT(*) FROM {quote_identifier(table_name)}")
+                population = int(data[0][0]) if data else 0
+            fraction = min(1.0, self.sample_rows / population) if population else 1.0
+            query = f"SELECT * FROM {quote_identifier(table_name)}"
+            params = None
+            ranges = None
+            if fraction < 1.0 and method == 'pk_range':
+                with perf.stage('key ranges'):
+                    ranges, fraction = self._sample_key_ranges(table_name, primary_key, fraction, rng)
+                if ranges:
+                    pk = quote_identifier(primary_key)
+                    query += " WHERE " + " OR ".join(f"{pk} BETWEEN %s AND %s" for _ in ranges)
+                    params = tuple(bound for key_range in ranges for bound in key_range)
+            elif fraction < 1.0:
+                query += " WHERE RAND() < %s"
+                params = (fraction,)
+            loaded = self._load_frame(query, schema, params)
+            if loaded is None:
+                return {}
+            if ranges:
+                # Rows of one key range are sampled together, so the intervals treat ranges as clusters
+                starts = np.array([lower for lower, _ in ranges], dtype=np.float64)
+                keys = loaded[0][primary_key].to_numpy(dtype=np.float64)
+                clusters = np.searchsorted(starts, keys, side='right') - 1
+        
+        df = loaded[0]
+        profile_results = self._profile_loaded_frame(*loaded, table_name, key_columns)
+        # The table's size is already known: the reservoir counted it and the other methods sized the
+        # sample from it, so len(df) / fraction would only add sampling noise. A full read counts it exactly
+        if fraction >= 1.0 or not population:
+            estimated_rows = len(df) / fraction if fraction else 0
+        else:
+            estimated_rows = population
+        with perf.stage('estimates', len(df)):
+            estimates = self._sample_estimates(df, profile_results, fraction, estimated_rows, clusters)
+        profile_results['sample'] = {
+            'method': method,
+            'fraction': fraction,
+            'sample_rows': len(df),
+            'estimated_total_rows': int(round(estimated_rows)),
+            'confidence': self.sample_confidence,
+            'estimates': estimates,
+            'seconds': round(time.perf_counter() - started, 3)
+        }
+        return profile_results
+    
+    def _sample_key_ranges(self, table_name: str, primary_key: str, fraction: float,
+                           rng: np.random.Generator) -> Tuple[List[Tuple[int, int]], float]:
+        """Random primary-key ranges covering about `fraction` of the key space, one per stratum
+        
+        Returns the ranges and the fraction of the key space they actually cover.
+        """
+        pk = quote_identifier(primary_key)
+        data, _ = self.db.execute_query(f"SELECT MIN({pk}), MAX({pk}) FROM {quote_identifier(table_name)}")
+        if not data or data[0][0] is None:
+            return [], 1.0
+        low, high = int(data[0][0]), int(data[0][1])
+        span = high - low + 1
+        strata = max(1, min(self.SAMPLE_RANGES, span))
+        stratum = span / strata
+        width = max(1, int(stratum * fraction))
+        offsets = rng.uniform(0, max(stratum - width, 0), strata)
+        ranges = []
+        for index in range(strata):
+            lower = low + int(index * stratum + offsets[index])
+            ranges.append((lower, min(lower + width - 1, high)))
+        return ranges, min(1.0, strata * width / span)
+    
+    def _reservoir_sample(self, table_name: str, schema: List[Tuple],
+                          rng: np.random.Generator) -> Tuple[Tuple[pd.DataFrame, Dict[str, Any], Dict[str, bool]], int]:
+        """Stream the table keeping a uniform sample of sample_rows rows (Algorithm R); returns the loaded
+        sample and the number of rows scanned"""
+        chunks, columns = self.db.iter_query(f"SELECT * FROM {quote_identifier(table_name)}", chunk_size=self.chunk_size)
+        if chunks is None:
+            return None, 0
+        size = self.sample_rows
+        reservoir = []
+        seen = 0
+        for rows in chunks:
+            fill = max(0, min(size - len(reservoir), len(rows)))
+            reservoir.extend(rows[:fill])
+            if fill < len(rows):
+                # Row t (0-based) replaces a random slot with probability size / (t + 1)
+                positions = np.arange(seen + fill, seen + len(rows))
+                slots = rng.integers(0, positions + 1)
+                for offset in np.nonzero(slots < size)[0]:
+                    reservoir[slots[offset]] = rows[fill + offset]
+            seen += len(rows)
+        return self.build_dataframe(reservoir, columns, schema), seen
+    
+    def _sample_estimates(self, df: pd.DataFrame, profile_results: Dict[str, Any], fraction: float,
+                          estimated_rows: float, clusters: np.ndarray = None) -> Dict[str, Any]:
+        """Missing-value, duplicate and outlier rates of a sample extrapolated to the whole table"""
+        confidence = self.sample_confidence
+        
+        def extrapolate(hits: np.ndarray) -> Dict[str, Any]:
+            rate, low, high = proportion_interval(hits, confidence, fraction, clusters)
+            return {
+                'rate': rate,
+                'interval': [low, high],
+                'estimated_count': int(round(rate * estimated_rows)),
+                'count_interval': [int(round(low * estimated_rows)), int(round(high * estimated_rows))]
+            }
+        
+        estimates = {
+            'missing_values': {column: extrapolate(df[column].isna().to_numpy()) for column in df.columns},
+            'outliers': {}
+        }
+        # A duplicated row is only seen when another copy is sampled too, so the sampled rate holds for
+        # rows repeated many times but under-counts rows that occur only twice or three times
+        key_columns = profile_results['data_quality_issues']['duplicate_keys']['columns']
+        estimates['duplicates'] = extrapolate(df.duplicated(subset=key_columns).to_numpy())
+        estimates['duplicates']['note'] = "lower bound for rows repeated only a few times"
+        for column, profile in profile_results['column_profiles'].items():
+            if 'outliers' not in profile or profile.get('min_value') is None:
+                continue
+            values = legacy_column(df[column])
+            if is_decimal_series(values):
+                values, _ = decimal_to_float(values)
+            q1, q3 = values.quantile(0.25), values.quantile(0.75)
+            iqr = q3 - q1
+            outliers = ((values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)).to_numpy()
+            estimates['outliers'][column] = extrapolate(outliers)
+        return estimates
+    
+    def build_dataframe(self, data: List[Tuple], columns: List[str],
+                        schema: List[Tuple] = None) -> Tuple[pd.DataFrame, Dict[str, Any], Dict[str, bool]]:
+        """DataFrame of fetched rows, with DECIMAL columns as float64 and compact dtypes chosen from the schema
+        
+        Returns the frame, its memory footprint as inferred vs. compact (None without a schema or with
+        compact_dtypes off) and the precision_loss flag of each DECIMAL column. Columns are converted one
+        at a time so only one inferred column exists at once; the rows list is emptied once it has been
+        split into columns.
+        """
+        if not schema:
+            return pd.DataFrame(data, columns=columns), None, {}
+        
+        column_values = list(zip(*data)) if data else [()] * len(columns)
+        has_rows = bool(data)
+        data.clear()
+        
+        def inferred_columns():
+            for index, name in enumerate(columns):
+                yield name, pd.Series(column_values[index], dtype=None if has_rows else object, name=name)
+                column_values[index] = None
+        
+        return self._compact_columns(inferred_columns(), columns, schema)
+    
+    def compact_frame(self, frame: pd.DataFrame, schema: List[Tuple] = None) -> Tuple[pd.DataFrame, Dict[str, Any], Dict[str, bool]]:
+        """build_dataframe for a frame that was already decoded column by column (execute_query_columnar)"""
+        if not schema:
+            return frame, None, {}
+        columns = list(frame.columns)
+        # Hand the columns over one by one so the decoded and compact copies of a column never pile up
+        decoded = {name: frame.pop(name) for name in columns}
+        return self._compact_columns(((name, decoded.pop(name)) for name in columns), columns, schema)
+    
+    def _compact_columns(self, inferred_columns, columns: List[str],
+                         schema: List[Tuple]) -> Tuple[pd.DataFrame, Dict[str, Any], Dict[str, bool]]:
+        column_types = {row[0]: row[1] for row in schema}
+        decimal_specs = decimal_columns(schema)
+        precision_loss = {}
+        frame_columns = {}
+        memory = {'inferred_bytes': 0, 'compact_bytes': 0, 'columns': {}}
+        for name, inferred in inferred_columns:
+            if name in decimal_specs and inferred.dtype == object:
+                inferred, precision_loss[name] = decimal_to_float(inferred, *decimal_specs[name])
+            elif name in decimal_specs:
+                precision_loss[name] = float_precision_loss(inferred, decimal_specs[name][1])
+            compact = inferred
+            if name in column_types and self.compact_dtypes:
+                compact = compact_column(inferred, column_types[name], self.category_ratio)
+            inferred_bytes = int(inferred.memory_usage(index=False, deep=True))
+            compact_bytes = int(compact.memory_usage(index=False, deep=True))
+            memory['columns'][name] = {'dtype': str(compact.dtype), 'inferred_bytes': inferred_bytes,
+                                       'compact_bytes': compact_bytes}
+            memory['inferred_bytes'] += inferred_bytes
+            memory['compact_bytes'] += compact_bytes
+            frame_columns[name] = compact
+        return (pd.DataFrame(frame_columns, columns=list(columns)), memory if self.compact_dtypes else None,
+                precision_loss)
+    
+    def profile_dataframe(self, df: pd.DataFrame, table_name: str, key_columns: List[str] = None) -> Dict[str, Any]:
+        """Profile a DataFrame that is already in memory"""
+        
+        profile_results = {
+            'table_name': table_name,
+            'timestamp': datetime.now().isoformat(),
+            'total_rows': len(df),
+            'total_columns': len(df.columns),
+            'column_profiles': {},
+            'data_quality_issues': {
+                'missing_values': {},
+                'duplicates': 0,
+                'duplicate_keys': {'columns': list(key_columns or df.columns), 'examples': []},
+                'inconsistencies': {}
+            }
+        }
+        
+        # Profile every column, with the statistics batched across columns
+        perf = current_recorder()
+        with perf.stage('missing values', len(df)):
+            missing_counts = df.isna().sum()
+        with perf.stage('columns', len(df)):
+            column_profiles, inconsistencies = self._profile_column_groups(df, missing_counts)
+        profile_results['column_profiles'] = column_profiles
+        for column in df.columns:
+            # Check for missing values
+            missing_count = missing_counts[column]
+            if missing_count > 0:
+                profile_results['data_quality_issues']['missing_values'][column] = {
+                    'count': int(missing_count),
+                    'percentage': round((missing_count / len(df)) * 100, 2)
+                }
+        
+        # Check for duplicates
+        with perf.stage('duplicates', len(df)):
+            duplicate_mask = df.duplicated(subset=key_columns)
+            duplicate_count = duplicate_mask.sum()
+        profile_results['data_quality_issues']['duplicates'] = int(duplicate_count)
+        if duplicate_count:
+            key_frame = df.loc[duplicate_mask, list(key_columns or df.columns)].drop_duplicates().head(5)
+            key_frame = pd.DataFrame({column: legacy_column(key_frame[column], has_nulls=bool(df[column].isna().any()))
+                                      for column in key_frame.columns})
+            profile_results['data_quality_issues']['duplicate_keys']['examples'] = [
+                _row_values(key_frame, i) for i in range(len(key_frame))
+            ]
+        
+        # Check for inconsistencies
+        profile_results['data_quality_issues']['inconsistencies'] = inconsistencies
+        
+        return profile_results
+    
+    def _profile_column_groups(self, df: pd.DataFrame, missing_counts: pd.Series) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """column_profiles and inconsistencies of a frame, on column_workers threads when there are several
+        
+        Columns are split into contiguous groups and the results are merged back in group order, so the
+        output is the same as a serial run whichever group finishes first.
+        """
+        columns = list(df.columns)
+        if self.column_workers <= 1 or len(columns) < 2:
+            return self._profile_columns(df, missing_counts), self._detect_inconsistencies(df)
+        # A few groups per thread keeps the threads busy when some columns are far more costly than others
+        group_size = -(-len(columns) // (self.column_workers * 4))
+        groups = [columns[start:start + group_size] for start in range(0, len(columns), group_size)]
+        column_profiles = {}
+        inconsistencies = {}
+        perf = current_recorder()
+        profile_columns, detect_inconsistencies = perf.bind(self._profile_columns), perf.bind(self._detect_inconsistencies)
+        with ThreadPoolExecutor(max_workers=self.column_workers, thread_name_prefix='dq-columns') as pool:
+            futures = [(pool.submit(profile_columns, df, missing_counts, group),
+                        pool.submit(detect_inconsistencies, df, group))
+                       for group in groups]
+            for profiles, found in futures:
+                column_profiles.update(profiles.result())
+                inconsistencies.update(found.result())
+        return column_profiles, inconsistencies
+    
+    def _profile_columns(self, df: pd.DataFrame, missing_counts: pd.Series,
+                         columns: List[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Profile the columns of an in-memory frame (all by default) with the same results as _profile_column
+        
+        Numeric statistics are computed on 2D float64 blocks of many columns at once and string lengths
+        in one pass over all string columns, instead of a handful of pandas calls per column.
+        """
+        perf = current_recorder()
+        profiles = {}
+        numeric_columns = []
+        string_columns = []
+        with perf.stage('column fields'):
+            for column in (df.columns if columns is None else columns):
+                with perf.column(column, len(df)):
+                    series = legacy_column(df[column])
+                    precision_loss = None
+                    if is_decimal_series(series):
+                        series, precision_loss = decimal_to_float(series)
+                    
+                    missing_count = missing_counts[column]
+                    profile = {
+                        'data_type': str(series.dtype),
+                        **self._distinct_fields(series),
+                        'missing_values': int(missing_count),
+                        'missing_percentage': round((missing_count / len(series)) * 100, 2)
+                    }
+                    profiles[column] = profile
+                    
+                    if series.dtype.kind in 'iuf':
+                        if missing_count == len(series):
+                            profile.update({'min_value': None, 'max_value': None, 'mean_value': None, 'std_dev': None,
+                                            'outliers': {'count': 0, 'values': []}})
+                            if precision_loss is not None:
+                                profile['precision_loss'] = precision_loss
+                        else:
+                            numeric_columns.append((column, series, precision_loss))
+                    elif pd.api.types.is_numeric_dtype(series):
+                        profiles[column] = self._profile_column(df, column)
+                    elif pd.api.types.is_string_dtype(series):
+                        string_columns.append((column, series))
+        
+        # Bound the float64 copy: a block holds as many columns as fit in STATS_BLOCK_BYTES
+        per_block = max(1, self.STATS_BLOCK_BYTES // max(len(df) * 8, 1))
+        with perf.stage('numeric blocks'):
+            for start in range(0, len(numeric_columns), per_block):
+                self._numeric_block_fields(numeric_columns[start:start + per_block], profiles)
+        with perf.stage('string lengths'):
+            for start in range(0, len(string_columns), per_block):
+                self._string_length_fields(string_columns[start:start + per_block], profiles)
+        return profiles
+    
+    @staticmethod
+    def _numeric_block_fields(columns: List[Tuple[str, pd.Series, Any]], profiles: Dict[str, Dict[str, Any]]):
+        """min/max/mean/std and IQR outliers of several numeric columns from one 2D block
+        
+        The block is column-major so every reduction runs over contiguous memory in the same order as
+        the pandas Series reductions, which keeps the results bit-identical to _profile_column.
+        """
+        block = np.empty((len(columns[0][1]), len(columns)), dtype=np.float64, order='F')
+        for index, (_, series, _) in enumerate(columns):
+            block[:, index] = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        null_mask = np.isnan(block)
+        counts = len(block) - null_mask.sum(axis=0)
+        
+        # Same two-pass formulas as pandas' nanmean/nanvar: NULLs count as zero in the sums
+        filled = np.where(null_mask, 0.0, block)
+        means = filled.sum(axis=0) / counts
+        squares = (means - filled) ** 2
+        squares[null_mask] = 0.0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variances = np.where(counts > 1, squares.sum(axis=0) / (counts - 1), np.nan)
+        del filled, squares
+        
+        minimums = np.nanmin(block, axis=0)
+        maximums = np.nanmax(block, axis=0)
+        q1, q3 = np.nanpercentile(block, [25, 75], axis=0)
+        iqr = q3 - q1
+        outlier_mask = (block < q1 - 1.5 * iqr) | (block > q3 + 1.5 * iqr)
+        outlier_counts = outlier_mask.sum(axis=0)
+        
+        for index, (column, series, precision_loss) in enumerate(columns):
+            outliers = series[outlier_mask[:, index]] if outlier_counts[index] else series.iloc[:0]
+            profiles[column].update({
+                'min_value': float(minimums[index]),
+                'max_value': float(maximums[index]),
+                'mean_value': float(means[index]),
+                'std_dev': float(np.sqrt(variances[index])),
+                'outliers': {
+                    'count': int(outlier_counts[index]),
+                    'values': outliers.tolist()[:10]  # Limit to first 10 outliers
+                }
+            })
+            if precision_loss is not None:
+                profiles[column]['precision_loss'] = precision_loss
+    
+    @staticmethod
+    def _string_length_fields(columns: List[Tuple[str, pd.Series]], profiles: Dict[str, Dict[str, Any]]):
+        """avg/max/min length of all string columns from a single str.len() pass"""
+        rows = len(columns[0][1])
+        values = np.concatenate([series.to_numpy(dtype=object) for _, series in columns])
+        lengths = pd.Series(values, dtype=object).str.len().to_numpy(dtype=np.float64, na_value=np.nan)
+        lengths = lengths.reshape((rows, len(columns)), order='F')
+        null_mask = np.isnan(lengths)
+        counts = rows - null_mask.sum(axis=0)
+        totals = np.where(null_mask, 0.0, lengths).sum(axis=0)
+        maximums = np.where(null_mask, -np.inf, lengths).max(axis=0, initial=-np.inf)
+        minimums = np.where(null_mask, np.inf, lengths).min(axis=0, initial=np.inf)
+        for index, (column, _) in enumerate(columns):
+            if not counts[index]:
+                profiles[column].update({'avg_length': None, 'max_length': None, 'min_length': None})
+                continue
+            profiles[column].update({
+                'avg_length': float(totals[index] / counts[index]),
+                'max_length': int(maximums[index]),
+                'min_length': int(minimums[index])
+            })
+    
+    def _profile_column(self, df: pd.DataFrame, column: str) -> Dict[str, Any]:
+        """Profile individual column"""
+        series = legacy_column(df[column])
+        precision_loss = None
+        if is_decimal_series(series):
+            series, precision_loss = decimal_to_float(series)
+        
+        profile = {
+            'data_type': str(series.dtype),
+            **self._distinct_fields(series),
+            'missing_values': int(series.isna().sum()),
+            'missing_percentage': round((series.isna().sum() / len(series)) * 100, 2)
+        }
+        
+        if pd.api.types.is_numeric_dtype(series):
+            profile.update({
+                'min_value': float(series.min()) if not series.isna().all() else None,
+                'max_value': float(series.max()) if not series.isna().all() else None,
+                'mean_value': float(series.mean()) if not series.isna().all() else None,
+                'std_dev': float(series.std()) if not series.isna().all() else None,
+                'outliers': self._detect_outliers(series)
+            })
+            if precision_loss is not None:
+                profile['precision_loss'] = precision_loss
+        elif pd.api.types.is_string_dtype(series):
+            profile.update({
+                'avg_length': float(series.str.len().mean()) if not series.isna().all() else None,
+                'max_length': int(series.str.len().max()) if not series.isna().all() else None,
+                'min_length': int(series.str.len().min()) if not series.isna().all() else None
+            })
+        
+        return profile
+    
+    def _distinct_fields(self, series: pd.Series) -> Dict[str, Any]:
+        """unique_values for an in-memory column, exact unless a sketch was requested"""
+        if self.distinct_mode == 'exact' or (self.distinct_mode == 'auto' and len(series) <= self.exact_distinct_limit):
+            return {'unique_values': int(series.nunique())}
+        counter = DistinctCounter(self.distinct_mode, self.hll_precision, self.exact_distinct_limit)
+        counter.update(series.dropna())
+        return counter.profile_fields()
+    
+    def _detect_outliers(self, series: pd.Series) -> Dict[str, Any]:
+        """Detect outliers using IQR method"""
+        if series.isna().all():
+            return {'count': 0, 'values': []}
+        
+        Q1 = series.quantile(0.25)
+        Q3 = series.quantile(0.75)
+        IQR = Q3 - Q1
+        lower_bound = Q1 - 1.5 * IQR
+        upper_bound = Q3 + 1.5 * IQR
+        
+        outliers = series[(series < lower_bound) | (series > upper_bound)]
+        
+        return {
+            'count': len(outliers),
+            'values': outliers.tolist()[:10]  # Limit to first 10 outliers
+        }
+    
+    def _detect_inconsistencies(self, df: pd.DataFrame, columns: List[str] = None) -> Dict[str, Any]:
+        """Detect data inconsistencies"""
+        inconsistencies = {}
+        
+        perf = current_recorder()
+        with perf.stage('inconsistencies'):
+            for column in (df.columns if columns is None else columns):
+                series = df[column]
+                if self._is_string_column(series):
+                    with perf.column(column, len(df)):
+                        # Check for inconsistent formatting
+                        non_null_values = series.dropna()
+                        if len(non_null_values) > 0:
+                            mixed_case_mask, whitespace_mask = inconsistency_masks(non_null_values)
+                            
+                            # Case inconsistencies
+                            mixed_case = non_null_values[mixed_case_mask]
+                            
+                            if len(mixed_case) > 0:
+                                inconsistencies[f'{column}_case_inconsistency'] = {
+                                    'type': 'mixed_case',
+                                    'count': len(mixed_case),
+                                    'examples': mixed_case.head(5).tolist()
+                                }
+                            
+                            # Whitespace inconsistencies
+                            whitespace_issues = non_null_values[whitespace_mask]
+                            
+                            if len(whitespace_issues) > 0:
+                                inconsistencies[f'{column}_whitespace_inconsistency'] = {
+                                    'type': 'whitespace',
+                                    'count': len(whitespace_issues),
+                                    'examples': whitespace_issues.head(5).tolist()
+                                }
+        
+        return inconsistencies
+    
+    @staticmethod
+    def _is_string_column(series: pd.Series) -> bool:
+        """is_string_dtype of the column as pandas would have inferred it, without materialising that copy"""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return ((STRING_DTYPE_ALLOWS_NULLS or not series.hasnans) and
+                    pd.api.types.is_string_dtype(series.cat.categories.astype(object)))
+        if isinstance(series.dtype, pd.StringDtype):
+            return STRING_DTYPE_ALLOWS_NULLS or not series.hasnans
+        return pd.api.types.is_string_dtype(series)
+    
+    
+    def _profile_table_streaming(self, table_name: str, key_columns: List[str] = None) -> Dict[str, Any]:
+        """Profile a table chunk by chunk with peak memory bounded by the chunk size
+        
+        Only with distinct_mode 'auto'/'approximate' and quantile_mode 'sketch': exact modes keep every
+        distinct value and every numeric value of the table, which is logged as a warning.
+        """
+        perf = current_recorder()
+        self._warn_unbounded_state(table_name)
+        # Before the stream opens: a catalog refresh needs a connection, and a one-connection pool's
+        # only connection is held by the unbuffered cursor until the scan ends
+        with perf.stage('schema'):
+            schema = self.db.get_table_schema(table_name)
+        query = f"SELECT * FROM {quote_identifier(table_name)}"
+        chunks, columns = self.db.iter_query(query, chunk_size=self.chunk_size)
+        
+        if chunks is None:
+            return {}
+        
+        accumulator = self.new_accumulator(columns, key_columns, decimal_columns=decimal_columns(schema))
+        try:
+            for rows in perf.iterate('fetch', chunks):
+                with perf.stage('build frame', len(rows)):
+                    chunk = pd.DataFrame(rows, columns=columns)
+                with perf.stage('accumulate', len(chunk)):
+                    accumulator.update(chunk)
+            
+            with perf.stage('finalize'):
+                profile_results = self.profile_from_accumulator(accumulator, table_name)
+            if self.outlier_pass:
+                with perf.stage('outlier pass'):
+                    self._outlier_pass(table_name, accumulator, profile_results)
+        finally:
+            accumulator.duplicates.close()
+        return profile_results
+    
+    def _warn_unbounded_state(self, table_name: str):
+        """Log that a chunked scan with exact distinct counts or quantiles grows with the table"""
+        exact = [option for option, exact in (("distinct_mode='exact'", self.distinct_mode == 'exact'),
+                                              ("quantile_mode='exact'", self.quantile_mode == 'exact')) if exact]
+        if exact:
+            logger.warning(f"Scanning {table_name} in chunks with {' and '.join(exact)} keeps every value in memory; "
+                           f"use distinct_mode='auto' and quantile_mode='sketch' to bound it by the chunk size")
+    
+    def new_accumulator(self, columns: List[str], key_columns: List[str] = None, **overrides) -> TableAccumulator:
+        """Empty table accumulator configured with this profiler's options"""
+        options = dict(key_columns=key_columns, duplicate_memory_budget=self.duplicate_memory_budget,
+                       distinct_mode=self.distinct_mode, hll_precision=self.hll_precision,
+                       exact_distinct_limit=self.exact_distinct_limit,
+                       quantile_mode=self.quantile_mode, sketch_k=self.sketch_k)
+        options.update(overrides)
+        return TableAccumulator(columns, **options)
+    
+    def _profile_table_incremental(self, table_name: str, key_columns: List[str] = None,
+                                   watermark_column: str = None, rebuild: bool = False) -> Dict[str, Any]:
+        """Scan only rows beyond the stored watermark and merge them into the saved accumulators
+        
+        Assumes rows past the watermark are new (append-only tables or an updated_at column);
+        updated rows are counted again rather than replaced.
+        """
+        perf = current_recorder()
+        with perf.stage('schema'):
+            schema = self.db.get_table_schema(table_name)
+        if not schema:
+            return {}
+        columns = [row[0] for row in schema]
+        key_columns = list(key_columns) if key_columns else None
+        
+        source = ProfileHistoryStore.source_name(self.db)
+        state = None
+        if not rebuild:
+            with perf.stage('load state'):
+                state = self.state_store.load(source, table_name)
+        watermark_column = watermark_column or (state or {}).get('watermark_column') or self._detect_watermark_column(schema)
+        if watermark_column is None:
+            report_error(f"No watermark column found for {table_name}; pass an auto-increment or updated_at column")
+            return {}
+        
+        if state and (state['columns'] != columns or state['key_columns'] != key_columns
+                      or state['watermark_column'] != watermark_column
+                      or not hasattr(state['accumulator'], 'decimal_columns')):
+            state = None  # schema or settings changed, so the saved statistics no longer apply
+        
+        if state is None:
+            self.state_store.clear(source, table_name)
+            # Keep the saved state bounded: quantiles and high-cardinality distinct counts use sketches
+            accumulator = self.new_accumulator(
+                columns, key_columns,
+                duplicate_spill_dir=self.state_store.duplicates_dir(source, table_name),
+                decimal_columns=decimal_columns(schema),
+                quantile_mode='sketch',
+                distinct_mode='approximate' if self.distinct_mode == 'approximate' else 'auto'
+            )
+            state = {
+                'columns': columns,
+                'key_columns': key_columns,
+                'watermark_column': watermark_column,
+                'watermark': None,
+                'accumulator': accumulator,
+                'last_full_rebuild': datetime.now().isoformat()
+            }
+        
+        query = f"SELECT * FROM {quote_identifier(table_name)}"
+        params = None
+        if state['watermark'] is not None:
+            query += f" WHERE {quote_identifier(watermark_column)} > %s"
+            params = (state['watermark'],)
+        chunks, result_columns = self.db.iter_query(query, params, chunk_size=self.chunk_size)
+        if chunks is None:
+            return {}
+        
+        accumulator = state['accumulator']
+        rows_scanned = 0
+        for rows in perf.iterate('fetch', chunks):
+            with perf.stage('build frame', len(rows)):
+                chunk = pd.DataFrame(rows, columns=result_columns)
+            with perf.stage('accumulate', len(chunk)):
+                accumulator.update(chunk)
+            rows_scanned += len(chunk)
+            chunk_max = chunk[watermark_column].max()
+            if not pd.isna(chunk_max) and (state['watermark'] is None or chunk_max > state['watermark']):
+                state['watermark'] = self._watermark_value(chunk_max)
+        
+        with perf.stage('finalize'):
+            profile_results = self.profile_from_accumulator(accumulator, table_name)
+        state['last_updated'] = profile_results['timestamp']
+        profile_results['incremental'] = {
+            'watermark_column': watermark_column,
+            'watermark': str(state['watermark']) if state['watermark'] is not None else None,
+            'rows_scanned': rows_scanned,
+            'last_full_rebuild': state['last_full_rebuild'],
+            'last_updated': state['last_updated']
+        }
+        with perf.stage('save state'):
+            self.state_store.save(source, table_name, state)
+        return profile_results
+    
+    def _profile_table_parallel(self, table_name: str, key_columns: List[str] = None) -> Dict[str, Any]:
+        """Scan primary-key ranges on separate connections in worker processes and merge the partial profiles
+        
+        The workers start like BatchProfiler's, from a fork server or spawned, with a worker_copy() of
+        this profiler.
+        """
+        perf = current_recorder()
+        with perf.stage('schema'):
+            schema = self.db.get_table_schema(table_name)
+        if not schema:
+            return {}
+        primary_key = self._integer_primary_key(schema)
+        if primary_key is None:
+            return self._profile_table_streaming(table_name, key_columns)
+        # Size the scan from the catalog's row estimate: a table that fits in a few chunks is not worth
+        # starting one worker per partition for
+        partitions = self.scan_workers
+        estimated_rows = self.db.catalog.estimated_rows(table_name)
+        if estimated_rows:
+            partitions = min(partitions, -(-estimated_rows // self.chunk_size))
+            if partitions <= 1:
+                return self._profile_table_streaming(table_name, key_columns)
+        
+        pk = quote_identifier(primary_key)
+        data, _ = self.db.execute_query(f"SELECT MIN({pk}), MAX({pk}) FROM {quote_identifier(table_name)}")
+        if not data or data[0][0] is None:
+            return self._profile_table_streaming(table_name, key_columns)
+        ranges = self._key_ranges(int(data[0][0]), int(data[0][1]), partitions)
+        self._warn_unbounded_state(table_name)
+        
+        context = _worker_context()
+        results = context.Queue()
+        barrier = context.Barrier(len(ranges) + 1) if self.consistent_snapshot else None
+        params = self.db.connection_params()
+        worker_profiler = self.worker_copy()
+        workers = [
+            context.Process(
+                target=_partition_worker,
+                args=(worker_profiler, params, table_name, key_columns, decimal_columns(schema), primary_key, key_range, index,
+                      barrier, results),
+                daemon=True
+            )
+            for index, key_range in enumerate(ranges)
+        ]
+        
+        snapshot = False
+        with perf.stage('start workers'):
+            if barrier is None:
+                for worker in workers:
+                    worker.start()
+            else:
+                # Block writers while every worker opens its snapshot, so all partitions see the same data.
+                # LOCK and UNLOCK must run in the same MySQL session, hence the pinned connection.
+                with self.db.session():
+                    locked = self.db.execute(f"LOCK TABLES {quote_identifier(table_name)} READ")
+                    for worker in workers:
+                        worker.start()
+                    try:
+                        barrier.wait(timeout=60)
+                        snapshot = locked
+                    except threading.BrokenBarrierError:
+                        pass
+                    finally:
+                        if locked:
+                            self.db.execute("UNLOCK TABLES")
+        
+        partials = {}
+        errors = []
+        with perf.stage('scan partitions'):
+            try:
+                while len(partials) + len(errors) < len(workers):
+                    result = _next_result(results, workers)
+                    if result is None:
+                        errors.append("Worker process exited before finishing its partition")
+                        break
+                    index, accumulator, error = result
+                    if error:
+                        errors.append(error)
+                    else:
+                        partials[index] = accumulator
+            finally:
+                for worker in workers:
+                    if worker.is_alive():
+                        worker.terminate()
+                    worker.join()
+        
+        if errors:
+            for accumulator in partials.values():
+                accumulator.duplicates.close()
+            report_error(f"Partitioned scan of {table_name} failed: {errors[0]}")
+            return {}
+        
+        partition_rows = [partials[index].total_rows for index in range(len(ranges))]
+        
+        # Merge in key order so sample values and examples follow the table order
+        merged = partials[0]
+        with perf.stage('merge'):
+            for index in range(1, len(ranges)):
+                merged.merge(partials[index])
+        try:
+            with perf.stage('finalize'):
+                profile_results = self.profile_from_accumulator(merged, table_name)
+        finally:
+            merged.duplicates.close()
+        
+        profile_results['scan'] = {
+            'strategy': 'parallel',
+            'primary_key': primary_key,
+            'consistent_snapshot': snapshot,
+            'partitions': [
+                {'from': lower, 'to': upper, 'rows': partition_rows[index]}
+                for index, (lower, upper) in enumerate(ranges)
+            ]
+        }
+        return profile_results
+    
+    @staticmethod
+    def _integer_primary_key(schema: List[Tuple]) -> str:
+        """Name of a single-column integer primary key, or None"""
+        primary_keys = [row for row in schema if row[3] == 'PRI']
+        if len(primary_keys) == 1 and mysql_base_type(primary_keys[0][1]) in ('tinyint', 'smallint', 'mediumint',
+                                                                               'int', 'integer', 'bigint'):
+            return primary_keys[0][0]
+        return None
+    
+    @staticmethod
+    def _key_ranges(lowest: int, highest: int, partitions: int) -> List[Tuple[int, int]]:
+        """Split [lowest, highest] into up to `partitions` half-open ranges of similar width"""
+        # Integer arithmetic: BIGINT keys above 2**53 would be rounded by a float linspace
+        span = highest + 1 - lowest
+        partitions = max(min(partitions, span), 1)
+        edges = [lowest + span * i // partitions for i in range(partitions + 1)]
+        return list(zip(edges[:-1], edges[1:]))
+    
+    @staticmethod
+    def _detect_watermark_column(schema: List[Tuple]) -> str:
+        """Auto-increment primary key, falling back to an updated_at timestamp column"""
+        for field, _, _, key, _, extra in schema:
+            if key == 'PRI' and 'auto_increment' in str(extra).lower():
+                return field
+        for field, column_type, *_ in schema:
+            if field.lower() == 'updated_at' and mysql_base_type(column_type) in ('datetime', 'timestamp'):
+                return field
+        return None
+    
+    @staticmethod
+    def _watermark_value(value):
+        """Watermark as a plain Python value usable as a query parameter"""
+        if isinstance(value, pd.Timestamp):
+            return value.to_pydatetime()
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+    
+    @staticmethod
+    def _sketch_bounds(sketch: KLLSketch) -> Tuple[float, float]:
+        """IQR outlier bounds from a quantile sketch"""
+        Q1 = sketch.quantile(0.25)
+        Q3 = sketch.quantile(0.75)
+        IQR = Q3 - Q1
+        return Q1 - 1.5 * IQR, Q3 + 1.5 * IQR
+    
+    def _sketch_outliers(self, column_acc: ColumnAccumulator) -> Dict[str, Any]:
+        """Outlier count estimated from the sketch, with examples drawn from the value sample"""
+        sketch = column_acc.quantiles
+        lower_bound, upper_bound = self._sketch_bounds(sketch)
+        below = sketch.rank(lower_bound)
+        above = 1 - sketch.rank(upper_bound, inclusive=True)
+        
+        sample = column_acc.sample.values
+        examples = sample[(sample < lower_bound) | (sample > upper_bound)][:10]
+        
+        return {
+            'count': int(round(sketch.n * (below + above))),
+            'values': examples.astype(column_acc.final_dtype()).tolist(),
+            'approximate': not sketch.is_exact
+        }
+    
+    def _outlier_pass(self, table_name: str, accumulator: TableAccumulator, profile_results: Dict[str, Any]):
+        """Second streaming pass counting outliers exactly against the sketch IQR bounds"""
+        bounds = {
+            column: self._sketch_bounds(column_acc.quantiles)
+            for column, column_acc in accumulator.column_accumulators.items()
+            if column_acc.quantiles is not None and column_acc.final_kind() == 'numeric'
+        }
+        if not bounds:
+            return
+        
+        query = f"SELECT {', '.join(quote_identifier(column) for column in bounds)} FROM {quote_identifier(table_name)}"
+        chunks, columns = self.db.iter_query(query, chunk_size=self.chunk_size)
+        if chunks is None:
+            return
+        
+        counts = dict.fromkeys(bounds, 0)
+        examples = {column: [] for column in bounds}
+        for rows in chunks:
+            chunk = accumulator.convert_decimals(pd.DataFrame(rows, columns=columns))
+            for column, (lower_bound, upper_bound) in bounds.items():
+                series = pd.to_numeric(chunk[column], errors='coerce')
+                outliers = series[(series < lower_bound) | (series > upper_bound)]
+                counts[column] += len(outliers)
+                needed = 10 - len(examples[column])
+                if needed > 0:
+                    final_dtype = accumulator.column_accumulators[column].final_dtype()
+                    examples[column].extend(outliers.head(needed).astype(final_dtype).tolist())
+        
+        for column in bounds:
+            profile_results['column_profiles'][column]['outliers'] = {
+                'count': counts[column],
+                'values': examples[column]
+            }
+    
+    def profile_from_accumulator(self, accumulator: TableAccumulator, table_name: str) -> Dict[str, Any]:
+        """Build profile results from merged chunk statistics"""
+        total_rows = accumulator.total_rows
+        profile_results = {
+            'table_name': table_name,
+            'timestamp': datetime.now().isoformat(),
+            'total_rows': total_rows,
+            'total_columns': len(accumulator.columns),
+            'column_profiles': {},
+            'data_quality_issues': {
+                'missing_values': {},
+                'duplicates': accumulator.duplicate_count(),
+                'duplicate_keys': {
+                    'columns': accumulator.duplicates.key_columns or list(accumulator.columns),
+                    'examples': accumulator.duplicates.sample_keys
+                },
+                'inconsistencies': {}
+            }
+        }
+        inconsistencies = profile_results['data_quality_issues']['inconsistencies']
+        
+        for column in accumulator.columns:
+            column_acc = accumulator.column_accumulators[column]
+            profile_results['column_profiles'][column] = self._accumulated_column_profile(column_acc)
+            if column in accumulator.precision_loss and column_acc.final_kind() == 'numeric':
+                profile_results['column_profiles'][column]['precision_loss'] = accumulator.precision_loss[column]
+            
+            if column_acc.nulls > 0:
+                profile_results['data_quality_issues']['missing_values'][column] = {
+                    'count': column_acc.nulls,
+                    'percentage': _percentage(column_acc.nulls, total_rows)
+                }
+            
+            if column_acc.final_kind() == 'string':
+                if column_acc.mixed_case_count > 0:
+                    inconsistencies[f'{column}_case_inconsistency'] = {
+                        'type': 'mixed_case',
+                        'count': column_acc.mixed_case_count,
+                        'examples': column_acc.mixed_case_examples
+                    }
+                if column_acc.whitespace_count > 0:
+                    inconsistencies[f'{column}_whitespace_inconsistency'] = {
+                        'type': 'whitespace',
+                        'count': column_acc.whitespace_count,
+                        'examples': column_acc.whitespace_examples
+                    }
+        
+        return profile_results
+    
+    def _accumulated_column_profile(self, column_acc: ColumnAccumulator) -> Dict[str, Any]:
+        """Column profile with the same keys as _profile_column, from an accumulator"""
+        kind = column_acc.final_kind()
+        all_missing = column_acc.kind is None
+        
+        profile = {
+            'data_type': str(column_acc.final_dtype()),
+            **column_acc.distinct.profile_fields(),
+            'missing_values': column_acc.nulls,
+            'missing_percentage': _percentage(column_acc.nulls, column_acc.count) if column_acc.count else float('nan')
+        }
+        
+        if kind == 'numeric':
+            if column_acc.quantiles is not None:
+                outliers = self._sketch_outliers(column_acc)
+            else:
+                values = np.concatenate(column_acc.values).astype(column_acc.final_dtype())
+                outliers = self._detect_outliers(pd.Series(values))
+            profile.update({
+                'min_value': float(column_acc.min_value),
+                'max_value': float(column_acc.max_value),
+                'mean_value': float(column_acc.mean),
+                'std_dev': float(np.sqrt(column_acc.m2 / (column_acc.n - 1))) if column_acc.n > 1 else float('nan'),
+                'outliers': outliers
+            })
+        elif kind == 'string':
+            profile.update({
+                'avg_length': column_acc.length_sum / column_acc.length_count if not all_missing else None,
+                'max_length': column_acc.max_length if not all_missing else None,
+                'min_length': column_acc.min_length if not all_missing else None
+            })
+        
+        return profile
+
+def _worker_context():
+    """Multiprocessing context for worker processes: forkserver where available, else spawn
+    
+    Workers are never forked from the calling process, so they inherit none of its other threads'
+    locks (the Streamlit server's, a logging handler's, a connection pool's) nor its report_error
+    handler; their arguments are pickled instead.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        # Import the profiling core once in the fork server rather than in every worker
+        context.set_forkserver_preload(['dq_monitor.profiler'])
+        return context
+    return multiprocessing.get_context('spawn')
+
+def _batch_worker(profiler: DataQualityProfiler, connection_params: Dict[str, Any], catalog: Tuple[Dict, float],
+                  strategy: str, tasks, results):
+    """Worker process: profile tables from the task queue on a private connection"""
+    db = DatabaseConnection(**connection_params, pool_size=1)
+    connected = db.connect()
+    # Reuse the parent's metadata instead of reloading it in every worker
+    db.catalog.tables, db.catalog.loaded_at = catalog
+    profiler.db = db
+    
+    while True:
+        table_name = tasks.get()
+        if table_name is None:
+            break
+        if not connected:
+            results.put((table_name, None, "Database connection failed"))
+            continue
+        try:
+            results.put((table_name, profiler.profile_table(table_name, strategy=strategy), None))
+        except Exception as e:
+            results.put((table_name, None, str(e)))
+    
+    db.disconnect()
+
+def _scan_range(profiler: DataQualityProfiler, db: DatabaseConnection, table_name: str, key_columns: List[str],
+                decimal_specs: Dict[str, Tuple[int, int]], primary_key: str, key_range: Tuple[int, int]) -> TableAccumulator:
+    """Fold the rows of one half-open primary-key range into a new TableAccumulator"""
+    pk = quote_identifier(primary_key)
+    query = f"SELECT * FROM {quote_identifier(table_name)} WHERE {pk} >= %s AND {pk} < %s"
+    chunks, columns = db.iter_query(query, key_range, chunk_size=profiler.chunk_size)
+    if chunks is None:
+        raise RuntimeError(f"Query for partition {key_range} failed")
+    
+    accumulator = profiler.new_accumulator(columns, key_columns, decimal_columns=decimal_specs)
+    for rows in chunks:
+        accumulator.update(pd.DataFrame(rows, columns=columns))
+    return accumulator
+
+def _partition_worker(profiler: DataQualityProfiler, connection_params: Dict[str, Any], table_name: str,
+                      key_columns: List[str], decimal_specs: Dict[str, Tuple[int, int]], primary_key: str,
+                      key_range: Tuple[int, int], index: int, barrier, results):
+    """Worker process: fold one primary-key range into a TableAccumulator on a private connection"""
+    db = DatabaseConnection(**connection_params, pool_size=1)
+    try:
+        if not db.connect():
+            raise RuntimeError("Database connection failed")
+        # The session pins the single connection so the snapshot transaction covers the scan
+        with db.session() as connection:
+            if barrier is not None:
+                connection.start_transaction(consistent_snapshot=True, readonly=True)
+                barrier.wait(timeout=60)
+            
+            accumulator = _scan_range(profiler, db, table_name, key_columns, decimal_specs, primary_key, key_range)
+        accumulator.duplicates.detach()
+        results.put((index, accumulator, None))
+    except Exception as e:
+        if barrier is not None:
+            barrier.abort()
+        results.put((index, None, str(e)))
+    finally:
+        db.disconnect()
+
+def _next_result(results, workers, timeout: float = 1):
+    """Next item the workers put on results, or None once they have all exited and it is drained"""
+    while True:
+        try:
+            return results.get(timeout=timeout)
+        except queue.Empty:
+            if any(worker.is_alive() for worker in workers):
+                continue
+        # A worker can put its last result and exit just after get() timed out; an exited worker has
+        # flushed its puts, so one more non-blocking get() sees them
+        try:
+            return results.get_nowait()
+        except queue.Empty:
+            return None
+
+class BatchProfiler:
+    """Profile many tables concurrently in worker processes, each with its own connection
+    
+    Workers start from a fork server (or are spawned), never forked from this process, so they are
+    safe to start from a multi-threaded one such as the Streamlit server. They receive a pickled
+    worker_copy() of the profiler. max_workers=1 profiles serially in-process.
+    """
+    
+    # Worker slots per (host, port, database), shared by every batch run in this server process
+    _database_slots = {}
+    _slots_lock = threading.Lock()
+    
+    def __init__(self, profiler: DataQualityProfiler, max_workers: int = None, max_workers_per_database: int = 8):
+        self.profiler = profiler
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_workers_per_database = max_workers_per_database
+    
+    def profile_tables(self, tables: List[str], strategy: str = 'streaming') -> Iterator[Tuple[str, Dict[str, Any], str]]:
+        """Yield (table_name, profile_results, error) as each table finishes"""
+        if not tables:
+            return
+        # Tables unchanged since they were last profiled are answered from the cache without a worker
+        fingerprints = {}
+        if self.profiler.profile_cache is not None:
+            stale = []
+            for table_name in tables:
+                fingerprint, cached = self.profiler.cached_profile(table_name, strategy)
+                if cached is not None and self.profiler.instrumentation == 'off':
+                    yield table_name, cached, None
+                    continue
+                fingerprints[table_name] = fingerprint
+                stale.append(table_name)
+            tables = stale
+            if not tables:
+                return
+        if self.max_workers <= 1:
+            for table_name in tables:
+                try:
+                    yield table_name, self.profiler.profile_table(table_name, strategy=strategy), None
+                except Exception as e:
+                    yield table_name, None, str(e)
+            return
+        
+        params = self.profiler.db.connection_params()
+        slots = self._acquire_slots(params, min(self.max_workers, len(tables)))
+        context = _worker_context()
+        tasks = context.Queue()
+        results = context.Queue()
+        for table_name in tables:
+            tasks.put(table_name)
+        for _ in range(slots):
+            tasks.put(None)
+        
+        catalog = (self.profiler.db.catalog.tables, self.profiler.db.catalog.loaded_at)
+        workers = [
+            context.Process(target=_batch_worker, args=(self.profiler.worker_copy(), params, catalog, strategy,
+                                                        tasks, results), daemon=True)
+            for _ in range(slots)
+        ]
+        try:
+            for worker in workers:
+                worker.start()
+            
+            pending = set(tables)
+            while pending:
+                result = _next_result(results, workers)
+                if result is None:
+                    break
+                table_name, profile_results, error = result
+                pending.discard(table_name)
+                if profile_results and 'sample' not in profile_results and self.profiler.history_store is not None:
+                    self.profiler.history_store.record(ProfileHistoryStore.source_name(self.profiler.db), profile_results)
+                if profile_results and fingerprints.get(table_name) is not None:
+                    self.profiler.profile_cache.put(self.profiler.cache_key(table_name, strategy),
+                                                    fingerprints[table_name], self.profiler.cacheable(profile_results))
+                yield table_name, profile_results, error
+            
+            for table_name in pending:
+                yield table_name, None, "Worker process exited before profiling the table"
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+                worker.join()
+            self._release_slots(params, slots)
+    
+    def _acquire_slots(self, params: Dict[str, Any], wanted: int) -> int:
+        """Reserve up to `wanted` worker slots for this database, waiting for at least one"""
+        key = (params['host'], params['port'], params['database'])
+        with self._slots_lock:
+            semaphore = self._database_slots.setdefault(key, threading.BoundedSemaphore(self.max_workers_per_database))
+        semaphore.acquire()
+        slots = 1
+        while slots < wanted and semaphore.acquire(blocking=False):
+            slots += 1
+        return slots
+    
+    def _release_slots(self, params: Dict[str, Any], slots: int):
+        semaphore = self._database_slots[(params['host'], params['port'], params['database'])]
+        for _ in range(slots):
+            semaphore.release()
@@ -0,0 +1,294 @@
+"""MySQL column types and the pandas dtypes the profiling paths store and report them as"""
+
+import decimal
+import importlib.util
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# pyarrow is optional; modules that build Arrow arrays import it when they first need it
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+# Whether pandas still treats an object column containing NULLs as a string column
+STRING_DTYPE_ALLOWS_NULLS = pd.api.types.is_string_dtype(pd.Series(['', None], dtype=object))
+
+NUMERIC_MYSQL_TYPES = ('tinyint', 'smallint', 'mediumint', 'int', 'integer', 'bigint',
+                       'float', 'double', 'real', 'decimal', 'numeric', 'year')
+STRING_MYSQL_TYPES = ('char', 'varchar', 'tinytext', 'text', 'mediumtext', 'longtext', 'enum', 'set')
+
+def quote_identifier(name: str) -> str:
+    """Backtick-quote a MySQL identifier"""
+    return '`' + str(name).replace('`', '``') + '`'
+
+def mysql_base_type(column_type) -> str:
+    """Base type name of a DESCRIBE type such as 'int(11) unsigned' -> 'int'"""
+    if isinstance(column_type, bytes):
+        column_type = column_type.decode()
+    return column_type.split('(')[0].split()[0].lower()
+
+def mysql_type_kind(column_type) -> str:
+    """Classify a MySQL column type as 'numeric', 'string' or 'other'"""
+    base_type = mysql_base_type(column_type)
+    if base_type in NUMERIC_MYSQL_TYPES:
+        return 'numeric'
+    if base_type in STRING_MYSQL_TYPES:
+        return 'string'
+    return 'other'
+
+def mysql_type_to_dtype(column_type, has_nulls: bool) -> str:
+    """pandas dtype the in-memory path would infer for a MySQL column type"""
+    base_type = mysql_base_type(column_type)
+    if base_type in ('float', 'double', 'real', 'decimal', 'numeric'):
+        return 'float64'
+    if base_type in NUMERIC_MYSQL_TYPES:
+        return 'float64' if has_nulls else 'int64'
+    if base_type in ('datetime', 'timestamp'):
+        return 'datetime64[ns]'
+    return 'object'
+
+# float64 reproduces any decimal with at most this many significant digits exactly
+FLOAT64_EXACT_DIGITS = 15
+
+def mysql_decimal_spec(column_type) -> Tuple[int, int]:
+    """(precision, scale) of a DECIMAL/NUMERIC column type, or None for any other type"""
+    if mysql_base_type(column_type) not in ('decimal', 'numeric'):
+        return None
+    if isinstance(column_type, bytes):
+        column_type = column_type.decode()
+    arguments = [int(part) for part in column_type.partition('(')[2].partition(')')[0].split(',') if part.strip()]
+    return (arguments[0] if arguments else 10), (arguments[1] if len(arguments) > 1 else 0)
+
+def decimal_columns(schema: List[Tuple]) -> Dict[str, Tuple[int, int]]:
+    """{column: (precision, scale)} for the DECIMAL columns of a DESCRIBE-style schema"""
+    specs = {}
+    for row in schema or []:
+        spec = mysql_decimal_spec(row[1])
+        if spec is not None:
+            specs[row[0]] = spec
+    return specs
+
+def decimal_to_float(series: pd.Series, precision: int = None, scale: int = None) -> Tuple[pd.Series, bool]:
+    """decimal.Decimal values as a float64 Series, and whether any value needed more digits than float64 keeps
+    
+    With a known DECIMAL(precision, scale) of at most 18 digits the values are first scaled to exact int64
+    integers and divided by 10**scale; otherwise every value is converted with float(). Scaled integers
+    below 2**53 convert exactly, so the division is the only rounding and matches float(value). Beyond
+    that they are rounded twice and may land one unit in the last place away, but those values are
+    already past FLOAT64_EXACT_DIGITS and reported as lossy.
+    """
+    null_mask = series.isna().to_numpy()
+    non_null = series.to_numpy(dtype=object)[~null_mask]
+    result = np.full(len(series), np.nan)
+    if not len(non_null):
+        return pd.Series(result, index=series.index, name=series.name), False
+    
+    try:
+        if precision is not None and scale is not None and precision <= 18:
+            unscaled = (non_null * (10 ** scale)).astype(np.int64)
+            result[~null_mask] = unscaled / 10 ** scale
+            lossy = int(np.abs(unscaled).max()) >= 10 ** FLOAT64_EXACT_DIGITS
+        else:
+            result[~null_mask] = non_null.astype(np.float64)
+            if scale is not None:
+                lossy = bool(np.abs(result[~null_mask]).max() * 10 ** scale >= 10 ** FLOAT64_EXACT_DIGITS)
+            else:
+                lossy = any(len(value.as_tuple().digits) > FLOAT64_EXACT_DIGITS for value in non_null)
+    except (TypeError, ValueError, AttributeError, decimal.InvalidOperation):
+        # Not Decimal objects after all (e.g. strings from a view); fall back to a lenient parse
+        return pd.to_numeric(series, errors='coerce').astype(np.float64), False
+    return pd.Series(result, index=series.index, name=series.name), lossy
+
+def float_precision_loss(values: pd.Series, scale: int) -> bool:
+    """precision_loss for DECIMAL(p, scale) values that already arrived as float64"""
+    if not pd.api.types.is_float_dtype(values) or values.isna().all():
+        return False
+    return bool(np.nanmax(np.abs(values.to_numpy())) * 10 ** scale >= 10 ** FLOAT64_EXACT_DIGITS)
+
+def is_decimal_series(series: pd.Series) -> bool:
+    """Whether an object Series holds decimal.Decimal values"""
+    if series.dtype != object:
+        return False
+    present = series.notna().to_numpy()
+    return bool(present.any()) and isinstance(series.iat[int(present.argmax())], decimal.Decimal)
+
+# Storage width in bits of each MySQL integer type, used to pick compact pandas dtypes
+INTEGER_BITS = {'tinyint': 8, 'smallint': 16, 'mediumint': 32, 'int': 32, 'integer': 32, 'bigint': 64, 'year': 16}
+
+def _fitting_integer_dtype(series: pd.Series, bits: int, unsigned: bool) -> str:
+    """Smallest integer dtype of at least `bits` bits holding every value, or None"""
+    low, high = series.min(), series.max()
+    for width in (8, 16, 32, 64):
+        if width < bits:
+            continue
+        for dtype in ('int' + str(width), 'uint' + str(width)) if unsigned else ('int' + str(width),):
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                return dtype
+    return None
+
+def compact_column(series: pd.Series, column_type, category_ratio: float = 0.5) -> pd.Series:
+    """Re-store an inferred column in the most compact dtype its MySQL type allows
+    
+    Integers become (nullable) Int8/16/32/64, FLOAT becomes float32, ENUM/SET and low-cardinality text
+    become category and other text becomes Arrow-backed strings. Anything else is returned unchanged.
+    """
+    if not len(series) or series.isna().all():
+        return series
+    base_type = mysql_base_type(column_type)
+    has_nulls = bool(series.isna().any())
+    
+    if base_type in INTEGER_BITS and pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        non_null = series.dropna()
+        if not (non_null == np.floor(non_null)).all():
+            return series
+        dtype = _fitting_integer_dtype(non_null, INTEGER_BITS[base_type], 'unsigned' in str(column_type).lower())
+        if dtype is None:
+            return series
+        return series.astype(dtype.capitalize().replace('Uint', 'UInt') if has_nulls else dtype)
+    
+    if base_type == 'float' and series.dtype == np.float64:
+        # MySQL FLOAT is single precision on the server, so float32 holds every stored value exactly
+        return series.astype(np.float32)
+    
+    if base_type in STRING_MYSQL_TYPES and (series.dtype == object or isinstance(series.dtype, pd.StringDtype)):
+        if series.dtype == object and not all(isinstance(value, str) for value in series.dropna()):
+            return series
+        codes, uniques = pd.factorize(series)
+        if base_type in ('enum', 'set') or len(uniques) <= category_ratio * len(series):
+            return pd.Series(pd.Categorical.from_codes(codes, categories=uniques), index=series.index, name=series.name)
+        if HAS_PYARROW and series.dtype == object:
+            return series.astype('string[pyarrow]')
+    return series
+
+def legacy_column(series: pd.Series, has_nulls: bool = None) -> pd.Series:
+    """The column as pandas would have inferred it from the raw rows (inverse of compact_column)
+    
+    Profiling statistics are computed on this view, one column at a time, so compact storage never
+    changes a reported value or data_type. Pass has_nulls for a slice of a column that has NULLs elsewhere.
+    """
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype) or (isinstance(dtype, pd.StringDtype)):
+        return pd.Series(series.to_numpy(dtype=object, na_value=None), index=series.index, name=series.name)
+    if pd.api.types.is_extension_array_dtype(dtype) and pd.api.types.is_integer_dtype(dtype):
+        if series.isna().any() if has_nulls is None else has_nulls:
+            return pd.Series(series.to_numpy(dtype=np.float64, na_value=np.nan), index=series.index, name=series.name)
+        return series.astype(np.uint64 if str(dtype) == 'UInt64' else np.int64)
+    if dtype in (np.int8, np.int16, np.int32, np.uint8, np.uint16, np.uint32):
+        return series.astype(np.int64)
+    if dtype == np.float32:
+        # The driver parses MySQL's shortest decimal text for a FLOAT; do the same instead of widening bits
+        return pd.Series(shortest_decimal_float64(series.to_numpy()), index=series.index, name=series.name)
+    return series
+
+def shortest_decimal_float64(values: np.ndarray) -> np.ndarray:
+    """float32 values as the float64 of their shortest round-tripping decimal (what float(str(v)) gives)
+    
+    Vectorised: each value is rounded to 1, 2, ... 9 significant digits until the rounded value maps
+    back to the same float32. Rounding divides or multiplies by an exact power of ten, so values whose
+    digits need a power above 1e22 (|v| beyond about 1e-14 .. 1e22) go through the decimal text instead.
+    """
+    with np.errstate(invalid='ignore'):
+        result = values.astype(np.float64)
+    exponents = np.zeros(len(result), dtype=np.int64)
+    nonzero = np.isfinite(result) & (result != 0)
+    exponents[nonzero] = np.floor(np.log10(np.abs(result[nonzero])))
+    in_range = nonzero & (exponents >= -14) & (exponents <= 22)
+    pending = np.flatnonzero(in_range)
+    exponents = exponents[pending]
+    for digits in range(1, 10):
+        if not len(pending):
+            break
+        wide = result[pending]
+        shift = digits - 1 - exponents
+        scale = 10.0 ** np.abs(shift)
+        rounded = np.where(shift >= 0, np.round(wide * scale) / scale, np.round(wide / scale) * scale)
+        matched = rounded.astype(np.float32) == values[pending]
+        result[pending[matched]] = rounded[matched]
+        pending, exponents = pending[~matched], exponents[~matched]
+    textual = np.concatenate([pending, np.flatnonzero(nonzero & ~in_range)])
+    if len(textual):
+        result[textual] = values[textual].astype(str).astype(np.float64)
+    return result
+
+# Rough in-process sizes used to plan a scan: Python object per fetched cell (CPython 3.11, without the
+# tuple slot) and in-frame bytes per value after compaction, for fixed-width MySQL types
+CELL_BYTES = {
+    'integer': (28, 8), 'float': (24, 8), 'decimal': (104, 8), 'date': (32, 40),
+    'datetime': (48, 8), 'time': (48, 8), 'text': (49, 8), 'other': (33, 8)
+}
+# Payload bytes MySQL stores for a value of each fixed-width kind, and the default for unsized text
+STORED_BYTES = {'integer': 4, 'float': 8, 'decimal': 8, 'date': 3, 'datetime': 8, 'time': 3, 'other': 32}
+UNSIZED_TEXT_BYTES = 256
+
+def _cell_kind(column_type) -> str:
+    base_type = mysql_base_type(column_type)
+    if base_type in INTEGER_BITS:
+        return 'integer'
+    if base_type in ('float', 'double', 'real'):
+        return 'float'
+    if base_type in ('decimal', 'numeric'):
+        return 'decimal'
+    if base_type == 'date':
+        return 'date'
+    if base_type in ('datetime', 'timestamp'):
+        return 'datetime'
+    if base_type == 'time':
+        return 'time'
+    if base_type in STRING_MYSQL_TYPES:
+        return 'text'
+    return 'other'
+
+def _declared_text_width(column_type) -> float:
+    """Expected width of a text value from its declared type: half the length of a (VAR)CHAR"""
+    if isinstance(column_type, bytes):
+        column_type = column_type.decode()
+    base_type = mysql_base_type(column_type)
+    length = column_type.partition('(')[2].partition(')')[0].strip()
+    if base_type in ('char', 'varchar') and length.isdigit():
+        return int(length) / 2
+    if base_type in ('enum', 'set'):
+        return 16
+    return UNSIZED_TEXT_BYTES
+
+def estimate_row_bytes(schema: List[Tuple], avg_row_length: int = 0) -> Dict[str, float]:
+    """Estimated bytes per row: fetched as a Python tuple ('row'), held in a DataFrame ('frame') and
+    stored by MySQL ('stored')
+    
+    Text widths come from the table's AVG_ROW_LENGTH when MySQL reports one, spread over the text
+    columns after the fixed-width ones, and from the declared length otherwise.
+    """
+    kinds = [_cell_kind(row[1]) for row in schema]
+    text_columns = [row for row, kind in zip(schema, kinds) if kind == 'text']
+    fixed_bytes = sum(STORED_BYTES[kind] for kind in kinds if kind != 'text')
+    if text_columns and avg_row_length > fixed_bytes:
+        text_widths = [(avg_row_length - fixed_bytes) / len(text_columns)] * len(text_columns)
+    else:
+        text_widths = [_declared_text_width(row[1]) for row in text_columns]
+    text_widths = iter(text_widths)
+    
+    # A fetched row is a tuple (56-byte header + one pointer per cell) of Python objects
+    row_bytes = 56 + 8 * len(schema)
+    frame_bytes = 0
+    stored_bytes = 0
+    for kind in kinds:
+        object_bytes, value_bytes = CELL_BYTES[kind]
+        if kind == 'text':
+            width = next(text_widths)
+            row_bytes += object_bytes + width
+            frame_bytes += value_bytes + width
+            stored_bytes += width
+        else:
+            row_bytes += object_bytes
+            frame_bytes += value_bytes
+            stored_bytes += STORED_BYTES[kind]
+    return {'row': row_bytes, 'frame': frame_bytes, 'stored': stored_bytes}
+
+
+def format_bytes(size: float) -> str:
+    """Human-readable byte count"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
@@ -0,0 +1,274 @@
+"""Mergeable sketches and sampling statistics for chunked and sampled profiling"""
+
+import base64
+from statistics import NormalDist
+from typing import Dict, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+def _hash_values(values: pd.Series) -> np.ndarray:
+    """Stable 64-bit hashes of non-null values, independent of per-chunk int/float inference
+    
+    Integers hash by their 64-bit pattern, so BIGINT keys above 2**53 stay distinct; integral floats
+    (an integer column that had NULLs in this chunk) hash as the same integers.
+    """
+    if pd.api.types.is_bool_dtype(values) or not pd.api.types.is_numeric_dtype(values):
+        return pd.util.hash_array(values.to_numpy(dtype=object))
+    if pd.api.types.is_integer_dtype(values):
+        if pd.api.types.is_unsigned_integer_dtype(values):
+            return pd.util.hash_array(values.to_numpy(dtype='uint64', na_value=0).view('int64'))
+        return pd.util.hash_array(values.to_numpy(dtype='int64', na_value=0))
+    
+    floats = values.to_numpy(dtype='float64', na_value=np.nan)
+    hashes = pd.util.hash_array(floats)
+    with np.errstate(invalid='ignore'):
+        integral = np.isfinite(floats) & (floats == np.trunc(floats)) & (np.abs(floats) < 2.0 ** 63)
+    hashes[integral] = pd.util.hash_array(floats[integral].astype('int64'))
+    return hashes
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Vectorised int.bit_length() for uint64 arrays"""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, np.frexp(high)[1] + 32, np.frexp(low)[1])
+
+class HyperLogLog:
+    """Mergeable HyperLogLog sketch for approximate distinct counts"""
+    
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+    
+    @property
+    def relative_error(self) -> float:
+        """Standard error of the estimate relative to the true count"""
+        return 1.04 / np.sqrt(len(self.registers))
+    
+    def update(self, values: pd.Series):
+        """Add a Series of non-null values to the sketch"""
+        if len(values) == 0:
+            return
+        hashes = _hash_values(values)
+        remaining_bits = 64 - self.precision
+        index = (hashes >> np.uint64(remaining_bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << remaining_bits) - 1)
+        rank = (remaining_bits - _bit_length(rest) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+    
+    def merge(self, other: 'HyperLogLog'):
+        """Union with a sketch built on another chunk or worker"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+    
+    def estimate(self) -> int:
+        """Estimated number of distinct values"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate while many registers are still empty
+            raw = m * np.log(m / zeros)
+        return int(round(raw))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable form for storing with a profile"""
+        return {
+            'precision': self.precision,
+            'registers': base64.b64encode(self.registers.tobytes()).decode('ascii')
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'HyperLogLog':
+        sketch = cls(data['precision'])
+        sketch.registers = np.frombuffer(base64.b64decode(data['registers']), dtype=np.uint8).copy()
+        return sketch
+
+class DistinctCounter:
+    """Distinct-value counter: exact set, HyperLogLog sketch, or exact until a size limit"""
+    
+    MODES = ('exact', 'approximate', 'auto')
+    
+    def __init__(self, mode: str = 'exact', precision: int = 14, exact_limit: int = 100000):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown distinct counting mode: {mode}")
+        self.mode = mode
+        self.precision = precision
+        self.exact_limit = exact_limit
+        self.values = set() if mode != 'approximate' else None
+        self.sketch = HyperLogLog(precision) if mode == 'approximate' else None
+    
+    @property
+    def is_approximate(self) -> bool:
+        return self.sketch is not None
+    
+    def update(self, non_null: pd.Series):
+        """Add a chunk of non-null values"""
+        if self.sketch is not None:
+            self.sketch.update(non_null)
+            return
+        self.values.update(non_null.unique().tolist())
+        if self.mode == 'auto' and len(self.values) > self.exact_limit:
+            self._switch_to_sketch()
+    
+    def merge(self, other: 'DistinctCounter'):
+        """Union with the counter of another chunk or worker"""
+        if other.sketch is not None and self.sketch is None:
+            self._switch_to_sketch()
+        if self.sketch is not None:
+            if other.sketch is not None:
+                self.sketch.merge(other.sketch)
+            else:
+                self.sketch.update(pd.Series(list(other.values)))
+            return
+        self.values.update(other.values)
+        if self.mode == 'auto' and len(self.values) > self.exact_limit:
+            self._switch_to_sketch()
+    
+    def count(self) -> int:
+        return self.sketch.estimate() if self.sketch is not None else len(self.values)
+    
+    def profile_fields(self) -> Dict[str, Any]:
+        """unique_values plus, when approximated, the error bound and the stored sketch"""
+        fields = {'unique_values': self.count()}
+        if self.sketch is not None:
+            fields['unique_values_error'] = round(float(self.sketch.relative_error), 4)
+            fields['distinct_sketch'] = self.sketch.to_dict()
+        return fields
+    
+    def _switch_to_sketch(self):
+        self.sketch = HyperLogLog(self.precision)
+        self.sketch.update(pd.Series(list(self.values)))
+        self.values = None
+
+class KLLSketch:
+    """Mergeable KLL quantile sketch for streaming IQR bounds"""
+    
+    def __init__(self, k: int = 200, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+    
+    @property
+    def is_exact(self) -> bool:
+        """True while nothing has been compacted, so quantiles are exact"""
+        return len(self.levels) == 1
+    
+    def update(self, values: np.ndarray):
+        """Add a batch of non-null numeric values"""
+        if len(values) == 0:
+            return
+        self.levels[0] = np.concatenate([self.levels[0], np.asarray(values, dtype='float64')])
+        self.n += len(values)
+        self._compress()
+    
+    def merge(self, other: 'KLLSketch'):
+        """Combine with a sketch built on another chunk or partition"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+    
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile; exact with linear interpolation before any compaction"""
+        if self.is_exact:
+            return float(np.quantile(self.levels[0], q))
+        items, cumulative = self._weighted_items()
+        index = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+        return float(items[min(index, len(items) - 1)])
+    
+    def rank(self, value: float, inclusive: bool = False) -> float:
+        """Approximate fraction of values below (or at and below) value"""
+        items, cumulative = self._weighted_items()
+        if len(items) == 0:
+            return 0.0
+        index = np.searchsorted(items, value, side='right' if inclusive else 'left')
+        return float(cumulative[index - 1] / cumulative[-1]) if index else 0.0
+    
+    def _weighted_items(self) -> Tuple[np.ndarray, np.ndarray]:
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** i) for i, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='mergesort')
+        return items[order], np.cumsum(weights[order])
+    
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(int(np.ceil(self.k * (2 / 3) ** depth)), 2)
+    
+    def _compress(self):
+        compacted = True
+        while compacted:
+            compacted = False
+            for level in range(len(self.levels)):
+                if len(self.levels[level]) <= self._capacity(level):
+                    continue
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(self.levels[level])
+                leftover = items[len(items) - len(items) % 2:]
+                items = items[:len(items) - len(items) % 2]
+                # Keep every other item, starting at a random offset, at twice the weight
+                promoted = items[int(self.rng.integers(2))::2]
+                self.levels[level] = leftover
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                compacted = True
+
+class ValueReservoir:
+    """Mergeable fixed-size uniform sample of values (bottom-k random keys)"""
+    
+    def __init__(self, size: int = 1000, seed: int = 0):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.keys = np.empty(0)
+        self.values = np.empty(0)
+    
+    def update(self, values: np.ndarray):
+        keys = self.rng.random(len(values))
+        self._keep(np.concatenate([self.keys, keys]), np.concatenate([self.values, values]))
+    
+    def merge(self, other: 'ValueReservoir'):
+        self._keep(np.concatenate([self.keys, other.keys]), np.concatenate([self.values, other.values]))
+    
+    def _keep(self, keys: np.ndarray, values: np.ndarray):
+        if len(keys) > self.size:
+            keep = np.argpartition(keys, self.size)[:self.size]
+            keys, values = keys[keep], values[keep]
+        self.keys, self.values = keys, values
+
+
+def proportion_interval(hits: np.ndarray, confidence: float = 0.95, fraction: float = 0.0,
+                        clusters: np.ndarray = None) -> Tuple[float, float, float]:
+    """(rate, low, high): share of True values in a sample with a confidence interval for the population
+    
+    Uses the Wilson score interval for a simple random sample. With cluster labels (rows sampled in
+    groups, such as primary-key ranges) the interval comes from the ratio estimator's between-cluster
+    variance instead. fraction is the sampled share of the population (finite population correction).
+    """
+    n = len(hits)
+    if n == 0:
+        return 0.0, 0.0, 1.0
+    rate = float(np.count_nonzero(hits)) / n
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    correction = np.sqrt(max(0.0, 1.0 - fraction))
+    # With no hits (or only hits) the between-cluster variance is zero; Wilson still bounds the rate
+    if clusters is not None and 0 < rate < 1 and len(np.unique(clusters)) > 1:
+        cluster_hits = np.bincount(clusters, weights=hits.astype(np.float64))
+        cluster_sizes = np.bincount(clusters)
+        occupied = cluster_sizes > 0
+        k = int(np.count_nonzero(occupied))
+        residuals = cluster_hits[occupied] - rate * cluster_sizes[occupied]
+        half = z * correction * np.sqrt(k / (k - 1) * np.sum(residuals ** 2)) / n
+        return rate, max(0.0, rate - half), min(1.0, rate + half)
+    center = (rate + z * z / (2 * n)) / (1 + z * z / n)
+    half = z * np.sqrt(rate * (1 - rate) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    # Shrink the interval around the estimate as the sample approaches the whole population
+    low = rate - (rate - max(0.0, center - half)) * correction
+    high = rate + (min(1.0, center + half) - rate) * correction
+    return rate, float(low), float(high)
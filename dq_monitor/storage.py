@@ -0,0 +1,450 @@
+"""On-disk state: incremental profiling state, the profile cache and the profile history store"""
+
+import hashlib
+import os
+import pickle
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Tuple, Any
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from .connection import DatabaseConnection
+
+class ProfileStateStore:
+    """On-disk incremental profiling state (accumulators and watermark) per table
+    
+    State lives under state_dir/<source>/<table>, where source is ProfileHistoryStore.source_name() of
+    the connection, so equally named tables of different databases keep separate watermarks.
+    """
+    
+    def __init__(self, state_dir: str = '.dq_state'):
+        self.state_dir = os.path.abspath(state_dir)
+    
+    def table_dir(self, source: str, table_name: str) -> str:
+        return os.path.join(self.state_dir, quote(source, safe=''), quote(table_name, safe=''))
+    
+    def duplicates_dir(self, source: str, table_name: str) -> str:
+        return os.path.join(self.table_dir(source, table_name), 'duplicates')
+    
+    def load(self, source: str, table_name: str) -> Dict[str, Any]:
+        """Saved state for a table, or None if it has never been profiled incrementally"""
+        path = os.path.join(self.table_dir(source, table_name), 'state.pkl')
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            try:
+                return pickle.load(f)
+            except (pickle.UnpicklingError, AttributeError, ImportError, EOFError):
+                # Written by a build whose classes lived elsewhere (e.g. in code.py): rescan from scratch
+                return None
+    
+    def save(self, source: str, table_name: str, state: Dict[str, Any]):
+        """Atomically replace the saved state for a table"""
+        table_dir = self.table_dir(source, table_name)
+        os.makedirs(table_dir, exist_ok=True)
+        path = os.path.join(table_dir, 'state.pkl')
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+    
+    def clear(self, source: str, table_name: str):
+        shutil.rmtree(self.table_dir(source, table_name), ignore_errors=True)
+
+class ProfileCache:
+    """Profile results keyed by table and change fingerprint: an in-memory LRU backed by pickles on disk
+    
+    Thread-safe and meant to be shared by every Streamlit session of the process. Entries are evicted
+    least-recently-used beyond max_entries/max_bytes and dropped once older than max_age seconds.
+    """
+    
+    def __init__(self, cache_dir: str = '.dq_cache', max_entries: int = 128, max_bytes: int = 256 * 1024 * 1024,
+                 max_age: float = 24 * 3600.0, max_disk_bytes: int = 1024 * 1024 * 1024):
+        self.cache_dir = os.path.abspath(cache_dir) if cache_dir else None
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # One lock per key being computed so concurrent misses for the same table scan it only once
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(*parts) -> str:
+        return hashlib.sha256(repr(parts).encode()).hexdigest()
+    
+    def get(self, key: str, fingerprint: Tuple) -> Dict[str, Any]:
+        """Cached profile_results for key if they were computed at this fingerprint, else None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._load(key)
+                if entry is not None:
+                    self._store(key, entry)
+            if entry is not None and (entry['fingerprint'] != fingerprint or self._expired(entry)):
+                self._discard(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._unpack(entry)
+    
+    def put(self, key: str, fingerprint: Tuple, profile_results: Dict[str, Any]):
+        entry = {
+            'fingerprint': fingerprint,
+            'created': time.time(),
+            'payload': pickle.dumps(profile_results, protocol=pickle.HIGHEST_PROTOCOL)
+        }
+        with self._lock:
+            self._discard(key)
+            self._store(key, entry)
+            self._evict()
+        self._save(key, entry)
+    
+    def get_or_compute(self, key: str, fingerprint: Tuple, compute) -> Dict[str, Any]:
+        """Cached results for (key, fingerprint), or compute() them once even if many callers miss together"""
+        if fingerprint is None:
+            return compute()
+        cached = self.get(key, fingerprint)
+        if cached is not None:
+            return cached
+        
+        with self._lock:
+            inflight = self._inflight.setdefault(key, [threading.Lock(), 0])
+            inflight[1] += 1
+        try:
+            with inflight[0]:
+                # Another session may have finished the same scan while this one waited
+                cached = self.get(key, fingerprint)
+                if cached is not None:
+                    return cached
+                profile_results = compute()
+                if profile_results:
+                    self.put(key, fingerprint, profile_results)
+                return profile_results
+        finally:
+            with self._lock:
+                inflight[1] -= 1
+                if not inflight[1]:
+                    self._inflight.pop(key, None)
+    
+    def invalidate(self, key: str):
+        with self._lock:
+            self._discard(key)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self.cache_dir:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+    
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+    
+    def _unpack(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        # Every caller gets its own copy so nobody can modify the cached results
+        profile_results = pickle.loads(entry['payload'])
+        profile_results['cache'] = {
+            'hit': True,
+            'cached_at': datetime.fromtimestamp(entry['created']).isoformat(timespec='seconds'),
+            'fingerprint': entry['fingerprint'][0]
+        }
+        return profile_results
+    
+    def _expired(self, entry: Dict[str, Any]) -> bool:
+        return self.max_age is not None and time.time() - entry['created'] > self.max_age
+    
+    def _store(self, key: str, entry: Dict[str, Any]):
+        self._entries[key] = entry
+        self._bytes += len(entry['payload'])
+    
+    def _discard(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry['payload'])
+        if self.cache_dir:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+    
+    def _evict(self):
+        # Only the in-memory copy is evicted here; the disk store is trimmed separately in _save
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= len(entry['payload'])
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + '.pkl')
+    
+    def _load(self, key: str) -> Dict[str, Any]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+    
+    def _save(self, key: str, entry: Dict[str, Any]):
+        if not self.cache_dir:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        # Unique temporary name: several sessions may write the same key concurrently
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self._trim_disk()
+    
+    def _trim_disk(self):
+        """Delete expired files, then the least recently written ones beyond max_disk_bytes"""
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.pkl'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, name))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        now = time.time()
+        for mtime, size, name in files:
+            expired = self.max_age is not None and now - mtime > self.max_age
+            if not expired and total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+            total -= size
+
+class ProfileHistoryStore:
+    """SQLite time series of profile metrics: one point per table, column, metric and profile run
+    
+    Series identities (database, table, column, metric) are stored once in `series`; `points` is clustered on (series_id, ts) so a
+    "metric of column over the last N days" query is a single index range scan. Each record() is a row
+    of `runs`, whose id keeps two runs within the same second apart. compact() folds old points into
+    daily rollups and applies retention. Timestamps are stored as epoch seconds and returned in local
+    time, like the profiles' own timestamps; days are rolled up in UTC.
+    """
+    
+    TABLE_COLUMN = ''
+    
+    def __init__(self, path: str = '.dq_history.sqlite3', raw_retention_days: int = 30,
+                 rollup_retention_days: int = 730):
+        self.path = os.path.abspath(path)
+        self.raw_retention_days = raw_retention_days
+        self.rollup_retention_days = rollup_retention_days
+        self._series_ids = {}
+        self._lock = threading.Lock()
+        self._last_compaction = 0.0
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._migrate(connection)
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS series (
+                    id INTEGER PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    table_name TEXT NOT NULL,
+                    column_name TEXT NOT NULL,
+                    metric TEXT NOT NULL,
+                    UNIQUE (source, table_name, column_name, metric)
+                );
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    table_name TEXT NOT NULL,
+                    ts INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS points (
+                    series_id INTEGER NOT NULL,
+                    ts INTEGER NOT NULL,
+                    run_id INTEGER NOT NULL,
+                    value REAL,
+                    PRIMARY KEY (series_id, ts, run_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS points_ts ON points (ts);
+                CREATE TABLE IF NOT EXISTS daily_rollups (
+                    series_id INTEGER NOT NULL,
+                    day INTEGER NOT NULL,
+                    count INTEGER NOT NULL,
+                    total REAL NOT NULL,
+                    min_value REAL,
+                    max_value REAL,
+                    PRIMARY KEY (series_id, day)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS daily_rollups_day ON daily_rollups (day);
+            """)
+    
+    @staticmethod
+    def _migrate(connection):
+        """Give points written before runs existed (keyed on (series_id, ts) alone) run id 0"""
+        columns = [row[1] for row in connection.execute("PRAGMA table_info(points)")]
+        if not columns or 'run_id' in columns:
+            return
+        connection.execute("DROP INDEX IF EXISTS points_ts")
+        connection.execute("ALTER TABLE points RENAME TO points_without_runs")
+        connection.execute("""
+            CREATE TABLE points (
+                series_id INTEGER NOT NULL,
+                ts INTEGER NOT NULL,
+                run_id INTEGER NOT NULL,
+                value REAL,
+                PRIMARY KEY (series_id, ts, run_id)
+            ) WITHOUT ROWID
+        """)
+        connection.execute("INSERT INTO points SELECT series_id, ts, 0, value FROM points_without_runs")
+        connection.execute("DROP TABLE points_without_runs")
+    
+    @contextmanager
+    def _connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+    
+    @classmethod
+    def profile_metrics(cls, profile_results: Dict[str, Any]) -> List[Tuple[str, str, float]]:
+        """Flatten profile_results into (column, metric, value) triples; table-level metrics use column ''"""
+        issues = profile_results['data_quality_issues']
+        inconsistencies = issues.get('inconsistencies', {})
+        metrics = [
+            (cls.TABLE_COLUMN, 'total_rows', profile_results['total_rows']),
+            (cls.TABLE_COLUMN, 'total_columns', profile_results['total_columns']),
+            (cls.TABLE_COLUMN, 'duplicates', issues['duplicates']),
+            (cls.TABLE_COLUMN, 'columns_with_missing_values', len(issues['missing_values'])),
+            (cls.TABLE_COLUMN, 'inconsistency_types', len(inconsistencies))
+        ]
+        for column, col_profile in profile_results['column_profiles'].items():
+            for metric, value in col_profile.items():
+                if isinstance(value, (int, float, np.number)) and not isinstance(value, (bool, np.bool_)):
+                    metrics.append((column, metric, value))
+            if isinstance(col_profile.get('outliers'), dict):
+                metrics.append((column, 'outlier_count', col_profile['outliers'].get('count', 0)))
+            for kind in ('case', 'whitespace'):
+                issue = inconsistencies.get(f'{column}_{kind}_inconsistency')
+                metrics.append((column, f'{kind}_inconsistencies', issue['count'] if issue else 0))
+        return [(column, metric, float(value)) for column, metric, value in metrics]
+    
+    @staticmethod
+    def source_name(db_connection: DatabaseConnection) -> str:
+        """Identifies the database a table belongs to, so equally named tables do not share series"""
+        return f"{db_connection.host}:{db_connection.port}/{db_connection.database}"
+    
+    def record(self, source: str, profile_results: Dict[str, Any]) -> int:
+        """Append one profile run; returns the number of points written"""
+        if not profile_results:
+            return 0
+        table_name = profile_results['table_name']
+        timestamp = profile_results.get('timestamp')
+        ts = int(datetime.fromisoformat(timestamp).timestamp() if timestamp else time.time())
+        metrics = self.profile_metrics(profile_results)
+        with self._lock, self._connect() as connection:
+            run_id = connection.execute("INSERT INTO runs (source, table_name, ts) VALUES (?, ?, ?)",
+                                        (source, table_name, ts)).lastrowid
+            rows = [(self._series_id(connection, source, table_name, column, metric), ts, run_id, value)
+                    for column, metric, value in metrics]
+            connection.executemany("INSERT INTO points (series_id, ts, run_id, value) VALUES (?, ?, ?, ?)", rows)
+        # Retention is applied lazily, at most once an hour per process
+        if time.time() - self._last_compaction > 3600:
+            self.compact()
+        return len(rows)
+    
+    def _series_id(self, connection, source: str, table_name: str, column: str, metric: str) -> int:
+        key = (source, table_name, column, metric)
+        if key not in self._series_ids:
+            connection.execute("INSERT OR IGNORE INTO series (source, table_name, column_name, metric) "
+                               "VALUES (?, ?, ?, ?)", key)
+            self._series_ids[key] = connection.execute(
+                "SELECT id FROM series WHERE source = ? AND table_name = ? AND column_name = ? AND metric = ?", key
+            ).fetchone()[0]
+        return self._series_ids[key]
+    
+    def series(self, source: str, table_name: str, column: str, metric: str, days: float = None) -> pd.DataFrame:
+        """Points of one metric as a DataFrame (timestamp, value, resolution), oldest first
+        
+        Periods that have already been compacted come back as one daily average per day.
+        """
+        since = int(time.time() - days * 86400) if days is not None else 0
+        with self._connect() as connection:
+            rows = connection.execute("""
+                SELECT r.day * 86400, r.total / r.count, 'daily'
+                FROM series s JOIN daily_rollups r ON r.series_id = s.id
+                WHERE s.source = ? AND s.table_name = ? AND s.column_name = ? AND s.metric = ? AND r.day >= ? / 86400
+                UNION ALL
+                SELECT p.ts, p.value, 'raw'
+                FROM series s JOIN points p ON p.series_id = s.id
+                WHERE s.source = ? AND s.table_name = ? AND s.column_name = ? AND s.metric = ? AND p.ts >= ?
+                ORDER BY 1
+            """, (source, table_name, column, metric, since) * 2).fetchall()
+        frame = pd.DataFrame(rows, columns=['timestamp', 'value', 'resolution'])
+        # Naive local time, as record() read it from the profile (to_datetime(unit='s') would give UTC)
+        frame['timestamp'] = pd.to_datetime(frame['timestamp'].map(datetime.fromtimestamp))
+        return frame
+    
+    def columns(self, source: str, table_name: str) -> List[str]:
+        """Columns with recorded history ('' holds the table-level metrics)"""
+        with self._connect() as connection:
+            rows = connection.execute("SELECT DISTINCT column_name FROM series WHERE source = ? AND table_name = ? "
+                                      "ORDER BY column_name", (source, table_name)).fetchall()
+        return [row[0] for row in rows]
+    
+    def metrics(self, source: str, table_name: str, column: str) -> List[str]:
+        with self._connect() as connection:
+            rows = connection.execute("SELECT metric FROM series WHERE source = ? AND table_name = ? AND column_name = ? "
+                                      "ORDER BY metric", (source, table_name, column)).fetchall()
+        return [row[0] for row in rows]
+    
+    def compact(self, now: float = None) -> Dict[str, int]:
+        """Roll raw points older than raw_retention_days into daily rollups and drop expired rollups"""
+        now = time.time() if now is None else now
+        self._last_compaction = time.time()
+        # Only whole days are rolled up so a day is never split between raw points and its rollup
+        raw_cutoff = int((now - self.raw_retention_days * 86400) // 86400 * 86400)
+        rollup_cutoff = int((now - self.rollup_retention_days * 86400) // 86400)
+        with self._lock, self._connect() as connection:
+            connection.execute("""
+                INSERT INTO daily_rollups (series_id, day, count, total, min_value, max_value)
+                SELECT series_id, ts / 86400, COUNT(*), SUM(value), MIN(value), MAX(value)
+                FROM points WHERE ts < ? AND value IS NOT NULL
+                GROUP BY series_id, ts / 86400
+                ON CONFLICT (series_id, day) DO UPDATE SET
+                    count = count + excluded.count,
+                    total = total + excluded.total,
+                    min_value = MIN(min_value, excluded.min_value),
+                    max_value = MAX(max_value, excluded.max_value)
+            """, (raw_cutoff,))
+            rolled_up = connection.execute("DELETE FROM points WHERE ts < ?", (raw_cutoff,)).rowcount
+            connection.execute("DELETE FROM runs WHERE ts < ?", (raw_cutoff,))
+            expired = connection.execute("DELETE FROM daily_rollups WHERE day < ?", (rollup_cutoff,)).rowcount
+        return {'rolled_up_points': rolled_up, 'expired_rollups': expired}
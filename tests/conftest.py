@@ -0,0 +1,72 @@
+"""Shared fixtures: the benchmark's deterministic synthetic table in SQLite, standing in for MySQL"""
+
+import os
+import re
+import statistics
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from profiler_benchmark import SQLiteStandIn, sqlite_table, payload_columns  # noqa: E402
+
+ROWS = 4000
+WIDTH = 9
+SEED = 7
+
+
+class _StddevSamp:
+    def __init__(self):
+        self.values = []
+
+    def step(self, value):
+        if value is not None:
+            self.values.append(value)
+
+    def finalize(self):
+        return statistics.stdev(self.values) if len(self.values) > 1 else None
+
+
+def _regexp(pattern, value):
+    return value is not None and re.search(pattern, value) is not None
+
+
+class PushdownStandIn(SQLiteStandIn):
+    """SQLiteStandIn that also runs the pushdown strategy's MySQL SQL
+
+    CHAR_LENGTH, STDDEV_SAMP and REGEXP are registered as functions, POSIX classes become Python ones
+    and CAST(... AS BINARY) becomes CAST(... AS BLOB), which compares bytes like MySQL's BINARY does.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.connection.create_function('CHAR_LENGTH', 1, lambda value: None if value is None else len(value))
+        self.connection.create_function('REGEXP', 2, _regexp)
+        self.connection.create_aggregate('STDDEV_SAMP', 1, _StddevSamp)
+
+    @staticmethod
+    def _translate(query: str) -> str:
+        query = SQLiteStandIn._translate(query)
+        return query.replace('[[:space:]]', r'\s').replace(' AS BINARY)', ' AS BLOB)')
+
+
+@pytest.fixture(scope='session')
+def synthetic_path(tmp_path_factory):
+    """SQLite file with the synthetic benchmark table 'synthetic' (ROWS rows, WIDTH columns)"""
+    return sqlite_table(str(tmp_path_factory.mktemp('synthetic')), ROWS, WIDTH, SEED)
+
+
+@pytest.fixture
+def synthetic_db(synthetic_path):
+    db = PushdownStandIn(synthetic_path)
+    yield db
+    db.disconnect()
+
+
+@pytest.fixture
+def key_columns():
+    """Duplicate key of the synthetic table: every column but its id"""
+    return payload_columns(WIDTH)
@@ -0,0 +1,125 @@
+"""EmailAlertSystem session reuse and AlertDigest against a local aiosmtpd server"""
+
+import email
+import socket
+import time
+
+import pytest
+
+pytest.importorskip('aiosmtpd')
+
+from aiosmtpd.controller import Controller  # noqa: E402
+
+from dq_monitor import EmailAlertSystem  # noqa: E402
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(email.message_from_bytes(envelope.content))
+        return '250 OK'
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def report(table_name: str, timestamp: str, duplicates: int = 0) -> dict:
+    return {
+        'table_name': table_name,
+        'timestamp': timestamp,
+        'total_rows': 100,
+        'data_quality_issues': {'missing_values': {}, 'duplicates': duplicates, 'inconsistencies': {}},
+    }
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname='127.0.0.1', port=free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+@pytest.fixture
+def alerts(smtp_server):
+    controller, _ = smtp_server
+    alert_system = EmailAlertSystem('127.0.0.1', controller.port, 'alerts@example.com', '', use_tls=False,
+                                    timeout=5)
+    yield alert_system
+    alert_system.close()
+
+
+def test_alerts_share_one_session(smtp_server, alerts):
+    _, handler = smtp_server
+    for index in range(5):
+        assert alerts.send_alert('team@example.com', f'alert {index}', '<p>body</p>')
+
+    metrics = alerts.metrics()
+    assert metrics['connections'] == 1
+    assert metrics['messages'] == 5 and metrics['failures'] == 0
+    assert metrics['session_open']
+    assert [message['Subject'] for message in handler.messages] == [f'alert {index}' for index in range(5)]
+
+
+def test_reconnects_once_when_the_server_drops_the_session():
+    handler = RecordingHandler()
+    port = free_port()
+    alerts = EmailAlertSystem('127.0.0.1', port, 'alerts@example.com', '', use_tls=False, timeout=5)
+    first = Controller(handler, hostname='127.0.0.1', port=port)
+    first.start()
+    try:
+        assert alerts.send_alert('team@example.com', 'before', '<p>body</p>')
+    finally:
+        first.stop()
+
+    restarted = Controller(handler, hostname='127.0.0.1', port=port)
+    restarted.start()
+    try:
+        # Recently used: no NOOP probe, so the dropped session only shows up in sendmail
+        alerts._last_used = time.monotonic()
+        assert alerts.send_alert('team@example.com', 'after', '<p>body</p>')
+    finally:
+        alerts.close()
+        restarted.stop()
+
+    metrics = alerts.metrics()
+    assert metrics['connections'] == 2 and metrics['reconnects'] == 1
+    assert metrics['failures'] == 0
+    assert [message['Subject'] for message in handler.messages] == ['before', 'after']
+
+
+def test_digest_sends_one_message_per_recipient_with_latest_reports(smtp_server, alerts):
+    _, handler = smtp_server
+    digest = alerts.digest()
+    digest.add('team@example.com', report('orders', 'first-run', duplicates=50))
+    digest.add('team@example.com', report('customers', 'first-run', duplicates=10))
+    digest.add('team@example.com', report('orders', 'second-run', duplicates=60))
+    digest.add('owner@example.com', report('customers', 'first-run', duplicates=10))
+    assert len(digest) == 3
+
+    assert digest.send() == {'team@example.com': True, 'owner@example.com': True}
+    assert len(digest) == 0
+    assert alerts.metrics()['connections'] == 1
+
+    messages = {message['To']: message for message in handler.messages}
+    assert len(handler.messages) == 2
+    assert messages['team@example.com']['Subject'] == 'Data Quality Digest - 2 tables with critical issues'
+    assert messages['owner@example.com']['Subject'] == 'Data Quality Alert - customers'
+    body = messages['team@example.com'].get_payload()[0].get_payload(decode=True).decode()
+    assert 'second-run' in body and 'first-run' in body
+    assert body.count('Data Quality Report - orders') == 1
+
+
+def test_refused_connection_fails_without_reconnecting():
+    alerts = EmailAlertSystem('127.0.0.1', free_port(), 'alerts@example.com', '', use_tls=False, timeout=5)
+    assert not alerts.send_alert('team@example.com', 'alert', '<p>body</p>')
+
+    metrics = alerts.metrics()
+    assert metrics['failures'] == 1 and metrics['reconnects'] == 0
+    assert metrics['connections'] == 0 and not metrics['session_open']
@@ -0,0 +1,159 @@
+"""The profile cache: fingerprints, keys, eviction and instrumented runs"""
+
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import PushdownStandIn
+from dq_monitor import DatabaseConnection, DataQualityProfiler, ProfileCache
+
+
+class FingerprintedStandIn(PushdownStandIn):
+    """PushdownStandIn whose tables never change"""
+
+    def get_table_fingerprint(self, table_name, method='auto'):
+        return ('static', table_name)
+
+
+@pytest.fixture
+def cached_profiler(synthetic_path, tmp_path):
+    db = FingerprintedStandIn(synthetic_path)
+    yield DataQualityProfiler(db, profile_cache=ProfileCache(cache_dir=str(tmp_path / 'cache')))
+    db.disconnect()
+
+
+def test_instrumented_runs_bypass_the_cache(cached_profiler):
+    cache = cached_profiler.profile_cache
+    assert 'performance' not in cached_profiler.profile_table('synthetic')
+
+    cached_profiler.instrumentation = 'timing'
+    for _ in range(2):
+        assert 'performance' in cached_profiler.profile_table('synthetic')
+    assert cache.hits == 0
+
+
+def test_cached_results_never_carry_timings(cached_profiler):
+    cached_profiler.instrumentation = 'timing'
+    assert 'performance' in cached_profiler.profile_table('synthetic')
+
+    cached_profiler.instrumentation = 'off'
+    cached = cached_profiler.profile_table('synthetic')
+    assert cached_profiler.profile_cache.hits == 1
+    assert 'performance' not in cached
+
+
+class FakeTablesCursor:
+    """Answers the fingerprint queries with one information_schema.TABLES row and records them"""
+
+    def __init__(self, update_time):
+        self.now = datetime(2026, 10, 17, 12, 0, 0)
+        self.update_time = update_time
+        self.queries = []
+
+    def execute(self, query, params=None):
+        self.queries.append(query)
+
+    def fetchone(self):
+        if self.queries[-1].startswith('CHECKSUM'):
+            return ('shop.orders', 123456)
+        return (self.update_time, 1000, 65536, 1001, datetime(2026, 1, 1), self.now)
+
+
+def fingerprint(update_time, method='metadata'):
+    cursor = FakeTablesCursor(update_time)
+    db = DatabaseConnection('db', 'shop', 'monitor', '')
+    db.cursor = contextmanager(lambda: (yield cursor))
+    return db.get_table_fingerprint('orders', method), cursor.queries
+
+
+def test_fingerprint_changes_with_update_time():
+    first, _ = fingerprint(datetime(2026, 10, 17, 11, 0, 0))
+    second, _ = fingerprint(datetime(2026, 10, 17, 11, 30, 0))
+    assert first[0] == 'metadata' and first != second
+
+
+def test_table_without_update_time_is_not_fingerprinted_or_scanned():
+    value, queries = fingerprint(None)
+    assert value is None
+    assert not any(query.startswith('CHECKSUM') for query in queries)
+
+
+def test_table_written_this_second_is_not_fingerprinted():
+    assert fingerprint(datetime(2026, 10, 17, 11, 59, 59, 500000))[0] is None
+
+
+def test_checksum_method_reads_the_checksum():
+    value, queries = fingerprint(None, method='checksum')
+    assert value == ('checksum', 123456) and queries == ['CHECKSUM TABLE `orders`']
+
+
+@pytest.mark.parametrize('strategy, option, value', [
+    ('memory', 'compact_dtypes', False), ('memory', 'category_ratio', 0.1), ('memory', 'fetch_mode', 'columnar'),
+    ('auto', 'chunk_size', 1000), ('auto', 'memory_budget', 1024), ('auto', 'fetch_mode', 'columnar'),
+    ('sampled', 'compact_dtypes', False),
+])
+def test_report_changing_options_are_part_of_the_cache_key(synthetic_db, strategy, option, value):
+    profiler = DataQualityProfiler(synthetic_db)
+    key = profiler.cache_key('synthetic', strategy)
+    setattr(profiler, option, value)
+    assert profiler.cache_key('synthetic', strategy) != key
+
+
+def results(table_name, size=10):
+    return {'table_name': table_name, 'payload': 'x' * size}
+
+
+def test_changed_fingerprint_misses_and_drops_the_entry(tmp_path):
+    cache = ProfileCache(str(tmp_path))
+    cache.put('orders', ('metadata', 1), results('orders'))
+    assert cache.get('orders', ('metadata', 1))['cache']['hit']
+
+    assert cache.get('orders', ('metadata', 2)) is None
+    assert cache.get('orders', ('metadata', 1)) is None
+    assert not os.listdir(tmp_path)
+
+
+def test_memory_lru_evicts_least_recently_used_but_disk_keeps_it(tmp_path):
+    cache = ProfileCache(str(tmp_path), max_entries=2)
+    for table_name in ('a', 'b'):
+        cache.put(table_name, (1,), results(table_name))
+    cache.get('a', (1,))
+    cache.put('c', (1,), results('c'))
+
+    assert list(cache._entries) == ['a', 'c']
+    # Evicted from memory only: the next lookup reloads it from disk
+    assert cache.get('b', (1,))['table_name'] == 'b'
+
+    memory_only = ProfileCache(None, max_entries=2)
+    for table_name in ('a', 'b', 'c'):
+        memory_only.put(table_name, (1,), results(table_name))
+    assert memory_only.get('a', (1,)) is None and memory_only.get('c', (1,)) is not None
+
+
+def test_memory_lru_stays_within_max_bytes(tmp_path):
+    cache = ProfileCache(None, max_bytes=2500)
+    for table_name in ('a', 'b', 'c'):
+        cache.put(table_name, (1,), results(table_name, size=1000))
+    assert list(cache._entries) == ['b', 'c']
+    assert cache.metrics()['bytes'] <= 2500
+
+
+def test_disk_store_is_trimmed_oldest_first(tmp_path):
+    cache = ProfileCache(str(tmp_path), max_disk_bytes=2500)
+    for age, table_name in zip((30, 20, 10), ('a', 'b', 'c')):
+        cache.put(table_name, (1,), results(table_name, size=1000))
+        os.utime(cache._path(table_name), (time.time() - age, time.time() - age))
+    cache.put('d', (1,), results('d', size=1000))
+
+    assert sorted(os.listdir(tmp_path)) == sorted(f'{key}.pkl' for key in ('c', 'd'))
+
+
+def test_entries_expire_after_max_age(tmp_path, monkeypatch):
+    cache = ProfileCache(str(tmp_path), max_age=60)
+    cache.put('orders', (1,), results('orders'))
+    later = time.time() + timedelta(minutes=2).total_seconds()
+    monkeypatch.setattr('dq_monitor.storage.time.time', lambda: later)
+    assert cache.get('orders', (1,)) is None
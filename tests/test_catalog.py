@@ -0,0 +1,63 @@
+"""MetadataCatalog reloads against a fake information_schema"""
+
+from contextlib import contextmanager
+
+from dq_monitor.connection import MetadataCatalog
+
+
+class FakeSchemaConnection:
+    """Answers the catalog's three information_schema queries and counts full reloads"""
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.reloads = 0
+
+    @contextmanager
+    def cursor(self):
+        yield self
+
+    def execute(self, query, params=None):
+        self.query = query
+        if 'information_schema.TABLES' in query:
+            self.reloads += 1
+
+    def fetchall(self):
+        if 'information_schema.TABLES' in self.query:
+            return [(name, 'BASE TABLE', 'InnoDB', 10, 100, 1000, 0, None, None) for name in self.tables]
+        if 'information_schema.COLUMNS' in self.query:
+            return [(name, 'id', 'int', 'NO', 'PRI', None, '', 10, 0, None) for name in self.tables]
+        return []
+
+
+def test_missing_table_is_not_reloaded_until_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('dq_monitor.connection.time.time', lambda: now[0])
+    db = FakeSchemaConnection(['orders'])
+    catalog = MetadataCatalog(db, ttl=300)
+
+    assert catalog.table('orders')['estimated_rows'] == 10
+    now[0] += 5
+    assert catalog.table('ordres') is None
+    assert db.reloads == 2
+    for _ in range(10):
+        now[0] += 5
+        assert catalog.table('ordres') is None
+    assert db.reloads == 2
+
+    # Once the negative entry expires, a lookup reloads and finds a table created meanwhile
+    db.tables.append('ordres')
+    now[0] += 300
+    assert catalog.table('ordres') is not None
+
+
+def test_refresh_forgets_tables_that_now_exist(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('dq_monitor.connection.time.time', lambda: now[0])
+    db = FakeSchemaConnection(['orders'])
+    catalog = MetadataCatalog(db, ttl=300)
+    now[0] += 5
+    assert catalog.table('customers') is None
+
+    db.tables.append('customers')
+    assert catalog.refresh()
+    assert catalog.table('customers') is not None
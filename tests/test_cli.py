@@ -0,0 +1,95 @@
+"""The headless CLI against the SQLite stand-in"""
+
+import json
+import math
+import sqlite3
+
+import numpy as np
+import pytest
+
+from conftest import PushdownStandIn
+from dq_monitor import cli
+
+
+class CLIStandIn(PushdownStandIn):
+    """Lists a table that does not exist; its queries fail the way DatabaseConnection's do (None, no raise)"""
+
+    def connect(self):
+        return True
+
+    def get_table_names(self):
+        return ['broken', 'synthetic']
+
+    def execute_query(self, query, params=None):
+        try:
+            return super().execute_query(query, params)
+        except sqlite3.Error:
+            return None, None
+
+
+class LonelyStandIn(PushdownStandIn):
+    """Lists only the one-row table 'lonely'"""
+
+    def connect(self):
+        return True
+
+    def get_table_names(self):
+        return ['lonely']
+
+
+def test_failed_table_is_reported_and_summary_written(synthetic_path, tmp_path, monkeypatch):
+    monkeypatch.setattr('dq_monitor.connection.DatabaseConnection', lambda *args: CLIStandIn(synthetic_path))
+    output_dir = tmp_path / 'reports'
+
+    status = cli.main(['*', '--strategy', 'memory', '--output-dir', str(output_dir)])
+
+    assert status == cli.EXIT_ERROR
+    summary = json.loads((output_dir / 'summary.json').read_text())
+    tables = {entry['table_name']: entry for entry in summary['tables']}
+    assert tables['broken']['error']
+    assert 'error' not in tables['synthetic'] and (output_dir / 'synthetic.json').exists()
+
+
+def strict_json(text):
+    def reject(constant):
+        raise ValueError(f"{constant} is not valid JSON")
+    return json.loads(text, parse_constant=reject)
+
+
+def test_json_report_writes_non_finite_floats_as_null(tmp_path):
+    profile_results = {'table_name': 'odd', 'column_profiles': {'price': {
+        'std_dev': float('nan'), 'max_value': float('inf'), 'min_value': np.float64('-inf'),
+        'mean_value': np.float32(1.5), 'count': np.int64(3),
+        'outliers': {'count': 2, 'values': [1.0, float('nan'), (np.float32('nan'), 2)]},
+    }}}
+
+    path = cli.write_report(profile_results, str(tmp_path), 'json')
+
+    with open(path) as f:
+        profile = strict_json(f.read())['column_profiles']['price']
+    assert profile['std_dev'] is None and profile['max_value'] is None and profile['min_value'] is None
+    assert profile['mean_value'] == 1.5 and profile['count'] == 3
+    assert profile['outliers'] == {'count': 2, 'values': [1.0, None, [None, 2]]}
+    assert math.isnan(profile_results['column_profiles']['price']['std_dev'])
+
+
+def test_single_row_table_report_is_valid_json(tmp_path, monkeypatch):
+    path = str(tmp_path / 'lonely.db')
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE lonely (id int(11), price double)")
+        connection.execute("INSERT INTO lonely VALUES (1, 2.5)")
+    monkeypatch.setattr('dq_monitor.connection.DatabaseConnection', lambda *args: LonelyStandIn(path))
+    output_dir = tmp_path / 'reports'
+
+    assert cli.main(['lonely', '--strategy', 'memory', '--output-dir', str(output_dir)]) == cli.EXIT_OK
+
+    report = strict_json((output_dir / 'lonely.json').read_text())
+    assert report['column_profiles']['price']['std_dev'] is None
+    assert report['column_profiles']['price']['mean_value'] == 2.5
+
+
+@pytest.mark.parametrize('value', [float('nan'), float('inf'), np.float64('nan'), np.float32('-inf')])
+def test_parquet_nested_values_are_valid_json(value):
+    rows = cli.column_rows({'table_name': 't', 'total_rows': 1,
+                            'column_profiles': {'c': {'outliers': {'count': 1, 'values': [value]}}}})
+    assert strict_json(rows[0]['outliers']) == {'count': 1, 'values': [None]}
@@ -0,0 +1,135 @@
+"""ColumnarDecoder against the row path (converted tuples inferred by pandas)"""
+
+import datetime
+import decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+from mysql.connector.constants import FieldFlag, FieldType
+from mysql.connector.conversion import MySQLConverter
+
+import dq_monitor.connection as connection
+from dq_monitor.connection import ColumnarDecoder
+from dq_monitor.schema import HAS_PYARROW, decimal_to_float, legacy_column
+
+
+def field(name, type_code, flags=0, charset=45):
+    return (name, type_code, None, None, None, None, 1, flags, charset)
+
+
+DESCRIPTION = [
+    field('id', FieldType.LONGLONG, charset=63),
+    field('big', FieldType.LONGLONG, FieldFlag.UNSIGNED, charset=63),
+    field('small', FieldType.TINY, charset=63),
+    field('amount', FieldType.NEWDECIMAL, charset=63),
+    field('score', FieldType.DOUBLE, charset=63),
+    field('born', FieldType.DATE, charset=63),
+    field('seen', FieldType.DATETIME, charset=63),
+    field('name', FieldType.VAR_STRING),
+    field('note', FieldType.BLOB, FieldFlag.BLOB),
+    field('payload', FieldType.BLOB, FieldFlag.BLOB | FieldFlag.BINARY, charset=63),
+]
+
+
+def raw_rows(count, seed=11, nulls=True):
+    """Rows as a raw cursor returns them: one bytearray per cell, None for NULL"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for index in range(count):
+        cells = [
+            str(index).encode(),
+            str(2 ** 64 - 1 - index).encode(),
+            str(int(rng.integers(-128, 128))).encode(),
+            str(decimal.Decimal(int(rng.integers(-10 ** 9, 10 ** 9))).scaleb(-2)).encode(),
+            repr(float(rng.normal())).encode(),
+            (datetime.date(2000, 1, 1) + datetime.timedelta(days=int(rng.integers(0, 9000)))).isoformat().encode(),
+            f"2024-03-{1 + index % 28:02d} 12:{index % 60:02d}:05.{index:06d}".encode(),
+            f"name {index % 7}".encode(),
+            'café ☕ {}'.format(index).encode(),
+            bytes(rng.integers(0, 256, 6, dtype=np.uint8)),
+        ]
+        if nulls:
+            cells = [None if (index + position) % 5 == 0 else cell for position, cell in enumerate(cells)]
+        rows.append(tuple(None if cell is None else bytearray(cell) for cell in cells))
+    return rows
+
+
+def row_path(rows, description=DESCRIPTION):
+    """The frame execute_query + build_dataframe infer, with DECIMAL columns converted as both paths do"""
+    converter = MySQLConverter('utf8mb4', True)
+    converted = [tuple(converter.to_python(column, None if value is None else bytes(value))
+                       for column, value in zip(description, row)) for row in rows]
+    frame = pd.DataFrame(converted, columns=[column[0] for column in description])
+    for column in description:
+        if column[1] == FieldType.NEWDECIMAL and frame[column[0]].dtype == object:
+            frame[column[0]] = decimal_to_float(frame[column[0]])[0]
+    return frame
+
+
+def decode(rows, batch_size, description=DESCRIPTION):
+    decoder = ColumnarDecoder(description)
+    for start in range(0, len(rows), batch_size):
+        decoder.append(rows[start:start + batch_size])
+    return decoder.frame()
+
+
+def assert_same_frame(decoded, expected):
+    assert list(decoded.columns) == list(expected.columns)
+    for name in expected.columns:
+        pd.testing.assert_series_equal(legacy_column(decoded[name]), expected[name], check_exact=True)
+
+
+@pytest.mark.parametrize('nulls', [True, False])
+@pytest.mark.parametrize('batch_size', [1000, 37])
+def test_decoder_matches_the_row_path(nulls, batch_size):
+    rows = raw_rows(1000, nulls=nulls)
+    decoded = decode(rows, batch_size)
+    expected = row_path(rows)
+    assert_same_frame(decoded, expected)
+    assert decoded['amount'].dtype == np.float64
+    assert decoded['big'].dtype == (np.float64 if nulls else np.uint64)
+    assert isinstance(expected['born'].dropna().iloc[0], datetime.date)
+    assert isinstance(decoded['payload'].dropna().iloc[0], bytes)
+    if HAS_PYARROW:
+        assert decoded['name'].dtype == 'string[pyarrow]'
+
+
+def test_decoder_without_pyarrow_matches_the_row_path(monkeypatch):
+    monkeypatch.setattr(connection, 'HAS_PYARROW', False)
+    rows = raw_rows(300)
+    decoded = decode(rows, 100)
+    assert decoded['note'].dtype == object
+    assert_same_frame(decoded, row_path(rows))
+
+
+def test_decimals_parse_like_float_of_their_text():
+    rng = np.random.default_rng(2)
+    digits = [str(decimal.Decimal(int(value)).scaleb(-4)) for value in rng.integers(-10 ** 18, 10 ** 18, 2000)]
+    rows = [(bytearray(text.encode()),) for text in digits + ['0.0000', '-0.0001']]
+    decoded = decode(rows, 500, [field('amount', FieldType.NEWDECIMAL, charset=63)])
+    assert decoded['amount'].tolist() == [float(text) for text in digits + ['0.0000', '-0.0001']]
+
+
+def test_nulls_confined_to_one_batch_and_all_null_columns():
+    description = [field('id', FieldType.LONG, charset=63), field('born', FieldType.DATE, charset=63),
+                   field('empty', FieldType.VAR_STRING)]
+    rows = [(bytearray(b'%d' % index), None if index < 5 else bytearray(b'2024-01-02'), None)
+            for index in range(20)]
+    decoded = decode(rows, 5, description)
+    assert decoded['id'].dtype == np.int64
+    assert_same_frame(decoded, row_path(rows, description))
+    assert legacy_column(decoded['empty']).tolist() == [None] * 20
+
+
+def test_batches_numpy_cannot_parse_fall_back_to_the_converter():
+    description = [field('born', FieldType.DATE, charset=63), field('name', FieldType.VAR_STRING),
+                   field('id', FieldType.LONG, charset=63)]
+    rows = [(bytearray(b'2024-01-02'), bytearray(b'ok'), bytearray(b'1')),
+            (bytearray(b'0000-00-00'), bytearray(b'\xff\xfe'), None),
+            (None, bytearray(b'fine'), bytearray(b'3'))]
+    decoded = decode(rows, 1, description)
+    expected = row_path(rows, description)
+    assert decoded['born'].tolist() == [datetime.date(2024, 1, 2), None, None]
+    assert decoded['name'].tolist() == expected['name'].tolist()
+    assert_same_frame(decoded[['born', 'id']], expected[['born', 'id']])
@@ -0,0 +1,34 @@
+"""Fingerprint-based duplicate detection against pandas duplicated()"""
+
+import numpy as np
+import pandas as pd
+
+from dq_monitor.accumulators import DuplicateDetector, TableAccumulator
+
+
+def test_bigint_keys_above_2_53_are_not_duplicates():
+    frame = pd.DataFrame({'id': np.arange(10 ** 18, 10 ** 18 + 1000, dtype=np.int64), 'flag': 1})
+    accumulator = TableAccumulator(list(frame.columns))
+    for chunk in np.array_split(np.arange(len(frame)), 4):
+        accumulator.update(frame.iloc[chunk])
+
+    assert int(frame.duplicated().sum()) == 0
+    assert accumulator.duplicate_count() == 0
+
+
+def test_duplicates_across_int_and_float_chunks():
+    # NULLs in a chunk turn the same integer column into float64
+    detector = DuplicateDetector(['id'])
+    detector.update(pd.DataFrame({'id': [10 ** 18, 2, 3]}))
+    detector.update(pd.DataFrame({'id': [2.0, 3.0, np.nan]}))
+    assert detector.duplicate_count() == 2
+
+
+def test_duplicate_count_matches_pandas_after_spill(tmp_path):
+    rng = np.random.default_rng(5)
+    frame = pd.DataFrame({'id': rng.integers(2 ** 60, 2 ** 60 + 20000, 60000), 'name': rng.choice(['a', 'b'], 60000)})
+    detector = DuplicateDetector(memory_budget=64 * 1024, spill_dir=str(tmp_path / 'spill'))
+    for chunk in np.array_split(np.arange(len(frame)), 12):
+        detector.update(frame.iloc[chunk])
+
+    assert detector.duplicate_count() == int(frame.duplicated().sum())
@@ -0,0 +1,113 @@
+"""ProfileHistoryStore: recording runs, series, rollups, retention and the schema migration"""
+
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from dq_monitor import ProfileHistoryStore
+
+SOURCE = 'db:3306/shop'
+
+
+def profile(timestamp: datetime, total_rows: int = 100, missing: int = 5):
+    return {
+        'table_name': 'orders',
+        'timestamp': timestamp.isoformat(),
+        'total_rows': total_rows,
+        'total_columns': 1,
+        'column_profiles': {'email': {'data_type': 'object', 'unique_values': 90, 'missing_values': missing,
+                                      'missing_percentage': missing / total_rows * 100}},
+        'data_quality_issues': {'missing_values': {'email': {'count': missing}}, 'duplicates': 2,
+                                'inconsistencies': {}}
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProfileHistoryStore(str(tmp_path / 'history.sqlite3'))
+
+
+@pytest.fixture(params=['UTC', 'America/New_York', 'Asia/Kolkata'])
+def local_timezone(request, monkeypatch):
+    monkeypatch.setenv('TZ', request.param)
+    time.tzset()
+    yield request.param
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_series_are_returned_in_the_profiles_local_time(store, local_timezone):
+    recorded_at = datetime.now().replace(microsecond=0) - timedelta(hours=3)
+    assert store.record(SOURCE, profile(recorded_at)) > 0
+
+    series = store.series(SOURCE, 'orders', '', 'total_rows', days=1)
+    assert series['timestamp'].tolist() == [pd.Timestamp(recorded_at)]
+    assert series['value'].tolist() == [100.0] and series['resolution'].tolist() == ['raw']
+
+
+def test_runs_within_the_same_second_are_both_kept(store):
+    recorded_at = datetime.now().replace(microsecond=0)
+    store.record(SOURCE, profile(recorded_at, total_rows=100))
+    store.record(SOURCE, profile(recorded_at, total_rows=120))
+
+    series = store.series(SOURCE, 'orders', '', 'total_rows')
+    assert sorted(series['value']) == [100.0, 120.0]
+
+
+def test_columns_and_metrics(store):
+    store.record(SOURCE, profile(datetime.now()))
+    assert store.columns(SOURCE, 'orders') == ['', 'email']
+    assert 'missing_percentage' in store.metrics(SOURCE, 'orders', 'email')
+    assert store.columns('other:3306/shop', 'orders') == []
+
+
+def test_old_points_are_rolled_up_into_daily_averages(store):
+    day = datetime.now().replace(hour=12, minute=0, second=0, microsecond=0) - timedelta(days=40)
+    for hour, missing in ((0, 4), (2, 8)):
+        store.record(SOURCE, profile(day + timedelta(hours=hour), missing=missing))
+    recent = datetime.now().replace(microsecond=0)
+    store.record(SOURCE, profile(recent, missing=6))
+
+    store.compact()
+    series = store.series(SOURCE, 'orders', 'email', 'missing_values')
+    assert series['resolution'].tolist() == ['daily', 'raw']
+    assert series['value'].tolist() == [6.0, 6.0]
+    assert series['timestamp'].iloc[0] < pd.Timestamp(day + timedelta(days=1))
+
+
+def test_compact_applies_raw_and_rollup_retention(store):
+    now = time.time()
+    old = datetime.fromtimestamp(now - 800 * 86400)
+    store._last_compaction = now  # keep record() from compacting
+    store.record(SOURCE, profile(old))
+    store.record(SOURCE, profile(datetime.fromtimestamp(now - 40 * 86400)))
+
+    result = store.compact(now)
+    assert result['rolled_up_points'] == 2 * len(ProfileHistoryStore.profile_metrics(profile(old)))
+    assert result['expired_rollups'] == len(ProfileHistoryStore.profile_metrics(profile(old)))
+    assert len(store.series(SOURCE, 'orders', '', 'total_rows')) == 1
+
+
+def test_points_of_the_old_schema_are_migrated(tmp_path):
+    path = str(tmp_path / 'history.sqlite3')
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE series (id INTEGER PRIMARY KEY, source TEXT NOT NULL, table_name TEXT NOT NULL,
+                             column_name TEXT NOT NULL, metric TEXT NOT NULL,
+                             UNIQUE (source, table_name, column_name, metric));
+        CREATE TABLE points (series_id INTEGER NOT NULL, ts INTEGER NOT NULL, value REAL,
+                             PRIMARY KEY (series_id, ts)) WITHOUT ROWID;
+        CREATE INDEX points_ts ON points (ts);
+    """)
+    ts = int(time.time()) - 3600
+    connection.execute("INSERT INTO series VALUES (1, ?, 'orders', '', 'total_rows')", (SOURCE,))
+    connection.execute("INSERT INTO points VALUES (1, ?, 42.0)", (ts,))
+    connection.commit()
+    connection.close()
+
+    store = ProfileHistoryStore(path)
+    store.record(SOURCE, profile(datetime.fromtimestamp(ts)))
+    assert sorted(store.series(SOURCE, 'orders', '', 'total_rows')['value']) == [42.0, 100.0]
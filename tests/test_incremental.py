@@ -0,0 +1,38 @@
+"""Incremental profiling state across runs and sources"""
+
+import sqlite3
+
+from conftest import PushdownStandIn
+from dq_monitor import DataQualityProfiler
+
+
+def orders_db(path: str, rows: int) -> PushdownStandIn:
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE orders (id int PRIMARY KEY, total double)")
+    connection.executemany("INSERT INTO orders VALUES (?, ?)", [(i, i * 1.5) for i in range(1, rows + 1)])
+    connection.commit()
+    connection.close()
+    return PushdownStandIn(path)
+
+
+def profile(db, state_dir):
+    profiler = DataQualityProfiler(db, state_dir=state_dir)
+    return profiler.profile_table('orders', strategy='incremental', watermark_column='id')
+
+
+def test_equally_named_tables_of_two_sources_keep_separate_state(tmp_path):
+    state_dir = str(tmp_path / 'state')
+    first, second = orders_db(str(tmp_path / 'a.sqlite3'), 1000), orders_db(str(tmp_path / 'b.sqlite3'), 300)
+    try:
+        assert profile(first, state_dir)['total_rows'] == 1000
+        results = profile(second, state_dir)
+        assert results['total_rows'] == 300
+        assert results['incremental']['rows_scanned'] == 300
+
+        first.connection.executemany("INSERT INTO orders VALUES (?, ?)", [(i, 0.0) for i in range(1001, 1011)])
+        results = profile(first, state_dir)
+        assert results['total_rows'] == 1010
+        assert results['incremental']['rows_scanned'] == 10
+    finally:
+        first.disconnect()
+        second.disconnect()
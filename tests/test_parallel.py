@@ -0,0 +1,65 @@
+"""Primary-key partitioning of the parallel strategy and the merge of its partial scans"""
+
+import math
+
+import pytest
+
+from conftest import ROWS
+from dq_monitor import DataQualityProfiler
+from dq_monitor.profiler import _scan_range
+from dq_monitor.schema import decimal_columns
+
+
+def assert_same_profile(actual, expected):
+    assert actual.keys() == expected.keys()
+    for field, value in expected.items():
+        if isinstance(value, float) and not math.isnan(value):
+            # Merged means and variances are combined pairwise, so only the last bits may differ
+            assert actual[field] == pytest.approx(value, rel=1e-9), field
+        elif isinstance(value, float):
+            assert math.isnan(actual[field]), field
+        else:
+            assert actual[field] == value, field
+
+
+@pytest.mark.parametrize('lowest, highest, partitions', [
+    (1, 10, 4), (1, 4000, 7), (5, 6, 8), (-50, 50, 3), (7, 7, 4), (10 ** 18, 10 ** 18 + 999, 3),
+    (2 ** 62, 2 ** 63 - 1, 16),
+])
+def test_key_ranges_cover_every_key_once(lowest, highest, partitions):
+    ranges = DataQualityProfiler._key_ranges(lowest, highest, partitions)
+
+    assert 1 <= len(ranges) <= partitions
+    assert ranges[0][0] == lowest and ranges[-1][1] == highest + 1
+    assert all(lower < upper for lower, upper in ranges)
+    assert all(previous[1] == following[0] for previous, following in zip(ranges, ranges[1:]))
+    widths = [upper - lower for lower, upper in ranges]
+    assert max(widths) - min(widths) <= 1
+
+
+def test_consistent_snapshot_is_opt_in(synthetic_db):
+    assert DataQualityProfiler(synthetic_db).consistent_snapshot is False
+
+
+@pytest.mark.parametrize('partitions', [1, 3, 8])
+def test_merged_partitions_equal_one_scan(synthetic_db, tmp_path, key_columns, partitions):
+    profiler = DataQualityProfiler(synthetic_db, chunk_size=700, state_dir=str(tmp_path / 'state'))
+    single = profiler.profile_table('synthetic', strategy='streaming', key_columns=key_columns)
+
+    specs = decimal_columns(synthetic_db.get_table_schema('synthetic'))
+    partials = [_scan_range(profiler, synthetic_db, 'synthetic', key_columns, specs, 'id', key_range)
+                for key_range in DataQualityProfiler._key_ranges(1, ROWS, partitions)]
+    assert sum(partial.total_rows for partial in partials) == ROWS
+    merged = partials[0]
+    for partial in partials[1:]:
+        merged.merge(partial)
+    try:
+        profile_results = profiler.profile_from_accumulator(merged, 'synthetic')
+    finally:
+        merged.duplicates.close()
+
+    assert profile_results['total_rows'] == single['total_rows']
+    assert profile_results['column_profiles'].keys() == single['column_profiles'].keys()
+    for column, expected in single['column_profiles'].items():
+        assert_same_profile(profile_results['column_profiles'][column], expected)
+    assert profile_results['data_quality_issues'] == single['data_quality_issues']
@@ -0,0 +1,159 @@
+"""ConnectionPool checkout, timeouts and reconnects, and iter_query's connection lease, on fake connections"""
+
+import gc
+
+import pytest
+from mysql.connector import Error
+from mysql.connector.errors import PoolError
+
+from dq_monitor import DatabaseConnection
+from dq_monitor.connection import ConnectionPool
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.column_names = ('id',)
+        self.closed = False
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchmany(self, size):
+        chunk, self.rows = self.rows[:size], self.rows[size:]
+        return chunk
+
+    def fetchall(self):
+        return self.fetchmany(len(self.rows))
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    """Connection to a fake server: `dropped` makes ping() fail, `server.down` makes reconnect() fail too"""
+
+    def __init__(self, server):
+        self.server = server
+        self.dropped = False
+        self.closed = False
+        self.unread_result = False
+        self.in_transaction = False
+
+    def ping(self, reconnect=False):
+        if self.dropped:
+            raise Error("Lost connection to MySQL server")
+
+    def reconnect(self, attempts=1, delay=0):
+        if self.server.down:
+            raise Error("Can't connect to MySQL server")
+        self.dropped = False
+
+    def cursor(self, **kwargs):
+        return FakeCursor((i,) for i in range(self.server.rows))
+
+    def is_connected(self):
+        return not self.dropped and not self.closed
+
+    def close(self):
+        self.closed = True
+
+
+class FakeServer:
+    def __init__(self, rows=10):
+        self.rows = rows
+        self.down = False
+        self.connections = []
+
+    def connect(self, **kwargs):
+        if self.down:
+            raise Error("Can't connect to MySQL server")
+        self.connections.append(FakeConnection(self))
+        return self.connections[-1]
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = FakeServer()
+    monkeypatch.setattr('dq_monitor.connection.mysql.connector.connect', server.connect)
+    return server
+
+
+def test_connections_are_reused_after_release(server):
+    pool = ConnectionPool({}, size=2)
+    first, second = pool.acquire(), pool.acquire()
+    assert first is not second and pool.metrics()['checked_out'] == 2
+
+    pool.release(first)
+    assert pool.acquire() is first
+    assert len(server.connections) == 2
+    assert pool.metrics()['checkouts'] == 3 and pool.metrics()['open'] == 2
+
+
+def test_acquire_times_out_when_every_connection_is_checked_out(server):
+    pool = ConnectionPool({}, size=1, timeout=0.05)
+    connection = pool.acquire()
+    with pytest.raises(PoolError):
+        pool.acquire()
+    assert pool.metrics()['timeouts'] == 1
+
+    pool.release(connection)
+    assert pool.acquire() is connection
+
+
+def test_dropped_idle_connection_is_reconnected(server):
+    pool = ConnectionPool({}, size=1, health_check_interval=0)
+    connection = pool.acquire()
+    pool.release(connection)
+    connection.dropped = True
+
+    assert pool.acquire() is connection
+    assert not connection.dropped and pool.metrics()['reconnects'] == 1
+
+
+def test_failed_reconnect_closes_the_connection_and_frees_its_slot(server):
+    pool = ConnectionPool({}, size=1, health_check_interval=0)
+    connection = pool.acquire()
+    pool.release(connection)
+    connection.dropped = True
+    server.down = True
+
+    with pytest.raises(Error):
+        pool.acquire()
+    assert connection.closed
+    assert pool.metrics()['open'] == 0 and pool.metrics()['checked_out'] == 0
+
+    server.down = False
+    assert pool.acquire() is server.connections[-1] is not connection
+
+
+def test_discarded_connection_is_closed(server):
+    pool = ConnectionPool({}, size=1)
+    connection = pool.acquire()
+    pool.release(connection, discard=True)
+    assert connection.closed and pool.metrics()['open'] == 0
+
+
+def test_iter_query_returns_its_lease(server):
+    db = DatabaseConnection('db', 'shop', 'monitor', '', pool_size=1, pool_timeout=0.05)
+    assert db.connect()
+
+    chunks, columns = db.iter_query("SELECT id FROM orders", chunk_size=4)
+    assert columns == ('id',)
+    assert db.pool_metrics()['checked_out'] == 1
+    assert [len(rows) for rows in chunks] == [4, 4, 2]
+    assert db.pool_metrics()['checked_out'] == 0
+
+    # Closed part-way through
+    chunks, _ = db.iter_query("SELECT id FROM orders", chunk_size=4)
+    next(chunks)
+    chunks.close()
+    assert db.pool_metrics()['checked_out'] == 0
+
+    # Never started: the lease is returned once the iterator is garbage collected
+    chunks, _ = db.iter_query("SELECT id FROM orders", chunk_size=4)
+    del chunks
+    gc.collect()
+    assert db.pool_metrics()['checked_out'] == 0
+    assert db.execute_query("SELECT id FROM orders")[0][:2] == [(0,), (1,)]
+    db.disconnect()
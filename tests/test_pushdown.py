@@ -0,0 +1,135 @@
+"""The pushdown strategy's SQL against the in-memory strategy, on SQLite standing in for MySQL"""
+
+import sqlite3
+
+import pytest
+
+from conftest import PushdownStandIn
+from dq_monitor import DataQualityProfiler, PushdownProfiler
+
+FIELDS = ('min_value', 'max_value', 'mean_value', 'std_dev', 'avg_length', 'max_length', 'min_length')
+
+
+def test_pushdown_matches_memory(synthetic_db, tmp_path, key_columns):
+    profiler = DataQualityProfiler(synthetic_db, state_dir=str(tmp_path / 'state'))
+    memory = profiler.profile_table('synthetic', strategy='memory', key_columns=key_columns)
+    pushdown = profiler.profile_table('synthetic', strategy='pushdown', key_columns=key_columns)
+
+    assert pushdown['total_rows'] == memory['total_rows']
+    issues, expected_issues = pushdown['data_quality_issues'], memory['data_quality_issues']
+    assert issues['duplicates'] == expected_issues['duplicates'] > 0
+    assert len(issues['duplicate_keys']['examples']) == len(expected_issues['duplicate_keys']['examples'])
+    assert issues['missing_values'] == expected_issues['missing_values']
+    # pandas only treats object columns without NULLs as strings, so the in-memory path checks fewer columns
+    checked = [name for name in issues['inconsistencies'] if name.rsplit('_', 2)[0] not in issues['missing_values']]
+    assert ({name: issues['inconsistencies'][name]['count'] for name in checked}
+            == {name: issue['count'] for name, issue in expected_issues['inconsistencies'].items()})
+
+    for column, expected in memory['column_profiles'].items():
+        actual = pushdown['column_profiles'][column]
+        assert actual['unique_values'] == expected['unique_values'], column
+        for field in FIELDS:
+            if expected.get(field) is not None:
+                assert actual[field] == pytest.approx(expected[field], rel=1e-9), f'{column}.{field}'
+        if 'outliers' in expected:
+            assert actual['outliers']['count'] == expected['outliers']['count'], column
+
+
+def test_pushdown_duplicate_keys_ignore_collation(tmp_path):
+    path = str(tmp_path / 'collation.sqlite3')
+    connection = sqlite3.connect(path)
+    # NOCASE merges 'Alice' and 'alice' the way MySQL's default case-insensitive collations do
+    connection.execute("CREATE TABLE people (name varchar(32) COLLATE NOCASE, team varchar(16))")
+    connection.executemany("INSERT INTO people VALUES (?, ?)",
+                           [('Alice', 'a'), ('alice', 'a'), ('Alice', 'a'), ('Bob', 'b'), ('BOB', 'b')])
+    connection.commit()
+    connection.close()
+
+    db = PushdownStandIn(path)
+    try:
+        profile_results = PushdownProfiler(db).profile_table('people', ['name'])
+        memory = DataQualityProfiler(db, state_dir=str(tmp_path / 'state')).profile_table('people', key_columns=['name'])
+    finally:
+        db.disconnect()
+    issues = profile_results['data_quality_issues']
+    assert issues['duplicates'] == memory['data_quality_issues']['duplicates'] == 1
+    assert issues['duplicate_keys']['examples'] == [['Alice']]
+
+
+class CountingStandIn(PushdownStandIn):
+    """PushdownStandIn that records every query, optionally rejecting window functions like MySQL 5.7"""
+
+    def __init__(self, path: str, window_functions: bool = True):
+        super().__init__(path)
+        self.window_functions = window_functions
+        self.queries = []
+
+    def execute_query(self, query: str, params: tuple = None):
+        self.queries.append(query)
+        if not self.window_functions and 'OVER (' in query:
+            return None, None
+        return super().execute_query(query, params)
+
+
+def outlier_counts(profile_results):
+    return {column: profile['outliers']['count']
+            for column, profile in profile_results['column_profiles'].items() if 'outliers' in profile}
+
+
+@pytest.mark.parametrize('window_functions', [True, False])
+def test_pushdown_outliers_match_memory(synthetic_path, tmp_path, key_columns, window_functions):
+    db = CountingStandIn(synthetic_path, window_functions)
+    try:
+        memory = DataQualityProfiler(db, state_dir=str(tmp_path / 'state')).profile_table('synthetic', key_columns=key_columns)
+        pushdown = PushdownProfiler(db)
+        profile_results = pushdown.profile_table('synthetic', key_columns)
+    finally:
+        db.disconnect()
+
+    assert pushdown.window_functions == window_functions
+    assert outlier_counts(profile_results) == outlier_counts(memory)
+    for column, profile in memory['column_profiles'].items():
+        if 'outliers' in profile:
+            assert profile_results['column_profiles'][column]['outliers']['values'] == profile['outliers']['values']
+
+
+def test_pushdown_outlier_queries_do_not_grow_with_columns(synthetic_path, key_columns):
+    db = CountingStandIn(synthetic_path)
+    try:
+        profile_results = PushdownProfiler(db).profile_table('synthetic', key_columns)
+    finally:
+        db.disconnect()
+
+    numeric = [profile for profile in profile_results['column_profiles'].values() if 'outliers' in profile]
+    assert len(numeric) > 3
+    # the aggregate, the quartiles, the outlier counts and the outlier examples
+    outlier_queries = [query for query in db.queries if 'LIMIT 5' not in query and 'HAVING' not in query]
+    assert len(outlier_queries) == 4
+
+
+def test_pushdown_sketch_quartiles_stay_close(synthetic_db, key_columns, monkeypatch):
+    exact = PushdownProfiler(synthetic_db).profile_table('synthetic', key_columns)
+    monkeypatch.setattr(PushdownProfiler, 'SKETCH_SAMPLE_ROWS', 2000)
+    sketch = PushdownProfiler(synthetic_db, quantile_mode='sketch').profile_table('synthetic', key_columns)
+
+    for column, expected in outlier_counts(exact).items():
+        assert outlier_counts(sketch)[column] == pytest.approx(expected, abs=max(10, 0.25 * expected)), column
+
+
+@pytest.mark.parametrize('strategy', ['memory', 'streaming', 'sampled', 'pushdown'])
+def test_strategies_quote_table_names(tmp_path, strategy):
+    path = str(tmp_path / 'reserved.sqlite3')
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE `order` (id int PRIMARY KEY, total double)")
+    connection.executemany("INSERT INTO `order` VALUES (?, ?)", [(i, float(i % 7)) for i in range(1, 201)])
+    connection.commit()
+    connection.close()
+
+    db = PushdownStandIn(path)
+    try:
+        profiler = DataQualityProfiler(db, state_dir=str(tmp_path / 'state'), sample_rows=50)
+        profile_results = profiler.profile_table('order', strategy=strategy)
+    finally:
+        db.disconnect()
+    assert profile_results['table_name'] == 'order'
+    assert profile_results['column_profiles']['total']['missing_values'] == 0
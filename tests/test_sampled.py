@@ -0,0 +1,24 @@
+"""The sampled strategy on the synthetic table"""
+
+import pytest
+
+from conftest import ROWS
+from dq_monitor import DataQualityProfiler
+
+
+@pytest.mark.parametrize('method', ['bernoulli', 'pk_range', 'reservoir'])
+def test_sample_reports_the_known_table_size(synthetic_db, tmp_path, key_columns, method):
+    profiler = DataQualityProfiler(synthetic_db, state_dir=str(tmp_path / 'state'), sample_rows=500,
+                                   sample_method=method, sample_seed=3)
+    sample = profiler.profile_table('synthetic', strategy='sampled', key_columns=key_columns)['sample']
+
+    assert sample['method'] == method
+    assert sample['sample_rows'] < ROWS
+    assert sample['estimated_total_rows'] == ROWS
+
+
+def test_sample_confidence_is_part_of_the_cache_key(synthetic_db, tmp_path):
+    profiler = DataQualityProfiler(synthetic_db, state_dir=str(tmp_path / 'state'))
+    key = profiler.cache_key('synthetic', 'sampled')
+    profiler.sample_confidence = 0.99
+    assert profiler.cache_key('synthetic', 'sampled') != key
@@ -0,0 +1,158 @@
+"""Compact storage dtypes and their legacy views"""
+
+import decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dq_monitor.schema import (
+    HAS_PYARROW, compact_column, decimal_to_float, float_precision_loss, legacy_column, shortest_decimal_float64
+)
+
+
+def test_float32_widens_to_its_shortest_decimal():
+    rng = np.random.default_rng(5)
+    values = np.concatenate([
+        rng.integers(0, 2 ** 32, 200000, dtype=np.uint32).view(np.float32),
+        (rng.integers(0, 10 ** 6, 100000) / 100).astype(np.float32),
+        np.array([0.1, -0.0, np.nan, np.inf, -np.inf, 3.4028235e38, 1e-45], dtype=np.float32),
+    ])
+    with np.errstate(invalid='ignore'):
+        expected = values.astype(str).astype(np.float64)
+
+    widened = shortest_decimal_float64(values)
+    assert np.array_equal(widened, expected, equal_nan=True)
+    numbers = ~np.isnan(expected)
+    assert np.array_equal(np.signbit(widened[numbers]), np.signbit(expected[numbers]))
+
+
+def test_legacy_column_of_float32_matches_fetched_floats():
+    fetched = pd.Series([0.1, 2.675, None, 1234.5677], dtype=np.float64, name='price')
+    legacy = legacy_column(fetched.astype(np.float32))
+    assert legacy.dtype == np.float64
+    pd.testing.assert_series_equal(legacy, fetched)
+
+
+@pytest.mark.parametrize('column_type, values, compact_dtype', [
+    ('tinyint(4)', [1, -128, 127], 'int8'),
+    ('smallint(6)', [1, -2, 300], 'int16'),
+    ('int(11)', [1, 2, 3], 'int32'),
+    ('int(10) unsigned', [0, 3000000000], 'uint32'),
+    ('bigint(20)', [1, -(2 ** 40)], 'int64'),
+    ('year(4)', [1999, 2024], 'int16'),
+])
+def test_integers_downcast_to_their_declared_width(column_type, values, compact_dtype):
+    fetched = pd.Series(values, dtype=np.int64, name='n')
+    compact = compact_column(fetched, column_type)
+    assert str(compact.dtype) == compact_dtype
+    pd.testing.assert_series_equal(legacy_column(compact), fetched)
+
+
+def test_integers_wider_than_their_type_are_left_alone():
+    fetched = pd.Series([1.5, 2.0], name='n')
+    assert compact_column(fetched, 'int(11)') is fetched
+    fetched = pd.Series([1, 2 ** 40], dtype=np.int64, name='n')
+    compact = compact_column(fetched, 'int(11)')
+    assert compact.dtype == np.int64
+
+
+@pytest.mark.parametrize('column_type, compact_dtype', [
+    ('tinyint(4)', 'Int8'), ('int(11)', 'Int32'), ('int(10) unsigned', 'Int32'), ('bigint(20) unsigned', 'Int64'),
+])
+def test_integers_with_nulls_become_nullable(column_type, compact_dtype):
+    fetched = pd.Series([1.0, None, 7.0, 0.0], name='n')
+    compact = compact_column(fetched, column_type)
+    assert str(compact.dtype) == compact_dtype
+    assert compact.isna().tolist() == [False, True, False, False]
+    pd.testing.assert_series_equal(legacy_column(compact), fetched)
+
+
+def test_nullable_slice_keeps_the_float_view_of_its_column():
+    compact = compact_column(pd.Series([1.0, None, 7.0], name='n'), 'int(11)')
+    assert legacy_column(compact.iloc[[0, 2]]).dtype == np.int64
+    assert legacy_column(compact.iloc[[0, 2]], has_nulls=True).dtype == np.float64
+
+
+@pytest.mark.parametrize('column_type', ['varchar(20)', "enum('a','b','c')"])
+def test_repeated_text_becomes_categorical(column_type):
+    fetched = pd.Series(['a', 'b', None, 'a', 'b', 'a'], name='s')
+    compact = compact_column(fetched, column_type)
+    assert isinstance(compact.dtype, pd.CategoricalDtype)
+    assert list(compact.cat.categories) == ['a', 'b']
+    pd.testing.assert_series_equal(legacy_column(compact), fetched)
+
+
+def test_enum_is_categorical_however_many_distinct_values():
+    fetched = pd.Series(['a', 'b', 'c'], name='s')
+    assert isinstance(compact_column(fetched, "enum('a','b','c')").dtype, pd.CategoricalDtype)
+    assert not isinstance(compact_column(fetched, 'varchar(20)').dtype, pd.CategoricalDtype)
+    assert isinstance(compact_column(fetched, 'varchar(20)', category_ratio=1.0).dtype, pd.CategoricalDtype)
+
+
+@pytest.mark.skipif(not HAS_PYARROW, reason='pyarrow is not installed')
+def test_distinct_text_becomes_arrow_strings():
+    fetched = pd.Series(['a', 'b', None, 'c'], name='s')
+    compact = compact_column(fetched, 'text')
+    assert compact.dtype == 'string[pyarrow]'
+    pd.testing.assert_series_equal(legacy_column(compact), fetched)
+
+
+def test_mixed_objects_and_other_types_are_unchanged():
+    blobs = pd.Series([b'a', 'b', b'a'], name='s')
+    assert compact_column(blobs, 'varchar(20)') is blobs
+    dates = pd.Series(pd.to_datetime(['2024-01-01', '2024-01-02']), name='d')
+    assert compact_column(dates, 'date') is dates
+    empty = pd.Series([None, None], dtype=object, name='s')
+    assert compact_column(empty, 'int(11)') is empty
+
+
+def decimals(values):
+    return pd.Series([None if value is None else decimal.Decimal(value) for value in values], dtype=object, name='d')
+
+
+@pytest.mark.parametrize('precision, scale', [(15, 4), (18, 3), (30, 4), (None, None)])
+def test_decimals_within_float64_digits_convert_exactly(precision, scale):
+    rng = np.random.default_rng(3)
+    values = [str(decimal.Decimal(int(unscaled)).scaleb(-3)) for unscaled in rng.integers(-10 ** 11, 10 ** 11, 5000)]
+    series = decimals(values + [None, '0.000', '-0.001', '99999999999.999'])
+    converted, lossy = decimal_to_float(series, precision, scale)
+    assert not lossy
+    assert converted.index.equals(series.index) and converted.name == 'd'
+    expected = [np.nan if value is None else float(value) for value in series]
+    assert np.array_equal(converted.to_numpy(), np.array(expected), equal_nan=True)
+
+
+def test_decimals_beyond_float64_digits_are_flagged():
+    # 977329965204690299 is not a float64, so scaling then dividing rounds twice and misses float() by an ulp
+    series = decimals(['9773299652046902.99', '1.00', None])
+    converted, lossy = decimal_to_float(series, 18, 2)
+    assert lossy
+    assert converted[0] == np.nextafter(float(series[0]), np.inf)
+    assert converted[1] == 1.0 and np.isnan(converted[2])
+
+    for precision, scale in [(30, 2), (None, None)]:
+        converted, lossy = decimal_to_float(decimals(['1234567890123456.78']), precision, scale)
+        assert lossy
+        assert converted[0] == float(decimal.Decimal('1234567890123456.78'))
+
+
+def test_fifteen_digits_are_the_lossless_limit():
+    assert not decimal_to_float(decimals(['9999999999999.99']), 15, 2)[1]
+    assert decimal_to_float(decimals(['10000000000000.00']), 16, 2)[1]
+    assert not decimal_to_float(decimals(['999999999999999']), None, None)[1]
+    assert decimal_to_float(decimals(['1000000000000000']), None, None)[1]
+
+
+def test_decimal_strings_fall_back_to_a_lenient_parse():
+    series = pd.Series(['1.5', None, 'n/a'], dtype=object)
+    converted, lossy = decimal_to_float(series, 10, 2)
+    assert not lossy
+    assert converted.tolist()[0] == 1.5 and converted.isna().tolist() == [False, True, True]
+
+
+def test_float_precision_loss_of_fetched_decimals():
+    assert not float_precision_loss(pd.Series([9999999999999.99, -1.0, None]), 2)
+    assert float_precision_loss(pd.Series([-10000000000000.0, 1.0]), 2)
+    assert not float_precision_loss(pd.Series([None, None], dtype=np.float64), 2)
+    assert not float_precision_loss(pd.Series([10 ** 16]), 2)
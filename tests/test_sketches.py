@@ -0,0 +1,120 @@
+"""Sketch estimates against exact quantiles and distinct counts"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dq_monitor.sketches import DistinctCounter, HyperLogLog, KLLSketch
+
+QUANTILES = (0.01, 0.25, 0.5, 0.75, 0.99)
+
+
+def rank_error(values: np.ndarray, estimate: float, q: float) -> float:
+    """Distance between q and the rank of estimate among the exact values"""
+    ordered = np.sort(values)
+    low = np.searchsorted(ordered, estimate, side='left') / len(ordered)
+    high = np.searchsorted(ordered, estimate, side='right') / len(ordered)
+    return 0.0 if low <= q <= high else min(abs(low - q), abs(high - q))
+
+
+@pytest.mark.parametrize('distribution', ['normal', 'exponential', 'integers'])
+def test_kll_quantiles_within_rank_error(distribution):
+    rng = np.random.default_rng(11)
+    values = {
+        'normal': lambda: rng.normal(100, 15, 200000),
+        'exponential': lambda: rng.exponential(250, 200000),
+        'integers': lambda: rng.integers(0, 50, 200000).astype(np.float64),
+    }[distribution]()
+    sketch = KLLSketch(k=200)
+    for chunk in np.array_split(values, 40):
+        sketch.update(chunk)
+
+    assert not sketch.is_exact
+    assert sketch.n == len(values)
+    for q in QUANTILES:
+        assert rank_error(values, sketch.quantile(q), q) < 0.02, q
+        assert sketch.rank(np.quantile(values, q)) == pytest.approx(q, abs=0.02)
+
+
+def test_kll_merge_of_partitions_matches_one_sketch():
+    rng = np.random.default_rng(12)
+    values = rng.lognormal(3, 1, 120000)
+    partitions = []
+    for index, part in enumerate(np.array_split(values, 6)):
+        sketch = KLLSketch(k=200, seed=index)
+        for chunk in np.array_split(part, 5):
+            sketch.update(chunk)
+        partitions.append(sketch)
+    merged = partitions[0]
+    for sketch in partitions[1:]:
+        merged.merge(sketch)
+
+    assert merged.n == len(values)
+    for q in QUANTILES:
+        assert rank_error(values, merged.quantile(q), q) < 0.02, q
+
+
+def test_kll_is_exact_until_compacted():
+    values = np.arange(150, dtype=np.float64)
+    sketch = KLLSketch(k=200)
+    sketch.update(values)
+    assert sketch.is_exact
+    for q in QUANTILES:
+        assert sketch.quantile(q) == np.quantile(values, q)
+
+
+@pytest.mark.parametrize('kind', ['numbers', 'strings'])
+@pytest.mark.parametrize('precision', [10, 14])
+def test_hyperloglog_within_three_standard_errors(kind, precision):
+    rng = np.random.default_rng(13)
+    values = rng.integers(0, 150000, 300000)
+    exact = len(np.unique(values))
+    series = pd.Series(values if kind == 'numbers' else [f'user{value}@example.com' for value in values])
+    sketch = HyperLogLog(precision)
+    for chunk in np.array_split(np.arange(len(series)), 30):
+        sketch.update(series.iloc[chunk])
+
+    assert abs(sketch.estimate() - exact) / exact < 3 * sketch.relative_error
+
+
+def test_distinct_counter_merge_matches_union():
+    rng = np.random.default_rng(14)
+    left, right = rng.integers(0, 80000, 100000), rng.integers(40000, 120000, 100000)
+    exact = len(np.union1d(left, right))
+    counters = []
+    for values in (left, right):
+        counter = DistinctCounter('approximate', precision=14)
+        counter.update(pd.Series(values))
+        counters.append(counter)
+    counters[0].merge(counters[1])
+
+    assert abs(counters[0].count() - exact) / exact < 3 * counters[0].sketch.relative_error
+
+
+def test_distinct_counter_auto_is_exact_below_limit():
+    counter = DistinctCounter('auto', exact_limit=1000)
+    counter.update(pd.Series(np.arange(900)))
+    assert counter.count() == 900 and not counter.is_approximate
+
+    counter.update(pd.Series(np.arange(900, 5000)))
+    assert counter.is_approximate
+    assert counter.profile_fields()['unique_values'] == pytest.approx(5000, rel=3 * counter.sketch.relative_error)
+
+
+@pytest.mark.parametrize('dtype', ['int64', 'uint64', 'Int64'])
+def test_hyperloglog_keeps_bigint_ids_above_2_53_apart(dtype):
+    ids = pd.Series(np.arange(10 ** 18, 10 ** 18 + 1000), dtype=dtype)
+    sketch = HyperLogLog(14)
+    sketch.update(ids)
+    assert sketch.estimate() == pytest.approx(1000, rel=3 * sketch.relative_error)
+
+    counter = DistinctCounter('approximate', precision=14)
+    counter.update(ids)
+    assert counter.count() == pytest.approx(1000, rel=3 * counter.sketch.relative_error)
+
+
+def test_hyperloglog_counts_integral_floats_as_the_same_integers():
+    ints, floats = HyperLogLog(12), HyperLogLog(12)
+    ints.update(pd.Series(np.arange(5000)))
+    floats.update(pd.Series(np.arange(5000, dtype=np.float64)))
+    assert np.array_equal(ints.registers, floats.registers)
@@ -0,0 +1,113 @@
+"""The 'auto' strategy's thresholds, against catalog metadata served by the stand-in"""
+
+import pytest
+
+from conftest import PushdownStandIn
+from dq_monitor import DataQualityProfiler
+from dq_monitor.schema import estimate_row_bytes
+
+ROWS = 10 ** 7
+# Streaming state that does not grow with the table, so only the chunk size bounds its peak
+BOUNDED = {'distinct_mode': 'approximate', 'quantile_mode': 'sketch', 'chunk_size': 10000}
+
+
+class CatalogStandIn(PushdownStandIn):
+    """PushdownStandIn that also answers catalog.table() with set information_schema estimates"""
+
+    def __init__(self, path: str, tables: dict):
+        super().__init__(path)
+        self.tables = tables
+
+    def table(self, table_name: str):
+        return self.tables.get(table_name)
+
+
+def metadata(estimated_rows=ROWS, avg_row_length=120, data_length=None):
+    data_length = estimated_rows * avg_row_length if data_length is None else data_length
+    return {'estimated_rows': estimated_rows, 'avg_row_length': avg_row_length, 'data_length': data_length}
+
+
+@pytest.fixture
+def catalog_db(synthetic_path):
+    db = CatalogStandIn(synthetic_path, {'synthetic': metadata()})
+    yield db
+    db.disconnect()
+
+
+def choose(db, tmp_path, **options):
+    profiler = DataQualityProfiler(db, state_dir=str(tmp_path / 'state'), **options)
+    return profiler.choose_strategy('synthetic')
+
+
+@pytest.mark.parametrize('peak, offset, sample_above_rows, expected', [
+    ('memory_peak_bytes', 0, None, 'memory'),
+    ('memory_peak_bytes', -1, None, 'streaming'),
+    ('streaming_peak_bytes', 0, None, 'streaming'),
+    ('streaming_peak_bytes', -1, None, 'pushdown'),
+    ('memory_peak_bytes', 0, ROWS - 1, 'sampled'),
+    ('streaming_peak_bytes', -1, ROWS - 1, 'sampled'),
+    ('memory_peak_bytes', 0, ROWS, 'memory'),
+    ('streaming_peak_bytes', -1, ROWS, 'pushdown'),
+])
+def test_auto_thresholds(catalog_db, tmp_path, peak, offset, sample_above_rows, expected):
+    _, estimates = choose(catalog_db, tmp_path, **BOUNDED)
+    assert estimates['streaming_peak_bytes'] < estimates['memory_peak_bytes']
+
+    budget = estimates[peak] + offset
+    strategy, selection = choose(catalog_db, tmp_path, memory_budget=budget, sample_above_rows=sample_above_rows,
+                                 **BOUNDED)
+    assert strategy == expected
+    assert selection['strategy'] == expected and selection['memory_budget_bytes'] == budget
+    assert selection['estimated_rows'] == ROWS
+
+
+def test_peaks_follow_the_catalog_estimates(catalog_db, tmp_path):
+    schema = catalog_db.get_table_schema('synthetic')
+    widths = estimate_row_bytes(schema, 120)
+    _, selection = choose(catalog_db, tmp_path, **BOUNDED)
+    assert selection['memory_peak_bytes'] == int(ROWS * (widths['row'] + widths['frame']))
+    assert selection['row_bytes'] == round(widths['row'])
+
+    # The columnar fetch holds one batch of rows, not the whole result set
+    _, columnar = choose(catalog_db, tmp_path, fetch_mode='columnar', **BOUNDED)
+    assert columnar['memory_peak_bytes'] == int(10000 * widths['row'] + ROWS * widths['frame'])
+
+
+@pytest.mark.parametrize('distinct_mode, quantile_mode', [
+    ('exact', 'sketch'), ('auto', 'sketch'), ('approximate', 'exact'), ('exact', 'exact'),
+])
+def test_exact_statistics_raise_the_streaming_peak(catalog_db, tmp_path, distinct_mode, quantile_mode):
+    _, bounded = choose(catalog_db, tmp_path, **BOUNDED)
+    options = dict(BOUNDED, distinct_mode=distinct_mode, quantile_mode=quantile_mode)
+    strategy, selection = choose(catalog_db, tmp_path, memory_budget=bounded['streaming_peak_bytes'], **options)
+    assert selection['streaming_peak_bytes'] > bounded['streaming_peak_bytes']
+    assert strategy == 'pushdown'
+
+
+@pytest.mark.parametrize('table, expected_rows', [
+    # ANALYZE has not run: TABLE_ROWS and AVG_ROW_LENGTH are 0 but DATA_LENGTH shows the size
+    (metadata(estimated_rows=0, avg_row_length=0, data_length=10 ** 9), None),
+    (metadata(estimated_rows=0, avg_row_length=0, data_length=0), 0),
+    (metadata(estimated_rows=5000, avg_row_length=0, data_length=0), 5000),
+])
+def test_rows_estimated_from_data_length(synthetic_path, tmp_path, table, expected_rows):
+    db = CatalogStandIn(synthetic_path, {'synthetic': table})
+    try:
+        strategy, selection = choose(db, tmp_path, **BOUNDED)
+        stored = estimate_row_bytes(db.get_table_schema('synthetic'))['stored']
+    finally:
+        db.disconnect()
+    if expected_rows is None:
+        expected_rows = int(10 ** 9 // stored)
+        assert strategy != 'memory'
+    assert selection['estimated_rows'] == expected_rows
+
+
+def test_tables_without_metadata_stream(synthetic_path, tmp_path):
+    db = CatalogStandIn(synthetic_path, {})
+    try:
+        strategy, selection = choose(db, tmp_path)
+    finally:
+        db.disconnect()
+    assert strategy == 'streaming'
+    assert 'estimated_rows' not in selection
@@ -0,0 +1,106 @@
+"""The streaming strategy against the in-memory one on the same table"""
+
+import logging
+import math
+
+import pytest
+
+from conftest import PushdownStandIn
+from dq_monitor import DataQualityProfiler
+
+NUMERIC_FIELDS = ('min_value', 'max_value', 'mean_value', 'std_dev')
+STRING_FIELDS = ('avg_length', 'max_length', 'min_length')
+
+
+class OneConnectionStandIn(PushdownStandIn):
+    """Stand-in whose only connection is held while a stream is open, like a pool of size 1"""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.stream_open = False
+
+    def iter_query(self, query: str, params: tuple = None, chunk_size: int = 50000):
+        chunks, columns = super().iter_query(query, params, chunk_size)
+        self.stream_open = True
+
+        def held():
+            try:
+                yield from chunks
+            finally:
+                self.stream_open = False
+        return held(), columns
+
+    def get_table_schema(self, table_name: str):
+        assert not self.stream_open, 'schema lookup waits for the connection the open stream holds'
+        return super().get_table_schema(table_name)
+
+    def execute_query(self, query: str, params: tuple = None):
+        assert not self.stream_open, 'query waits for the connection the open stream holds'
+        return super().execute_query(query, params)
+
+
+def profile(db, tmp_path, strategy, key_columns, **options):
+    profiler = DataQualityProfiler(db, chunk_size=512, state_dir=str(tmp_path / 'state'), **options)
+    return profiler.profile_table('synthetic', strategy=strategy, key_columns=key_columns)
+
+
+def assert_close(actual, expected, field):
+    if expected is None or (isinstance(expected, float) and math.isnan(expected)):
+        assert actual is None or math.isnan(actual), field
+    else:
+        assert actual == pytest.approx(expected, rel=1e-9, abs=1e-9), field
+
+
+def test_streaming_matches_memory_with_exact_modes(synthetic_db, tmp_path, key_columns):
+    memory = profile(synthetic_db, tmp_path, 'memory', key_columns)
+    streaming = profile(synthetic_db, tmp_path, 'streaming', key_columns)
+
+    assert streaming['total_rows'] == memory['total_rows']
+    issues, expected_issues = streaming['data_quality_issues'], memory['data_quality_issues']
+    assert issues['duplicates'] == expected_issues['duplicates'] > 0
+    assert issues['missing_values'] == expected_issues['missing_values']
+    assert ({name: issue['count'] for name, issue in issues['inconsistencies'].items()}
+            == {name: issue['count'] for name, issue in expected_issues['inconsistencies'].items()})
+
+    assert streaming['column_profiles'].keys() == memory['column_profiles'].keys()
+    for column, expected in memory['column_profiles'].items():
+        actual = streaming['column_profiles'][column]
+        assert actual['unique_values'] == expected['unique_values'], column
+        assert actual['missing_values'] == expected['missing_values'], column
+        for field in NUMERIC_FIELDS + STRING_FIELDS:
+            if field in expected:
+                assert_close(actual[field], expected[field], f'{column}.{field}')
+        if 'outliers' in expected:
+            assert actual['outliers']['count'] == expected['outliers']['count'], column
+
+
+def test_streaming_sketches_stay_close_to_memory(synthetic_db, tmp_path, key_columns):
+    memory = profile(synthetic_db, tmp_path, 'memory', key_columns)
+    streaming = profile(synthetic_db, tmp_path, 'streaming', key_columns, distinct_mode='approximate',
+                        quantile_mode='sketch')
+
+    assert streaming['data_quality_issues']['duplicates'] == memory['data_quality_issues']['duplicates']
+    for column, expected in memory['column_profiles'].items():
+        actual = streaming['column_profiles'][column]
+        assert actual['unique_values'] == pytest.approx(expected['unique_values'], rel=0.05), column
+        assert actual['missing_values'] == expected['missing_values'], column
+
+
+def test_streaming_warns_about_exact_modes_only(synthetic_db, tmp_path, key_columns, caplog):
+    with caplog.at_level(logging.WARNING, logger='dq_monitor'):
+        profile(synthetic_db, tmp_path, 'streaming', key_columns)
+    assert "quantile_mode='exact'" in caplog.text
+
+    caplog.clear()
+    with caplog.at_level(logging.WARNING, logger='dq_monitor'):
+        profile(synthetic_db, tmp_path, 'streaming', key_columns, distinct_mode='auto', quantile_mode='sketch')
+    assert caplog.text == ''
+
+
+def test_streaming_reads_the_schema_before_opening_the_stream(synthetic_path, tmp_path, key_columns):
+    db = OneConnectionStandIn(synthetic_path)
+    try:
+        streaming = profile(db, tmp_path, 'streaming', key_columns, outlier_pass=True)
+    finally:
+        db.disconnect()
+    assert streaming['total_rows'] > 0 and not db.stream_open
@@ -0,0 +1,65 @@
+"""Collecting results from profiling worker processes"""
+
+import multiprocessing
+import pickle
+import queue
+import socket
+
+from dq_monitor import DatabaseConnection, DataQualityProfiler, ProfileCache, ProfileHistoryStore
+from dq_monitor.profiler import BatchProfiler, _next_result, _worker_context
+
+
+class LateQueue:
+    """A queue whose blocking get() times out once before the item it already holds is seen"""
+
+    def __init__(self, results):
+        self.results = results
+        self.timed_out = False
+
+    def get(self, timeout=None):
+        if not self.timed_out:
+            self.timed_out = True
+            raise queue.Empty
+        return self.results.get(timeout=timeout)
+
+    def get_nowait(self):
+        return self.results.get_nowait()
+
+
+def test_result_put_after_timeout_by_exited_worker_is_kept():
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    worker = context.Process(target=results.put, args=(('orders', {'total_rows': 3}, None),))
+    worker.start()
+    worker.join()
+
+    assert _next_result(LateQueue(results), [worker], timeout=0.1) == ('orders', {'total_rows': 3}, None)
+    assert _next_result(results, [worker], timeout=0.1) is None
+
+
+def unreachable_db() -> DatabaseConnection:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    return DatabaseConnection('127.0.0.1', 'shop', 'monitor', '', port)
+
+
+def test_worker_copy_pickles_without_connection_or_stores(tmp_path):
+    profiler = DataQualityProfiler(unreachable_db(), chunk_size=123, profile_cache=ProfileCache(str(tmp_path / 'cache')),
+                                   history_store=ProfileHistoryStore(str(tmp_path / 'history.sqlite3')))
+    worker_profiler = pickle.loads(pickle.dumps(profiler.worker_copy()))
+
+    assert worker_profiler.chunk_size == 123
+    assert worker_profiler.db is None
+    assert worker_profiler.profile_cache is None and worker_profiler.history_store is None
+    assert profiler.db is not None and profiler.profile_cache is not None
+
+
+def test_batch_workers_are_not_forked_from_the_caller():
+    assert _worker_context().get_start_method() in ('forkserver', 'spawn')
+
+    batch = BatchProfiler(DataQualityProfiler(unreachable_db()), max_workers=2)
+    results = list(batch.profile_tables(['orders', 'customers', 'items'], strategy='streaming'))
+
+    assert sorted(table_name for table_name, _, _ in results) == ['customers', 'items', 'orders']
+    assert all(profile_results is None and error == "Database connection failed" for _, profile_results, error in results)